@@ -22,15 +22,22 @@ the classes contained therein.
 
 import collections
 import copy
+import functools
+import hashlib
 from importlib import import_module
 import inspect
+import json
 import logging
 import os
+import threading
 
 from django.conf import settings
 from django.conf.urls import include
 from django.conf.urls import url
+from django.contrib.auth.signals import user_logged_in
+from django.core.cache import caches
 from django.core.exceptions import ImproperlyConfigured
+from django.urls import RegexURLResolver
 from django.urls import reverse
 from django.utils.encoding import python_2_unicode_compatible
 from django.utils.functional import empty
@@ -45,6 +52,7 @@ from horizon.decorators import require_auth
 from horizon.decorators import require_component_access
 from horizon.decorators import require_perms
 from horizon import loaders
+from horizon.utils import functions
 from horizon.utils import settings as utils_settings
 
 
@@ -58,31 +66,149 @@ def _decorate_urlconf(urlpatterns, decorator, *args, **kwargs):
         if getattr(pattern, 'callback', None):
             decorated = decorator(pattern.callback, *args, **kwargs)
             pattern.callback = decorated
-        if getattr(pattern, 'url_patterns', []):
+        if isinstance(pattern, LazyURLResolver):
+            pattern.decorate(decorator, *args, **kwargs)
+        elif getattr(pattern, 'url_patterns', []):
             _decorate_urlconf(pattern.url_patterns, decorator, *args, **kwargs)
 
 
-# FIXME(lhcheng): We need to find a better way to cache the result.
-# Rather than storing it in the session, we could leverage the Django
-# session. Currently, this has been causing issue with cookie backend,
-# adding 1600+ in the cookie size.
+# Names of the request attributes holding the access decisions of the token,
+# the cache key they were read from and whether decisions were added.
+_ACCESS_DECISIONS_ATTR = '_horizon_access_decisions'
+_ACCESS_DECISIONS_KEY_ATTR = '_horizon_access_decisions_key'
+_ACCESS_DECISIONS_CHANGED_ATTR = '_horizon_access_decisions_changed'
+
+
+def get_access_cache_config():
+    """Return the ``ACCESS_DECISION_CACHE`` setting merged with defaults."""
+    config = {
+        'backend': None,
+        'timeout': 300,
+        'precompute': True,
+    }
+    config.update(getattr(settings, 'ACCESS_DECISION_CACHE', {}))
+    return config
+
+
+def _get_access_cache_key(request):
+    user = request.user
+    token = (getattr(getattr(user, 'token', None), 'id', None) or
+             request.session.get('token'))
+    if not token:
+        return None
+    # The identity panels also depend on the domain context selected by a
+    # cloud admin.
+    key_data = json.dumps([token, getattr(user, 'services_region', None),
+                           request.session.get('domain_context')],
+                          default=repr)
+    return 'horizon_access:%s' % hashlib.sha1(
+        key_data.encode('utf-8')).hexdigest()
+
+
+def _get_access_decisions(request, cache):
+    """Returns the access decisions stored for the token of the request.
+
+    They are read from the cache once per request.
+    """
+    decisions = getattr(request, _ACCESS_DECISIONS_ATTR, None)
+    if decisions is None:
+        key = _get_access_cache_key(request)
+        decisions = (cache.get(key) if key else None) or {}
+        setattr(request, _ACCESS_DECISIONS_KEY_ATTR, key)
+        setattr(request, _ACCESS_DECISIONS_ATTR, decisions)
+    return decisions
+
+
+def _store_access_decisions(request, cache, key, decisions, timeout):
+    timeout = functions.get_token_bound_timeout(request, timeout)
+    if key and timeout > 0:
+        cache.set(key, decisions, timeout)
+
+
+def save_access_decisions(request):
+    """Writes the access decisions added during the request to the cache.
+
+    It is called by :class:`~horizon.middleware.HorizonMiddleware` at the
+    end of each request, so that the components checked while rendering a
+    page are written at once rather than one by one, and again once a
+    streamed response has been sent.
+    """
+    if not getattr(request, _ACCESS_DECISIONS_CHANGED_ATTR, False):
+        return
+    setattr(request, _ACCESS_DECISIONS_CHANGED_ATTR, False)
+    config = get_access_cache_config()
+    if not config['backend']:
+        return
+    _store_access_decisions(request, caches[config['backend']],
+                            getattr(request, _ACCESS_DECISIONS_KEY_ATTR),
+                            getattr(request, _ACCESS_DECISIONS_ATTR),
+                            config['timeout'])
+
+
 def access_cached(func):
+    """Decorator caching the access decisions of the components.
+
+    The decisions are kept server side, in the cache selected by the
+    ``ACCESS_DECISION_CACHE`` setting, keyed by the token of the user and
+    the region, until the token expires. Nothing is added to the session,
+    so the session cookie keeps its size with the ``signed_cookies``
+    session engine. The decisions added during a request are written at its
+    end by :func:`save_access_decisions`. When the setting does not enable
+    a cache, the decorated function is called directly.
+    """
+    @functools.wraps(func)
     def inner(self, context):
-        session = context['request'].session
-        try:
-            if session['allowed']['valid_for'] != session.get('token'):
-                raise KeyError()
-        except KeyError:
-            session['allowed'] = {"valid_for": session.get('token')}
-
+        config = get_access_cache_config()
+        if not config['backend']:
+            return func(self, context)
+        request = context['request']
+        cache = caches[config['backend']]
+        decisions = _get_access_decisions(request, cache)
         key = "%s.%s" % (self.__class__.__module__, self.__class__.__name__)
-        if key not in session['allowed']:
-            session['allowed'][key] = func(self, context)
-            session.modified = True
-        return session['allowed'][key]
+        if key not in decisions:
+            decisions[key] = func(self, context)
+            setattr(request, _ACCESS_DECISIONS_CHANGED_ATTR, True)
+        return decisions[key]
     return inner
 
 
+def precompute_access(request):
+    """Stores the access decisions of every dashboard and panel at once.
+
+    Components whose check fails are left out and checked again when they
+    are needed.
+    """
+    config = get_access_cache_config()
+    if not config['backend']:
+        return
+    decisions = {}
+    cache_key = _get_access_cache_key(request)
+    setattr(request, _ACCESS_DECISIONS_KEY_ATTR, cache_key)
+    setattr(request, _ACCESS_DECISIONS_ATTR, decisions)
+    setattr(request, _ACCESS_DECISIONS_CHANGED_ATTR, False)
+    context = {'request': request}
+    for dashboard in Horizon.get_dashboards():
+        for component in [dashboard] + dashboard.get_panels():
+            key = "%s.%s" % (component.__class__.__module__,
+                             component.__class__.__name__)
+            try:
+                decisions[key] = component.allowed(context)
+            except Exception:
+                LOG.warning("Unable to check the access to %s.", key,
+                            exc_info=True)
+    _store_access_decisions(request, caches[config['backend']], cache_key,
+                            decisions, config['timeout'])
+
+
+def _precompute_access_on_login(sender, request, user, **kwargs):
+    if get_access_cache_config()['precompute']:
+        precompute_access(request)
+
+
+user_logged_in.connect(_precompute_access_on_login,
+                       dispatch_uid='horizon.precompute_access')
+
+
 def _wrapped_include(arg):
     """Convert the old 3-tuple arg for include() into the new format.
 
@@ -136,15 +262,13 @@ class HorizonComponent(object):
                 urlpatterns = []
         return urlpatterns
 
-    # FIXME(lhcheng): Removed the access_cached decorator for now until
-    # a better implementation has been figured out. This has been causing
-    # issue with cookie backend, adding 1600+ in the cookie size.
-    # @access_cached
+    @access_cached
     def can_access(self, context):
         """Return whether the user has role based access to this component.
 
         This method is not intended to be overridden.
-        The result of the method is stored in per-session cache.
+        The result of the method is stored in the access decision cache
+        of the user token, see :func:`access_cached`.
         """
         return self.allowed(context)
 
@@ -340,6 +464,19 @@ class Panel(HorizonComponent):
         # Return the three arguments to django.conf.urls.include
         return urlpatterns, self.slug, self.slug
 
+    def _get_lazy_resolver(self, regex):
+        """Returns a resolver importing the URLconf of this panel on demand.
+
+        The URLconf, and with it the views, tables, forms and workflows of
+        the panel, is only imported when a path below ``regex`` is resolved
+        or when one of the URLs of the panel is reversed.
+        """
+        def load_patterns():
+            return self._decorated_urls[0]
+
+        return LazyURLResolver(regex, load_patterns, app_name=self.slug,
+                               namespace=self.slug)
+
 
 @six.python_2_unicode_compatible
 class PanelGroup(object):
@@ -555,14 +692,13 @@ class Dashboard(Registry, HorizonComponent):
                 default_panel = panel
                 continue
             url_slug = panel.slug.replace('.', '/')
-            urlpatterns.append(url(r'^%s/' % url_slug,
-                                   _wrapped_include(panel._decorated_urls)))
+            urlpatterns.append(self._get_panel_urls(panel,
+                                                    r'^%s/' % url_slug))
         # Now the default view, which should come last
         if not default_panel:
             raise NotRegistered('The default panel "%s" is not registered.'
                                 % self.default_panel)
-        urlpatterns.append(
-            url(r'', _wrapped_include(default_panel._decorated_urls)))
+        urlpatterns.append(self._get_panel_urls(default_panel, r''))
 
         # Require login if not public.
         if not self.public:
@@ -575,6 +711,11 @@ class Dashboard(Registry, HorizonComponent):
         # Return the three arguments to django.conf.urls.include
         return urlpatterns, self.slug, self.slug
 
+    def _get_panel_urls(self, panel, regex):
+        if self._registered_with._conf.get('lazy_panels', False):
+            return panel._get_lazy_resolver(regex)
+        return url(regex, _wrapped_include(panel._decorated_urls))
+
     def _autodiscover(self):
         """Discovers panels to register from the current dashboard module."""
         if getattr(self, "_autodiscover_complete", False):
@@ -699,6 +840,83 @@ class LazyURLPattern(SimpleLazyObject):
         return self._wrapped[idx]
 
 
+class LazyURLResolver(RegexURLResolver):
+    """A URL resolver loading its patterns the first time they are needed.
+
+    ``load_patterns`` is called to get the list of patterns when a path
+    below the prefix of the resolver is resolved or when a URL in its
+    namespace is reversed. Decorators applied by :func:`_decorate_urlconf`
+    before then are recorded and applied to the patterns once loaded.
+    """
+    def __init__(self, regex, load_patterns, app_name=None, namespace=None):
+        super(LazyURLResolver, self).__init__(regex, None, app_name=app_name,
+                                              namespace=namespace)
+        self._load_patterns = load_patterns
+        self._patterns = None
+        self._decorators = []
+        self._load_lock = threading.RLock()
+
+    def __repr__(self):
+        return '<%s (%s:%s) %s>' % (self.__class__.__name__, self.app_name,
+                                    self.namespace, self.regex.pattern)
+
+    @property
+    def loaded(self):
+        return self._patterns is not None
+
+    @property
+    def urlconf_module(self):
+        return self.url_patterns
+
+    @property
+    def url_patterns(self):
+        return self._load()
+
+    def _load(self):
+        if self._patterns is None:
+            with self._load_lock:
+                if self._patterns is None:
+                    patterns = self._load_patterns()
+                    for decorator, args, kwargs in self._decorators:
+                        _decorate_urlconf(patterns, decorator,
+                                          *args, **kwargs)
+                    self._patterns = patterns
+        return self._patterns
+
+    def decorate(self, decorator, *args, **kwargs):
+        """Applies ``decorator`` to the views, now or once they are loaded."""
+        with self._load_lock:
+            if self._patterns is None:
+                self._decorators.append((decorator, args, kwargs))
+                return
+        _decorate_urlconf(self._patterns, decorator, *args, **kwargs)
+
+    def _populate(self):
+        # The parent resolvers populate all their children when any of their
+        # URLs is reversed; that must not import the patterns of this one.
+        if self.loaded:
+            super(LazyURLResolver, self)._populate()
+
+    @property
+    def reverse_dict(self):
+        self._load()
+        return super(LazyURLResolver, self).reverse_dict
+
+    @property
+    def namespace_dict(self):
+        self._load()
+        return super(LazyURLResolver, self).namespace_dict
+
+    @property
+    def app_dict(self):
+        self._load()
+        return super(LazyURLResolver, self).app_dict
+
+    def _is_callback(self, name):
+        self._load()
+        return super(LazyURLResolver, self)._is_callback(name)
+
+
 class Site(Registry, HorizonComponent):
     """The overarching class which encompasses all dashboards and panels."""
 
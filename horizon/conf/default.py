@@ -45,6 +45,10 @@ HORIZON_CONFIG = {
 
     'password_autocomplete': 'off',
 
+    # Import the URLconf of each panel when one of its URLs is first used
+    # rather than when the URLconf of the site is compiled.
+    'lazy_panels': False,
+
     # Enable or disable simplified floating IP address management.
     'simple_ip_management': True,
 
@@ -0,0 +1,182 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import collections
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+import six
+
+from horizon import management
+
+# Setup steps of openstack_dashboard.settings recorded as phases.
+DEFAULT_FUNCTIONS = [
+    'openstack_dashboard.utils.settings.update_dashboards',
+    'openstack_dashboard.utils.settings.get_xstatic_dirs',
+    'openstack_dashboard.utils.settings.find_static_files',
+    'openstack_dashboard.theme_settings.get_available_themes',
+    'openstack_dashboard.theme_settings.get_theme_static_dirs',
+]
+SORT_KEYS = ['cumulative', 'self', 'memory', 'name']
+MIB = 1024.0 * 1024
+
+
+def _format_memory(memory):
+    if memory is None:
+        return '-'
+    return '%.2f' % (memory / MIB)
+
+
+class Command(BaseCommand):
+    help = ("Profile the startup of the dashboard in a new Python process: "
+            "the time and memory of each module import and of each setup "
+            "phase (settings, django.setup, middleware, URLconf and the "
+            "setup steps of the settings).")
+
+    def add_arguments(self, parser):
+        parser.add_argument('-s', '--sort', choices=SORT_KEYS,
+                            default='cumulative',
+                            help=("Order of the packages and modules in the "
+                                  "report. Default: cumulative"))
+        parser.add_argument('-l', '--limit', type=int, default=30,
+                            help=("Number of packages and modules in the "
+                                  "report, 0 for all. Default: 30"))
+        parser.add_argument('-f', '--filter', metavar='PREFIX',
+                            help=("Only report the modules whose name "
+                                  "starts with PREFIX, e.g. "
+                                  "'openstack_dashboard.enabled'"))
+        parser.add_argument('-j', '--json', metavar='FILE',
+                            help=("Also write the measurements to FILE as "
+                                  "JSON, or only write them to the standard "
+                                  "output with '-'"))
+        parser.add_argument('-p', '--path', action='append', default=[],
+                            help=("Resolve PATH after the startup, like the "
+                                  "first request of a worker. Can be "
+                                  "repeated"))
+        parser.add_argument('--function', action='append',
+                            metavar='MODULE.FUNCTION',
+                            help=("Record the calls of a function as a "
+                                  "phase. Can be repeated. Default: %s"
+                                  % ', '.join(DEFAULT_FUNCTIONS)))
+        parser.add_argument('--no-memory', action='store_true',
+                            help=("Do not trace the memory allocations, "
+                                  "which slow down the imports"))
+
+    def handle(self, *args, **options):
+        result = self._run_profiler(options)
+        if options['json'] == '-':
+            self.stdout.write(json.dumps(result, indent=2))
+            return
+        if options['json']:
+            with open(options['json'], 'w') as f:
+                json.dump(result, f, indent=2)
+        self._report(result, options)
+
+    def _run_profiler(self, options):
+        if six.PY2:
+            raise CommandError('Profiling the startup requires Python 3.')
+        script = os.path.join(os.path.dirname(management.__file__),
+                              'startup_profiler.py')
+        functions = options['function'] or DEFAULT_FUNCTIONS
+        fd, output = tempfile.mkstemp(suffix='.json')
+        os.close(fd)
+        cmd = [sys.executable, script, settings.SETTINGS_MODULE, output]
+        for path in options['path']:
+            cmd += ['--path', path]
+        for function in functions:
+            cmd += ['--function', function]
+        if options['no_memory']:
+            cmd.append('--no-memory')
+        # Find the modules the way this process does.
+        env = dict(os.environ)
+        env['PYTHONPATH'] = os.pathsep.join(
+            os.path.abspath(path) for path in sys.path)
+        try:
+            process = subprocess.Popen(cmd, env=env, stdout=subprocess.PIPE,
+                                       stderr=subprocess.PIPE)
+            stderr = process.communicate()[1]
+            if process.returncode:
+                raise CommandError('Profiling the startup failed:\n%s'
+                                   % stderr.decode('utf-8', 'replace'))
+            with open(output) as f:
+                return json.load(f)
+        finally:
+            os.remove(output)
+
+    def _sorted(self, items, sort, time_key):
+        if sort == 'name':
+            return sorted(items, key=lambda item: item['name'])
+        key = {'memory': 'memory', 'self': 'self'}.get(sort, time_key)
+        return sorted(items, key=lambda item: item[key] or 0, reverse=True)
+
+    def _limited(self, items, limit):
+        return items[:limit] if limit > 0 else items
+
+    def _report(self, result, options):
+        write = self.stdout.write
+        modules = result['modules']
+        if options['filter']:
+            modules = [module for module in modules
+                       if module['name'].startswith(options['filter'])]
+
+        write('Settings: %s, Python %s' % (result['settings'],
+                                           result['python']))
+        write('Startup: %.3f s, %d modules imported, %s MiB allocated, '
+              '%s MiB max RSS' % (result['time'], len(result['modules']),
+                                  _format_memory(result['memory']),
+                                  _format_memory(result['maxrss'])))
+
+        write('')
+        write('%-64s %9s %9s %8s' % ('Phase', 'Time (s)', 'MiB', 'Imports'))
+        for phase in result['phases']:
+            write('%-64s %9.3f %9s %8d' % (
+                '  ' * phase['depth'] + phase['name'], phase['time'],
+                _format_memory(phase['memory']), phase['imports']))
+
+        # Time and memory of the modules of each top level package, without
+        # the other packages they import.
+        packages = collections.OrderedDict()
+        for module in modules:
+            name = module['name'].split('.')[0]
+            package = packages.setdefault(name, {'name': name, 'modules': 0,
+                                                 'self': 0.0, 'memory': None})
+            package['modules'] += 1
+            package['self'] += module['self']
+            if module['self_memory'] is not None:
+                package['memory'] = ((package['memory'] or 0) +
+                                     module['self_memory'])
+        write('')
+        write('%-64s %9s %9s %8s' % ('Package', 'Time (s)', 'MiB',
+                                     'Modules'))
+        for package in self._limited(
+                self._sorted(packages.values(), options['sort'], 'self'),
+                options['limit']):
+            write('%-64s %9.3f %9s %8d' % (
+                package['name'], package['self'],
+                _format_memory(package['memory']),
+                package['modules']))
+
+        write('')
+        write('%-64s %9s %9s %9s' % ('Module', 'Cum. (s)', 'Self (s)',
+                                     'Cum. MiB'))
+        for module in self._limited(
+                self._sorted(modules, options['sort'], 'cumulative'),
+                options['limit']):
+            write('%-64s %9.3f %9.3f %9s' % (
+                module['name'], module['cumulative'], module['self'],
+                _format_memory(module['memory'])))
@@ -0,0 +1,223 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Records the imports and setup phases of a Django project at startup.
+
+This module is run as a script, in a new Python process, by the
+``profile_startup`` management command so that nothing is imported yet when
+the profiling starts. It only uses the standard library until the project
+is set up. The result is written as JSON.
+"""
+
+import argparse
+import contextlib
+import functools
+import importlib.machinery
+import json
+import os
+import sys
+import time
+
+try:
+    import resource
+except ImportError:
+    resource = None
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+_FILE_LOADERS = (importlib.machinery.SourceFileLoader,
+                 importlib.machinery.SourcelessFileLoader,
+                 importlib.machinery.ExtensionFileLoader)
+
+try:
+    _clock = time.perf_counter
+except AttributeError:
+    _clock = time.time
+
+
+def _maxrss():
+    """Returns the peak resident memory of the process in bytes."""
+    if resource is None:
+        return None
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes.
+    return maxrss if sys.platform == 'darwin' else maxrss * 1024
+
+
+class Profiler(object):
+    """Meta path finder recording the time and memory of each import.
+
+    The modules are found by the other finders of ``sys.meta_path``; the
+    ``exec_module`` method of their file loaders is wrapped to record the
+    cumulative and self (without the nested imports) time and memory of
+    the module. The functions named in ``functions`` are recorded as
+    phases once their module is imported.
+    """
+
+    def __init__(self, trace_memory=True, functions=()):
+        self.trace_memory = trace_memory
+        self.modules = []
+        self.phases = []
+        self._imports = []
+        self._phases = []
+        self._functions = {}
+        for path in functions:
+            module, name = path.rsplit('.', 1)
+            self._functions.setdefault(module, []).append(name)
+
+    def _memory(self):
+        if self.trace_memory:
+            return tracemalloc.get_traced_memory()[0]
+        return 0
+
+    def find_spec(self, fullname, path=None, target=None):
+        for finder in sys.meta_path:
+            if finder is self:
+                continue
+            find_spec = getattr(finder, 'find_spec', None)
+            if find_spec is None:
+                # Let the import system use the legacy finder itself.
+                return None
+            spec = find_spec(fullname, path, target)
+            if spec is not None:
+                break
+        else:
+            return None
+        # File loaders are created for each module, the other ones can be
+        # shared and are left alone.
+        if isinstance(spec.loader, _FILE_LOADERS):
+            spec.loader.exec_module = self._wrap_exec_module(
+                fullname, spec.loader.exec_module)
+        return spec
+
+    def _wrap_exec_module(self, name, exec_module):
+        def profiled_exec_module(module):
+            # Name, start time, time of the nested imports, memory at start,
+            # memory of the nested imports.
+            entry = [name, _clock(), 0.0, self._memory(), 0]
+            self._imports.append(entry)
+            try:
+                exec_module(module)
+            finally:
+                self._imports.pop()
+                elapsed = _clock() - entry[1]
+                memory = self._memory() - entry[3]
+                parent = None
+                if self._imports:
+                    parent = self._imports[-1][0]
+                    self._imports[-1][2] += elapsed
+                    self._imports[-1][4] += memory
+                self.modules.append({'name': name,
+                                     'parent': parent,
+                                     'cumulative': elapsed,
+                                     'self': elapsed - entry[2],
+                                     'memory': memory,
+                                     'self_memory': memory - entry[4]})
+            for attr in self._functions.get(name, []):
+                func = getattr(module, attr, None)
+                if callable(func):
+                    setattr(module, attr,
+                            self.wrap('%s.%s' % (name, attr), func))
+        return profiled_exec_module
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        entry = {'name': name, 'depth': len(self._phases)}
+        self.phases.append(entry)
+        self._phases.append(entry)
+        modules = len(self.modules)
+        memory = self._memory()
+        start = _clock()
+        try:
+            yield
+        finally:
+            entry['time'] = _clock() - start
+            entry['memory'] = self._memory() - memory
+            entry['imports'] = len(self.modules) - modules
+            entry['maxrss'] = _maxrss()
+            self._phases.pop()
+
+    def wrap(self, name, func):
+        @functools.wraps(func)
+        def profiled(*args, **kwargs):
+            with self.phase(name):
+                return func(*args, **kwargs)
+        return profiled
+
+
+def profile(settings_module, paths=(), functions=(), trace_memory=True):
+    """Sets up the project and returns the recorded imports and phases."""
+    trace_memory = trace_memory and tracemalloc is not None
+    profiler = Profiler(trace_memory, functions)
+    if trace_memory:
+        tracemalloc.start()
+    sys.meta_path.insert(0, profiler)
+    os.environ['DJANGO_SETTINGS_MODULE'] = settings_module
+    start = _clock()
+    try:
+        with profiler.phase('import django'):
+            import django
+            from django.conf import settings
+            from django.core.handlers import wsgi
+            from django import urls
+        with profiler.phase('settings'):
+            settings.INSTALLED_APPS
+        with profiler.phase('django.setup'):
+            django.setup(set_prefix=False)
+        with profiler.phase('middleware'):
+            wsgi.WSGIHandler()
+        with profiler.phase('urlconf'):
+            urls.get_resolver().url_patterns
+        for path in paths:
+            with profiler.phase('resolve %s' % path):
+                urls.resolve(path)
+    finally:
+        sys.meta_path.remove(profiler)
+    total = _clock() - start
+    if not trace_memory:
+        for entry in profiler.modules:
+            entry['memory'] = entry['self_memory'] = None
+        for entry in profiler.phases:
+            entry['memory'] = None
+    return {
+        'python': sys.version.split()[0],
+        'settings': settings_module,
+        'time': total,
+        'memory': profiler._memory() if trace_memory else None,
+        'maxrss': _maxrss(),
+        'phases': profiler.phases,
+        'modules': profiler.modules,
+    }
+
+
+def main(argv=None):
+    # Run as a script, the directory of this module comes first in sys.path.
+    if os.path.abspath(sys.path[0]) == os.path.dirname(
+            os.path.abspath(__file__)):
+        del sys.path[0]
+    parser = argparse.ArgumentParser()
+    parser.add_argument('settings_module')
+    parser.add_argument('output')
+    parser.add_argument('--path', action='append', default=[])
+    parser.add_argument('--function', action='append', default=[])
+    parser.add_argument('--no-memory', action='store_true')
+    args = parser.parse_args(argv)
+    result = profile(args.settings_module, args.path, args.function,
+                     not args.no_memory)
+    with open(args.output, 'w') as f:
+        json.dump(result, f)
+
+
+if __name__ == '__main__':
+    main()
@@ -31,6 +31,7 @@ from django import shortcuts
 from django.utils.encoding import iri_to_uri
 from django.utils import timezone
 
+from horizon import base
 from horizon import exceptions
 from horizon.utils import functions as utils
 
@@ -156,6 +157,7 @@ class HorizonMiddleware(object):
 
         This is to allow ajax request to redirect url.
         """
+        base.save_access_decisions(request)
         if request.is_ajax() and hasattr(request, 'horizon'):
             queued_msgs = request.horizon['async_messages']
             if type(response) == http.HttpResponseRedirect:
@@ -28,10 +28,8 @@ horizon.tabs.initTabLoad = function ($tab) {
   recompileAngularContent($tab);
 };
 
-horizon.tabs.load_tab = function () {
-  var $this = $(this),
-    tab_id = $this.attr('data-target'),
-    $tab_pane = $(tab_id);
+horizon.tabs.load_tab_pane = function ($tab_pane) {
+  var tab_id = $tab_pane.attr('id');
 
   // Set up the client side template to append
   var $template = horizon.loader.inline(gettext('Loading'));
@@ -42,17 +40,32 @@ horizon.tabs.load_tab = function () {
 
   // If query params exist, append tab id.
   if(window.location.search.length > 0) {
-    $tab_pane.load(window.location.search + "&tab=" + tab_id.replace('#', ''), function() {
+    $tab_pane.load(window.location.search + "&tab=" + tab_id, function() {
       horizon.tabs.initTabLoad($tab_pane);
     });
   } else {
-    $tab_pane.load("?tab=" + tab_id.replace('#', ''), function() {
+    $tab_pane.load("?tab=" + tab_id, function() {
       horizon.tabs.initTabLoad($tab_pane);
     });
   }
+};
+
+horizon.tabs.load_tab = function () {
+  var $this = $(this);
+  horizon.tabs.load_tab_pane($($this.attr('data-target')));
   $this.attr("data-loaded", "true");
 };
 
+// Tabs which were too slow to preload are fetched as soon as the page is up.
+horizon.tabs.load_deferred_tabs = function ($container) {
+  $container.find(".tab-pane[data-deferred='true']").each(function () {
+    var $tab_pane = $(this);
+    $tab_pane.removeAttr("data-deferred");
+    $("a[data-target='#" + $tab_pane.attr('id') + "']").attr("data-loaded", "true");
+    horizon.tabs.load_tab_pane($tab_pane);
+  });
+};
+
 horizon.addInitFunction(horizon.tabs.init = function () {
   var data = horizon.cookies.getObject("tabs") || {};
 
@@ -64,6 +77,8 @@ horizon.addInitFunction(horizon.tabs.init = function () {
 
   var $document = $(document);
 
+  horizon.tabs.load_deferred_tabs($document);
+
   $document.on("show.bs.tab", ".ajax-tabs a[data-loaded='false']", horizon.tabs.load_tab);
 
   $document.on("shown.bs.tab", ".nav-tabs a[data-toggle='tab']", function (evt) {
@@ -97,6 +97,7 @@ class BaseAction(html.HTMLElement):
         self.requires_input = kwargs.get('requires_input', False)
         self.preempt = kwargs.get('preempt', False)
         self.policy_rules = kwargs.get('policy_rules', None)
+        self.allowed_datum_attrs = kwargs.get('allowed_datum_attrs', None)
         self.action_type = kwargs.get('action_type', 'default')
 
     def data_type_matched(self, datum):
@@ -130,6 +131,19 @@ class BaseAction(html.HTMLElement):
         """
         return True
 
+    def get_allowed_key(self, request, datum):
+        """Return the values of ``datum`` which :meth:`allowed` depends on.
+
+        Rows of a table with the same key share a single permission check
+        for this action. By default the key is built from the
+        ``allowed_datum_attrs`` attribute; ``None`` means the check is
+        done for every row.
+        """
+        if self.allowed_datum_attrs is None:
+            return None
+        return tuple(getattr(datum, attr, None)
+                     for attr in self.allowed_datum_attrs)
+
     def _allowed(self, request, datum):
         policy_check = utils_settings.import_setting("POLICY_CHECK_FUNCTION")
 
@@ -243,6 +257,15 @@ class Action(BaseAction):
                     "(("identity", "identity:list_users"),
                       ("identity", "identity:list_roles"))"
 
+    .. attribute:: allowed_datum_attrs
+
+        A tuple of the datum attribute names which ``allowed`` depends on,
+        e.g. ``("status", "locked")``. When set, the rows of a table are
+        grouped by the values of these attributes (and by the policy target)
+        and ``allowed`` is evaluated once per group instead of once per
+        row. Only set it if ``allowed`` has no side effects on the action
+        and reads nothing else from the datum. Defaults to ``None``.
+
     At least one of the following methods must be defined:
 
     .. method:: single(self, data_table, request, object_id)
@@ -560,7 +583,7 @@ class NameFilterAction(FilterAction):
         """Naive case-insensitive search."""
         query = filter_string.lower()
         return [item for item in items
-                if query in item.name.lower()]
+                if query in (getattr(item, 'name', None) or '').lower()]
 
 
 class FixedFilterAction(FilterAction):
@@ -655,9 +678,17 @@ class BatchAction(Action):
        Optional message for providing an appropriate help text for
        the horizon user.
 
+    .. attribute:: action_max_workers
+
+       The maximum number of objects the action is run on at the same time,
+       each in its own thread. The results are gathered into the same
+       messages as when the objects are handled one after another.
+       Defaults to ``1``, which runs the action on one object at a time.
+
     """
 
     help_text = _("This action cannot be undone.")
+    action_max_workers = 1
 
     def __init__(self, **kwargs):
         super(BatchAction, self).__init__(**kwargs)
@@ -684,6 +715,8 @@ class BatchAction(Action):
         self.success_ids = []
 
         self.help_text = kwargs.get('help_text', self.help_text)
+        self.action_max_workers = kwargs.get('action_max_workers',
+                                             self.action_max_workers)
 
     def _allowed(self, request, datum=None):
         # Override the default internal action method to prevent batch
@@ -753,10 +786,21 @@ class BatchAction(Action):
         attrs.update({'data-batch-action': 'true'})
         return attrs
 
+    def _call_action(self, request, datum_id, datum):
+        # Returns the exception raised by the action, if any, so that the
+        # results of concurrent calls can be gathered.
+        try:
+            self.action(request, datum_id)
+            # Call update to invoke changes if needed
+            self.update(request, datum)
+        except Exception as ex:
+            return ex
+
     def handle(self, table, request, obj_ids):
         action_success = []
         action_failure = []
         action_not_allowed = []
+        allowed = []
         for datum_id in obj_ids:
             datum = table.get_object_by_id(datum_id)
             datum_display = table.get_object_display(datum) or datum_id
@@ -767,37 +811,40 @@ class BatchAction(Action):
                     'dis': datum_display
                 })
                 continue
-            try:
-                self.action(request, datum_id)
-                # Call update to invoke changes if needed
-                self.update(request, datum)
+            allowed.append((datum_id, datum, datum_display))
+
+        calls = [functools.partial(self._call_action, request, obj_id, obj)
+                 for obj_id, obj, obj_display in allowed]
+        results = functions.call_concurrently(calls, self.action_max_workers)
+        for (datum_id, datum, datum_display), ex in zip(allowed, results):
+            if ex is None:
                 action_success.append(datum_display)
                 self.success_ids.append(datum_id)
                 LOG.info(u'%(action)s: "%(datum_display)s"',
                          {'action': self._get_action_name(past=True),
                           'datum_display': datum_display})
-            except Exception as ex:
-                handled_exc = isinstance(ex, exceptions.HandledException)
-                if handled_exc:
-                    # In case of HandledException, an error message should be
-                    # handled in exceptions.handle() or other logic,
-                    # so we don't need to handle the error message here.
-                    # NOTE(amotoki): To raise HandledException from the logic,
-                    # pass escalate=True and do not pass redirect argument
-                    # to exceptions.handle().
-                    # If an exception is handled, the original exception object
-                    # is stored in ex.wrapped[1].
-                    ex = ex.wrapped[1]
-                else:
-                    # Handle the exception but silence it since we'll display
-                    # an aggregate error message later. Otherwise we'd get
-                    # multiple error messages displayed to the user.
-                    action_failure.append(datum_display)
-                action_description = (
-                    self._get_action_name(past=True).lower(), datum_display)
-                LOG.warning(
-                    'Action %(action)s Failed for %(reason)s', {
-                        'action': action_description, 'reason': ex})
+                continue
+            handled_exc = isinstance(ex, exceptions.HandledException)
+            if handled_exc:
+                # In case of HandledException, an error message should be
+                # handled in exceptions.handle() or other logic,
+                # so we don't need to handle the error message here.
+                # NOTE(amotoki): To raise HandledException from the logic,
+                # pass escalate=True and do not pass redirect argument
+                # to exceptions.handle().
+                # If an exception is handled, the original exception object
+                # is stored in ex.wrapped[1].
+                ex = ex.wrapped[1]
+            else:
+                # Handle the exception but silence it since we'll display
+                # an aggregate error message later. Otherwise we'd get
+                # multiple error messages displayed to the user.
+                action_failure.append(datum_display)
+            action_description = (
+                self._get_action_name(past=True).lower(), datum_display)
+            LOG.warning(
+                'Action %(action)s Failed for %(reason)s', {
+                    'action': action_description, 'reason': ex})
 
         # Begin with success message class, downgrade to info if problems.
         success_message_level = messages.success
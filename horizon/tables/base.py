@@ -19,6 +19,8 @@ import json
 import logging
 from operator import attrgetter
 import sys
+import threading
+import uuid
 
 from django.conf import settings
 from django.core import exceptions as core_exceptions
@@ -29,11 +31,13 @@ from django.template.defaultfilters import slugify
 from django.template.defaultfilters import truncatechars
 from django.template.loader import render_to_string
 from django import urls
+from django.utils.html import conditional_escape
 from django.utils.html import escape
 from django.utils import http
 from django.utils.http import urlencode
 from django.utils.safestring import mark_safe
 from django.utils import termcolors
+from django.utils import translation
 from django.utils.translation import ugettext_lazy as _
 import six
 
@@ -49,6 +53,44 @@ from horizon.utils import html
 LOG = logging.getLogger(__name__)
 PALETTE = termcolors.PALETTES[termcolors.DEFAULT_PALETTE]
 STRING_SEPARATOR = "__"
+# Stand-ins for the parts of the row actions which differ between rows,
+# they are left untouched by the HTML escaping of the templates.
+ROW_ID_PLACEHOLDER = "{horizon_row_id}"
+ROW_ACTION_URL_PLACEHOLDER = "{horizon_row_action_url_%d}"
+
+
+class FragmentCache(object):
+    """Process-wide store of rendered template fragments.
+
+    The least recently used fragments are evicted once ``max_entries`` is
+    reached.
+    """
+
+    def __init__(self, max_entries=1000):
+        self.max_entries = max_entries
+        self._fragments = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            fragment = self._fragments.pop(key, None)
+            if fragment is not None:
+                self._fragments[key] = fragment
+            return fragment
+
+    def set(self, key, fragment):
+        with self._lock:
+            self._fragments.pop(key, None)
+            self._fragments[key] = fragment
+            while len(self._fragments) > self.max_entries:
+                self._fragments.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._fragments.clear()
+
+
+row_actions_fragments = FragmentCache()
 
 
 @six.python_2_unicode_compatible
@@ -573,10 +615,34 @@ class Row(html.HTMLElement):
         updates of cell. Generally you won't need to change this value.
         It is also used for inline edit of the cell.
         Default: ``"cell_update"``.
+
+    .. attribute:: ajax_batch
+
+        Boolean value to determine whether the AJAX updated rows of the table
+        are updated together, with a single request per table and polling
+        interval. The data of the rows is then fetched by
+        :meth:`~horizon.tables.Row.get_data_list`. Default: ``False``.
+
+    .. attribute:: ajax_batch_action_name
+
+        String that is used for the query parameter key to request AJAX
+        updates of several rows at once. Generally you won't need to change
+        this value. Default: ``"rows_update"``.
+
+    .. attribute:: ajax_batch_list_threshold
+
+        Number of rows up to which an overridden
+        :meth:`~horizon.tables.Row.get_data_list` fetching a list of objects
+        should rather fetch each of them with
+        :meth:`~horizon.tables.Row.get_data`, which is cheaper for a few
+        rows. Default: ``3``.
     """
     ajax = False
     ajax_action_name = "row_update"
     ajax_cell_action_name = "cell_update"
+    ajax_batch = False
+    ajax_batch_action_name = "rows_update"
+    ajax_batch_list_threshold = 3
 
     def __init__(self, table, datum=None):
         super(Row, self).__init__()
@@ -611,11 +677,14 @@ class Row(html.HTMLElement):
             self.datum = datum
         else:
             datum = self.datum
-        cells = []
-        for column in table.columns.values():
-            cell = table._meta.cell_class(datum, column, self)
-            cells.append((column.name or column.auto, cell))
-        self.cells = collections.OrderedDict(cells)
+        if table._meta.lazy_cells:
+            self.cells = LazyCells(self)
+        else:
+            cells = []
+            for column in table.columns.values():
+                cell = table._meta.cell_class(datum, column, self)
+                cells.append((column.name or column.auto, cell))
+            self.cells = collections.OrderedDict(cells)
 
         if self.ajax:
             interval = conf.HORIZON_CONFIG['ajax_poll_interval']
@@ -703,6 +772,22 @@ class Row(html.HTMLElement):
         """
         return {}
 
+    def get_data_list(self, request, obj_ids):
+        """Fetches the updated data for the rows of the given object IDs.
+
+        Used for AJAX updating when ``ajax_batch`` is set. Objects which no
+        longer exist are left out of the returned list. By default each
+        object is fetched with :meth:`~horizon.tables.Row.get_data`; override
+        this to fetch them all with a single call where the API allows it.
+        """
+        data = []
+        for obj_id in obj_ids:
+            try:
+                data.append(self.get_data(request, obj_id))
+            except (exceptions.NotFound,) + exceptions.NOT_FOUND:
+                pass
+        return data
+
 
 class Cell(html.HTMLElement):
     """Represents a single cell in the table."""
@@ -905,6 +990,86 @@ class Cell(html.HTMLElement):
                                 {"cell": self})
 
 
+class LazyCells(object):
+    """An ordered mapping of the cells of a row, built when they're used.
+
+    Used as :attr:`~horizon.tables.Row.cells` by tables which set the
+    ``lazy_cells`` option. A row only keeps a reference to itself here
+    instead of a :class:`~horizon.tables.Cell` per column, so a table keeps
+    little more than its data objects in memory until it's rendered.
+
+    Cells looked up by column name are created once and kept (this is how
+    the status columns of a row are read). Cells produced by iterating the
+    values are created for that iteration only, so rendering a row doesn't
+    leave its cells behind.
+    """
+    __slots__ = ('row', '_cells')
+
+    def __init__(self, row):
+        self.row = row
+        self._cells = None
+
+    def _make_cell(self, name):
+        cell = self._cells.get(name) if self._cells else None
+        if cell is None:
+            row = self.row
+            column = row.table.columns[name]
+            cell = row.table._meta.cell_class(row.datum, column, row)
+        return cell
+
+    def __getitem__(self, name):
+        if self._cells is None:
+            self._cells = {}
+        if name not in self._cells:
+            self._cells[name] = self._make_cell(name)
+        return self._cells[name]
+
+    def get(self, name, default=None):
+        if name in self:
+            return self[name]
+        return default
+
+    def __contains__(self, name):
+        return name in self.row.table.columns
+
+    def __iter__(self):
+        return iter(self.row.table.columns)
+
+    def __len__(self):
+        return len(self.row.table.columns)
+
+    def keys(self):
+        return list(self)
+
+    def values(self):
+        return [self._make_cell(name) for name in self]
+
+    def items(self):
+        return list(zip(self.keys(), self.values()))
+
+
+class _StreamedRows(object):
+    """Stands in for the rows of a table rendered by ``render_stream``.
+
+    Its length is the number of rows, but iterating it yields a single row
+    whose markup is the placeholder where the real rows are streamed (or
+    nothing for an empty table), so that the template doesn't build the rows
+    itself.
+    """
+    def __init__(self, table):
+        self.table = table
+
+    def __len__(self):
+        return len(self.table.filtered_data or [])
+
+    def __iter__(self):
+        if self:
+            yield self
+
+    def render(self):
+        return mark_safe(self.table._rows_marker)
+
+
 class DataTableOptions(object):
     """Contains options for :class:`.DataTable` objects.
 
@@ -967,6 +1132,11 @@ class DataTableOptions(object):
         String containing the template which should be used to render the
         table. Defaults to ``"horizon/common/_data_table.html"``.
 
+    .. attribute:: stream_chunk_size
+
+        The number of rows rendered into each chunk of output by
+        :meth:`~horizon.tables.DataTable.render_stream`. Defaults to ``100``.
+
     .. attribute:: row_actions_dropdown_template
 
         String containing the template which should be used to render the
@@ -979,6 +1149,15 @@ class DataTableOptions(object):
         row actions. Defaults to
         ``"horizon/common/_data_table_row_actions_row.html"``.
 
+    .. attribute:: cache_row_actions
+
+        Boolean to control whether the rendered row actions are cached and
+        reused for the rows which have the same allowed actions, in the same
+        state. The template is then rendered with placeholders for the row
+        ID and the URLs of the link actions, which are substituted for each
+        row, so custom row actions templates using other data of the row or
+        of its actions must not enable it. Default: ``False``.
+
     .. attribute:: table_actions_template
 
         String containing the template which should be used to render the
@@ -1022,6 +1201,16 @@ class DataTableOptions(object):
         The class which should be used for rendering the cells of this table.
         Optional. Default: :class:`~horizon.tables.Cell`.
 
+    .. attribute:: lazy_cells
+
+        Boolean to control whether the cells of each row are only created
+        when the row is rendered, instead of along with the row. This keeps
+        the memory used by tables with many rows and columns low, especially
+        when the table is streamed (see
+        :meth:`~horizon.tables.DataTable.render_stream`). The ``cells`` of
+        the rows are then a :class:`~horizon.tables.base.LazyCells` mapping.
+        Default: ``False``.
+
     .. attribute:: row_class
 
         The class which should be used for rendering the rows of this table.
@@ -1084,6 +1273,7 @@ class DataTableOptions(object):
                                                 None)
         self.cell_class = getattr(options, 'cell_class', Cell)
         self.row_class = getattr(options, 'row_class', Row)
+        self.lazy_cells = getattr(options, 'lazy_cells', False)
         self.column_class = getattr(options, 'column_class', Column)
         self.css_classes = getattr(options, 'css_classes', '')
         self.prev_pagination_param = getattr(options,
@@ -1113,6 +1303,7 @@ class DataTableOptions(object):
         self.template = getattr(options,
                                 'template',
                                 'horizon/common/_data_table.html')
+        self.stream_chunk_size = getattr(options, 'stream_chunk_size', 100)
         self.row_actions_dropdown_template = \
             getattr(options,
                     'row_actions_dropdown_template',
@@ -1121,6 +1312,7 @@ class DataTableOptions(object):
             getattr(options,
                     'row_actions_row_template',
                     'horizon/common/_data_table_row_actions_row.html')
+        self.cache_row_actions = getattr(options, 'cache_row_actions', False)
         self.table_actions_template = \
             getattr(options,
                     'table_actions_template',
@@ -1290,6 +1482,11 @@ class DataTable(object):
                 columns.append((key, column))
         self.columns = collections.OrderedDict(columns)
         self._populate_data_cache()
+        # Permission checks of row actions shared by rows of the same group.
+        self._row_action_decisions = {}
+        # Placeholders used to cut the output of render() for streaming.
+        self._stream_marker = None
+        self._rows_marker = None
 
         # Associate these actions with this table
         for action in self.base_actions.values():
@@ -1333,10 +1530,18 @@ class DataTable(object):
                                     and request_method == 'GET'
                                     and action.needs_preloading)
                 valid_method = (request_method == action.method)
-                not_api_filter = (filter_string
-                                  and not action.is_api_filter(filter_field))
-
-                if valid_method or needs_preloading or not_api_filter:
+                api_filter = (filter_string
+                              and action.is_api_filter(filter_field))
+
+                if api_filter:
+                    # The view has already passed the filter to the API.
+                    LOG.debug('Table %(table)s: filter on %(field)s done by '
+                              'the API', {'table': self.name,
+                                          'field': filter_field})
+                elif valid_method or needs_preloading or filter_string:
+                    LOG.debug('Table %(table)s: filter on %(field)s done in '
+                              'Python', {'table': self.name,
+                                         'field': filter_field})
                     if self._meta.mixed_data_type:
                         self._filtered_data = action.data_type_filter(
                             self, self.data, filter_string)
@@ -1395,6 +1600,33 @@ class DataTable(object):
             LOG.exception("Error while checking action permissions.")
             return None
 
+    def _filter_row_action(self, action, datum):
+        key = self._get_row_action_key(action, datum)
+        if key is None:
+            return self._filter_action(action, self.request, datum)
+        if key not in self._row_action_decisions:
+            self._row_action_decisions[key] = self._filter_action(
+                action, self.request, datum)
+        return self._row_action_decisions[key]
+
+    def _get_row_action_key(self, action, datum):
+        """Returns the key grouping rows with the same permission check."""
+        allowed_key = action.get_allowed_key(self.request, datum)
+        if allowed_key is None:
+            return None
+        key = [action.name, allowed_key]
+        if action.policy_rules:
+            target = action.get_policy_target(self.request, datum)
+            key.append(tuple(sorted(target.items())))
+        if self._meta.mixed_data_type:
+            key.append(getattr(datum, self._meta.data_type_name, None))
+        key = tuple(key)
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
     def is_browser_table(self):
         if self._meta.browser_table:
             return True
@@ -1402,11 +1634,70 @@ class DataTable(object):
 
     def render(self):
         """Renders the table using the template from the table options."""
+        if self._stream_marker:
+            # The table is streamed separately into this spot of the page.
+            return mark_safe(self._stream_marker)
         table_template = template.loader.get_template(self._meta.template)
         extra_context = {self._meta.context_var_name: self,
                          'hidden_title': self._meta.hidden_title}
         return table_template.render(extra_context, self.request)
 
+    def render_stream(self, chunk_size=None):
+        """Renders the table as an iterator of HTML chunks.
+
+        The output is the same as :meth:`render`, but the rows are only
+        built and rendered while iterating, ``chunk_size`` rows at a time
+        (:attr:`~horizon.tables.DataTableOptions.stream_chunk_size` by
+        default). The markup before and after the rows is yielded first and
+        last. Tables whose template doesn't render the rows through
+        :meth:`get_rows` one by one are yielded as a single chunk.
+        """
+        chunk_size = chunk_size or self._meta.stream_chunk_size
+        self._stream_marker = None
+        self._rows_marker = '<!-- %s -->' % uuid.uuid4().hex
+        try:
+            content = self.render()
+        finally:
+            marker, self._rows_marker = self._rows_marker, None
+        head, found, tail = content.partition(marker)
+        if not found:
+            yield content
+            return
+        yield head
+        rows = []
+        for row in self.iter_rows():
+            rows.append(row.render())
+            if len(rows) >= chunk_size:
+                yield ''.join(rows)
+                rows = []
+        if rows:
+            yield ''.join(rows)
+        yield tail
+
+    def get_ajax_batch_update_url(self):
+        """Returns the URL to update several AJAX rows of this table at once.
+
+        Returns ``None`` unless the row class of the table sets both ``ajax``
+        and ``ajax_batch``. The IDs of the objects to update are appended as
+        ``obj_ids`` query parameters.
+        """
+        row_class = self._meta.row_class
+        if not (row_class.ajax and row_class.ajax_batch):
+            return None
+        marker_name = self._meta.pagination_param
+        marker = self.request.GET.get(marker_name, None)
+        if not marker:
+            marker_name = self._meta.prev_pagination_param
+            marker = self.request.GET.get(marker_name, None)
+        request_params = [
+            ("action", row_class.ajax_batch_action_name),
+            ("table", self.name),
+        ]
+        if marker:
+            request_params.append((marker_name, marker))
+        params = urlencode(collections.OrderedDict(request_params))
+        return "%s?%s" % (self.get_absolute_url(), params)
+
     def get_absolute_url(self):
         """Returns the canonical URL for this table.
 
@@ -1518,9 +1809,7 @@ class DataTable(object):
             bound_action.attrs = copy.copy(bound_action.attrs)
             bound_action.datum = datum
             # Remove disallowed actions.
-            if not self._filter_action(bound_action,
-                                       self.request,
-                                       datum):
+            if not self._filter_row_action(bound_action, datum):
                 continue
             # Hook for modifying actions based on data. No-op by default.
             bound_action.update(self.request, datum)
@@ -1579,10 +1868,70 @@ class DataTable(object):
 
         row_actions_template = template.loader.get_template(template_path)
         bound_actions = self.get_row_actions(datum)
+        if self._meta.cache_row_actions:
+            return self._render_cached_row_actions(row_actions_template,
+                                                   template_path,
+                                                   bound_actions,
+                                                   self.get_object_id(datum))
         extra_context = {"row_actions": bound_actions,
                          "row_id": self.get_object_id(datum)}
         return row_actions_template.render(extra_context, self.request)
 
+    def _render_cached_row_actions(self, row_actions_template, template_path,
+                                   bound_actions, row_id):
+        row_id = six.text_type(row_id)
+        placeholder_actions = [
+            self._get_placeholder_row_action(action, row_id, index)
+            for index, action in enumerate(bound_actions)]
+        key = (type(self), self.name, template_path,
+               translation.get_language(),
+               tuple(self._get_row_action_signature(action)
+                     for action in placeholder_actions))
+        fragment = row_actions_fragments.get(key)
+        if fragment is None:
+            extra_context = {"row_actions": placeholder_actions,
+                             "row_id": ROW_ID_PLACEHOLDER}
+            fragment = row_actions_template.render(extra_context,
+                                                   self.request)
+            row_actions_fragments.set(key, fragment)
+        for index, action in enumerate(bound_actions):
+            if hasattr(action, 'bound_url'):
+                fragment = fragment.replace(
+                    ROW_ACTION_URL_PLACEHOLDER % index,
+                    conditional_escape(action.bound_url))
+        return mark_safe(fragment.replace(ROW_ID_PLACEHOLDER,
+                                          conditional_escape(row_id)))
+
+    @staticmethod
+    def _get_placeholder_row_action(action, row_id, index):
+        """Returns a copy of the action with placeholders for the row parts.
+
+        The row ID is replaced in the HTML attributes, like the default
+        ``id`` of the action, and the URL of a link action is replaced.
+        """
+        placeholder = copy.copy(action)
+        attrs = action.get_default_attrs()
+        attrs.update(action.attrs)
+        if row_id:
+            attrs = dict(
+                (name, value.replace(row_id, ROW_ID_PLACEHOLDER)
+                 if isinstance(value, six.string_types) else value)
+                for name, value in attrs.items())
+        placeholder.attrs = attrs
+        if hasattr(action, 'bound_url'):
+            placeholder.bound_url = ROW_ACTION_URL_PLACEHOLDER % index
+        return placeholder
+
+    @staticmethod
+    def _get_row_action_signature(action):
+        """Returns the values of the action used by the row templates."""
+        return (type(action), action.name, getattr(action, 'method', None),
+                six.text_type(action.verbose_name), action.attr_string,
+                tuple(action.get_default_classes()),
+                getattr(action, 'action_type', None),
+                six.text_type(getattr(action, 'help_text', None)),
+                getattr(action, 'icon', None), hasattr(action, 'bound_url'))
+
     @staticmethod
     def parse_action(action_string):
         """Parses the ``action_string`` parameter sent back with the POST data.
@@ -1680,6 +2029,9 @@ class DataTable(object):
                         return HttpResponse(new_row.render())
                     else:
                         return HttpResponse(status=error.status_code)
+            elif (new_row.ajax and new_row.ajax_batch and
+                  new_row.ajax_batch_action_name == action_name):
+                return self.batch_update_handle(request, new_row)
             elif new_row.ajax_cell_action_name == action_name:
                 # inline edit of the cell actions
                 return self.inline_edit_handle(request, table_name,
@@ -1696,6 +2048,40 @@ class DataTable(object):
                             return handled
         return None
 
+    def batch_update_handle(self, request, new_row):
+        """Batched AJAX row update handler.
+
+        Responds with a JSON object holding the rendered rows of the
+        requested objects by object ID under ``rows``, and the IDs of the
+        objects which no longer exist under ``missing``.
+        """
+        obj_ids = request.GET.getlist('obj_ids')
+        try:
+            data = new_row.get_data_list(request, obj_ids)
+            error = False
+        except Exception:
+            data = []
+            error = exceptions.handle(request, ignore=True)
+        if not request.is_ajax():
+            return None
+        if error:
+            return HttpResponse(status=error.status_code)
+
+        rows = {}
+        for datum in data:
+            row = self._meta.row_class(self)
+            if self.get_object_id(datum) == self.current_item_id:
+                self.selected = True
+                row.classes.append('current_selected')
+            row.load_cells(datum)
+            rows[six.text_type(self.get_object_id(datum))] = row.render()
+        response = {
+            'rows': rows,
+            'missing': [obj_id for obj_id in obj_ids if obj_id not in rows]
+        }
+        return HttpResponse(json.dumps(response),
+                            content_type="application/json")
+
     def inline_edit_handle(self, request, table_name, action_name, obj_id,
                            new_row):
         """Inline edit handler.
@@ -1921,14 +2307,19 @@ class DataTable(object):
 
     def get_rows(self):
         """Return the row data for this table broken out by columns."""
-        rows = []
+        if self._rows_marker:
+            return _StreamedRows(self)
+        return list(self.iter_rows())
+
+    def iter_rows(self):
+        """Yields the rows of this table one at a time."""
         try:
             for datum in self.filtered_data:
                 row = self._meta.row_class(self, datum)
                 if self.get_object_id(datum) == self.current_item_id:
                     self.selected = True
                     row.classes.append('current_selected')
-                rows.append(row)
+                yield row
         except Exception:
             # Exceptions can be swallowed at the template level here,
             # re-raising as a TemplateSyntaxError makes them visible.
@@ -1937,8 +2328,6 @@ class DataTable(object):
             raise six.reraise(template.TemplateSyntaxError, exc_info[1],
                               exc_info[2])
 
-        return rows
-
     def css_classes(self):
         """Returns the additional CSS class to be added to <table> tag."""
         return self._meta.css_classes
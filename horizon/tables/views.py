@@ -13,17 +13,37 @@
 #    under the License.
 
 from collections import defaultdict
+import uuid
 
+from django import http
 from django import shortcuts
 
+from horizon import base
+from horizon.utils import functions as utils
 from horizon import views
 
 from horizon.templatetags.horizon import has_permissions
 
 
 class MultiTableMixin(object):
-    """A generic mixin which provides methods for handling DataTables."""
+    """A generic mixin which provides methods for handling DataTables.
+
+    .. attribute:: concurrent_data_loading
+
+        When ``True`` the ``get_{{ table_name }}_data`` methods are called
+        in a thread pool instead of one after another, so the page takes as
+        long as its slowest table rather than the sum of all of them. Only
+        enable it when the data methods are independent of each other.
+        Defaults to ``False``.
+
+    .. attribute:: data_loading_max_workers
+
+        The maximum number of data methods called at the same time when
+        :attr:`concurrent_data_loading` is enabled. Defaults to ``4``.
+    """
     data_method_pattern = "get_%s_data"
+    concurrent_data_loading = False
+    data_loading_max_workers = 4
 
     def __init__(self, *args, **kwargs):
         super(MultiTableMixin, self).__init__(*args, **kwargs)
@@ -35,13 +55,19 @@ class MultiTableMixin(object):
 
     def _get_data_dict(self):
         if not self._data:
-            for table in self.table_classes:
-                data = []
-                name = table._meta.name
-                func_list = self._data_methods.get(name, [])
-                for func in func_list:
-                    data.extend(func())
-                self._data[name] = data
+            names = [table._meta.name for table in self.table_classes]
+            calls = [(name, func) for name in names
+                     for func in self._data_methods.get(name, [])]
+            if self.concurrent_data_loading:
+                results = utils.call_concurrently(
+                    [func for name, func in calls],
+                    self.data_loading_max_workers)
+            else:
+                results = [func() for name, func in calls]
+            data = dict((name, []) for name in names)
+            for (name, func), result in zip(calls, results):
+                data[name].extend(result)
+            self._data.update(data)
         return self._data
 
     def get_data_methods(self, table_classes, methods):
@@ -241,10 +267,23 @@ class DataTableView(MultiTableView):
 
     Optionally, you can override the ``has_more_data`` method to trigger
     pagination handling for APIs that support it.
+
+    .. attribute:: stream_response
+
+        When ``True`` the page is sent as a
+        :class:`~django.http.StreamingHttpResponse`: the markup up to the
+        table rows goes out first, then the rows in chunks of
+        :attr:`~horizon.tables.DataTableOptions.stream_chunk_size` as they
+        are rendered (see :meth:`~horizon.tables.DataTable.render_stream`).
+        AJAX requests are not streamed. Messages added while the rows are
+        rendered are not displayed. The access decisions made while the rows
+        are rendered are saved once the response is sent. Defaults to
+        ``False``.
     """
     table_class = None
     context_object_name = 'table'
     template_name = 'horizon/common/_data_table_view.html'
+    stream_response = False
 
     def _get_data_dict(self):
         if not self._data:
@@ -280,6 +319,41 @@ class DataTableView(MultiTableView):
             context[self.context_object_name] = self.table
         return context
 
+    def render_to_response(self, context, **response_kwargs):
+        response = super(DataTableView, self).render_to_response(
+            context, **response_kwargs)
+        table = context.get(self.context_object_name)
+        if not self.stream_response or table is None or self.request.is_ajax():
+            return response
+        return self._stream_table_response(response, table)
+
+    def _stream_table_response(self, response, table):
+        # Render the page around the table, then stream the table into it.
+        table._stream_marker = '<!-- %s -->' % uuid.uuid4().hex
+        try:
+            content = response.rendered_content
+        finally:
+            marker, table._stream_marker = table._stream_marker, None
+        head, found, tail = content.partition(marker)
+        if not found:
+            return response
+
+        def stream():
+            try:
+                yield head
+                for chunk in table.render_stream():
+                    yield chunk
+                yield tail
+            finally:
+                # The middleware has processed the response before the
+                # table is rendered, so the access decisions made while
+                # rendering it are saved here.
+                base.save_access_decisions(self.request)
+
+        return http.StreamingHttpResponse(
+            stream(), status=response.status_code,
+            content_type=response['Content-Type'])
+
     def post(self, request, *args, **kwargs):
         # If the server side table filter changed then go back to the first
         # page of data. Otherwise GET and POST handling are the same.
@@ -17,6 +17,8 @@ import logging
 import operator
 import sys
 
+import futurist
+from futurist import waiters
 import six
 
 from django.conf import settings
@@ -25,6 +27,7 @@ from django.template import TemplateSyntaxError
 from django.utils import module_loading
 
 from horizon import exceptions
+from horizon.utils import functions as utils
 from horizon.utils import html
 
 LOG = logging.getLogger(__name__)
@@ -87,12 +90,35 @@ class TabGroup(html.HTMLElement):
         Read-only property which is set to the value of the current active tab.
         This may not be the same as the value of ``selected`` if no
         specific tab was requested via the ``GET`` parameter.
+
+    .. attribute:: concurrent_preload
+
+        Boolean to control whether the tabs to preload are loaded in a thread
+        pool instead of one after another. Only enable it when the tabs'
+        ``get_context_data`` methods are independent of each other.
+        Default: ``False``
+
+    .. attribute:: preload_max_workers
+
+        The maximum number of tabs loaded at the same time when
+        :attr:`concurrent_preload` is enabled. Default: ``4``
+
+    .. attribute:: preload_timeout
+
+        The number of seconds to wait for the tabs when
+        :attr:`concurrent_preload` is enabled, measured from the start of the
+        preload. A tab still loading after that is deferred: it is rendered
+        as an empty placeholder which the browser fetches over AJAX once the
+        page is displayed. ``None`` waits for every tab. Default: ``None``
     """
     slug = None
     template_name = "horizon/common/_tab_group.html"
     param_name = 'tab'
     sticky = False
     show_single_tab = False
+    concurrent_preload = False
+    preload_max_workers = 4
+    preload_timeout = None
     _selected = None
     _active = None
 
@@ -169,13 +195,45 @@ class TabGroup(html.HTMLElement):
 
     def load_tab_data(self):
         """Preload all data that for the tabs that will be displayed."""
-        for tab in self._tabs.values():
-            if tab.load and not tab.data_loaded:
-                try:
-                    tab._data = tab.get_context_data(self.request)
-                except Exception:
-                    tab._data = False
-                    exceptions.handle(self.request)
+        tabs = [tab for tab in self._tabs.values()
+                if tab.load and not tab.data_loaded]
+        if self.concurrent_preload:
+            if self.request.is_ajax() and self.selected:
+                # Only the selected tab is sent back to AJAX requests, which
+                # is how deferred tabs are fetched, so don't wait for others.
+                tabs = [tab for tab in tabs if tab == self.selected]
+            else:
+                self._load_tab_data_concurrently(tabs)
+                return
+        for tab in tabs:
+            try:
+                tab._data = tab.get_context_data(self.request)
+            except Exception:
+                tab._data = False
+                exceptions.handle(self.request)
+
+    def _load_tab_data_concurrently(self, tabs):
+        if not tabs:
+            return
+        workers = min(self.preload_max_workers, len(tabs))
+        executor = futurist.ThreadPoolExecutor(max_workers=workers)
+        futures = [executor.submit(
+            utils.with_current_locale(tab.get_context_data), self.request)
+            for tab in tabs]
+        # Don't wait for the tabs which time out; their results are dropped.
+        executor.shutdown(wait=False)
+        waiters.wait_for_all(futures, timeout=self.preload_timeout)
+        for tab, future in zip(tabs, futures):
+            if not future.done():
+                LOG.info('Tab "%s" took longer than %s seconds to load and '
+                         'is deferred.', tab.get_id(), self.preload_timeout)
+                tab._deferred = True
+                continue
+            try:
+                tab._data = future.result()
+            except Exception:
+                tab._data = False
+                exceptions.handle(self.request)
 
     def get_id(self):
         """Returns the id for this tab group.
@@ -305,11 +363,17 @@ class Tab(html.HTMLElement):
 
         A list of permission names which this tab requires in order to be
         displayed. Defaults to an empty list (``[]``).
+
+    .. attribute:: deferred
+
+        Read-only access to determine whether this tab timed out while its
+        tab group was preloading and is to be loaded over AJAX instead.
     """
     name = None
     slug = None
     preload = True
     _active = None
+    _deferred = False
     permissions = []
 
     def __init__(self, tab_group, request=None):
@@ -342,7 +406,12 @@ class Tab(html.HTMLElement):
     @property
     def load(self):
         load_preloaded = self.preload or self.is_active()
-        return load_preloaded and self._allowed and self._enabled
+        return (load_preloaded and self._allowed and self._enabled and
+                not self._deferred)
+
+    @property
+    def deferred(self):
+        return self._deferred
 
     @property
     def data(self):
@@ -474,8 +543,22 @@ class TableTab(Tab):
         :class:`~horizon.tables.MultiTableView`. For each table class you
         need to define a corresponding ``get_{{ table_name }}_data`` method
         as with :class:`~horizon.tables.MultiTableView`.
+
+    .. attribute:: concurrent_data_loading
+
+        When ``True`` the ``get_{{ table_name }}_data`` methods are called
+        in a thread pool instead of one after another. Equivalent to the
+        :attr:`~horizon.tables.MultiTableView.concurrent_data_loading`
+        attribute. Defaults to ``False``.
+
+    .. attribute:: data_loading_max_workers
+
+        The maximum number of data methods called at the same time when
+        :attr:`concurrent_data_loading` is enabled. Defaults to ``4``.
     """
     table_classes = None
+    concurrent_data_loading = False
+    data_loading_max_workers = 4
 
     def __init__(self, tab_group, request):
         super(TableTab, self).__init__(tab_group, request)
@@ -497,7 +580,8 @@ class TableTab(Tab):
         """
         # We only want the data to be loaded once, so we track if we have...
         if not self._table_data_loaded:
-            for table_name, table in self._tables.items():
+            data_funcs = []
+            for table_name in self._tables:
                 # Fetch the data function.
                 func_name = "get_%s_data" % table_name
                 data_func = getattr(self, func_name, None)
@@ -507,9 +591,16 @@ class TableTab(Tab):
                         "You must define a %(func_name)s method on"
                         " %(cls_name)s."
                         % {'func_name': func_name, 'cls_name': cls_name})
+                data_funcs.append(data_func)
 
-                # Load the data.
-                table.data = data_func()
+            # Load the data.
+            if self.concurrent_data_loading:
+                results = utils.call_concurrently(
+                    data_funcs, self.data_loading_max_workers)
+            else:
+                results = [func() for func in data_funcs]
+            for table, data in zip(self._tables.values(), results):
+                table.data = data
                 table._meta.has_prev_data = self.has_prev_data(table)
                 table._meta.has_more_data = self.has_more_data(table)
             # Mark our data as loaded so we don't run the loaders again.
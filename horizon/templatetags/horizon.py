@@ -15,8 +15,12 @@
 from __future__ import absolute_import
 
 from collections import OrderedDict
+import hashlib
+import json
+import logging
 
 from django.conf import settings
+from django.core.cache import caches
 from django import template
 from django.template import Node
 from django.utils.encoding import force_text
@@ -26,8 +30,10 @@ from django.utils.translation import ugettext_lazy as _
 from horizon.base import Horizon
 from horizon import conf
 from horizon.contrib import bootstrap_datepicker
+from horizon.utils import functions
 
 
+LOG = logging.getLogger(__name__)
 register = template.Library()
 
 
@@ -53,6 +59,86 @@ def has_permissions_on_list(components, user):
             in components if has_permissions(user, component)]
 
 
+def _is_in_nav(component, context):
+    nav = component.nav(context) if callable(component.nav) else component.nav
+    return bool(nav) and component.can_access(context)
+
+
+def _get_nav_tree(context):
+    """Returns the slugs of the components shown in the navigation.
+
+    The result maps the slug of each dashboard shown to the slugs of the
+    panels shown, by panel group.
+    """
+    tree = {}
+    for dash in Horizon.get_dashboards():
+        if not _is_in_nav(dash, context):
+            continue
+        tree[dash.slug] = dict(
+            (group.slug, [panel.slug for panel in group
+                          if _is_in_nav(panel, context)])
+            for group in dash.get_panel_groups().values())
+    return tree
+
+
+def get_nav_cache_config():
+    """Return the ``NAVIGATION_CACHE`` setting merged with defaults."""
+    config = {
+        'backend': None,
+        'timeout': 300,
+    }
+    config.update(getattr(settings, 'NAVIGATION_CACHE', {}))
+    return config
+
+
+def _get_nav_cache_key(request):
+    user = request.user
+    if hasattr(user, 'roles'):
+        # The domain context selected by a cloud admin changes the result
+        # of the identity panels policy checks.
+        identity = [sorted(role['name'] for role in user.roles or []),
+                    getattr(user, 'tenant_id', None),
+                    getattr(user, 'domain_id', None),
+                    getattr(user, 'user_domain_id', None),
+                    request.session.get('domain_context')]
+    else:
+        identity = [user.pk]
+    current_dashboard = request.horizon.get('dashboard', None)
+    key_data = json.dumps(
+        [identity, getattr(user, 'services_region', None),
+         getattr(user, 'service_catalog', None),
+         current_dashboard.slug if current_dashboard else None],
+        sort_keys=True, default=repr)
+    return 'horizon_nav:%s' % hashlib.sha1(
+        key_data.encode('utf-8')).hexdigest()
+
+
+def get_nav_tree(context):
+    """Returns the navigation tree of the user, cached when configured.
+
+    The tree is stored in the cache selected by the ``NAVIGATION_CACHE``
+    setting, keyed by the roles, project, domain, region and service
+    catalog of the user and by the current dashboard, until the token of
+    the user expires.
+    """
+    config = get_nav_cache_config()
+    if not config['backend']:
+        return _get_nav_tree(context)
+    request = context['request']
+    cache = caches[config['backend']]
+    key = _get_nav_cache_key(request)
+    tree = cache.get(key)
+    if tree is None:
+        tree = _get_nav_tree(context)
+        timeout = functions.get_token_bound_timeout(request,
+                                                    config['timeout'])
+        if timeout > 0:
+            cache.set(key, tree, timeout)
+    else:
+        LOG.debug("Navigation tree served from the cache.")
+    return tree
+
+
 @register.inclusion_tag('horizon/_sidebar.html', takes_context=True)
 def horizon_nav(context):
     if 'request' not in context:
@@ -60,29 +146,24 @@ def horizon_nav(context):
     current_dashboard = context['request'].horizon.get('dashboard', None)
     current_panel_group = None
     current_panel = context['request'].horizon.get('panel', None)
+    tree = get_nav_tree(context)
     dashboards = []
     for dash in Horizon.get_dashboards():
         panel_groups = dash.get_panel_groups()
+        if current_panel is not None:
+            for group in panel_groups.values():
+                if current_panel in group:
+                    current_panel_group = group.slug
+        if dash.slug not in tree:
+            continue
         non_empty_groups = []
         for group in panel_groups.values():
-            allowed_panels = []
-            for panel in group:
-                if (callable(panel.nav) and panel.nav(context) and
-                        panel.can_access(context)):
-                    allowed_panels.append(panel)
-                elif (not callable(panel.nav) and panel.nav and
-                        panel.can_access(context)):
-                    allowed_panels.append(panel)
-                if panel == current_panel:
-                    current_panel_group = group.slug
+            allowed_slugs = tree[dash.slug].get(group.slug, ())
+            allowed_panels = [panel for panel in group
+                              if panel.slug in allowed_slugs]
             if allowed_panels:
                 non_empty_groups.append((group, allowed_panels))
-        if (callable(dash.nav) and dash.nav(context) and
-                dash.can_access(context)):
-            dashboards.append((dash, OrderedDict(non_empty_groups)))
-        elif (not callable(dash.nav) and dash.nav and
-                dash.can_access(context)):
-            dashboards.append((dash, OrderedDict(non_empty_groups)))
+        dashboards.append((dash, OrderedDict(non_empty_groups)))
     return {'components': dashboards,
             'user': context['request'].user,
             'current': current_dashboard,
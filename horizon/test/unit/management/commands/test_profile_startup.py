@@ -0,0 +1,112 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import json
+import os
+import tempfile
+import unittest
+
+import mock
+import six
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from horizon.management.commands import profile_startup
+
+
+RESULT = {
+    'python': '3.6.0',
+    'settings': 'horizon.test.settings',
+    'time': 1.5,
+    'memory': 3 * 1024 * 1024,
+    'maxrss': 50 * 1024 * 1024,
+    'phases': [
+        {'name': 'settings', 'depth': 0, 'time': 0.5, 'memory': 1024,
+         'imports': 2, 'maxrss': None},
+        {'name': 'settings_utils.get_xstatic_dirs', 'depth': 1, 'time': 0.1,
+         'memory': 0, 'imports': 0, 'maxrss': None},
+    ],
+    'modules': [
+        {'name': 'fastclient', 'parent': None, 'cumulative': 0.2,
+         'self': 0.2, 'memory': 10, 'self_memory': 10},
+        {'name': 'slowclient.v2', 'parent': 'slowclient', 'cumulative': 0.1,
+         'self': 0.1, 'memory': 10, 'self_memory': 10},
+        {'name': 'slowclient', 'parent': None, 'cumulative': 0.4,
+         'self': 0.3, 'memory': 20, 'self_memory': 10},
+    ],
+}
+
+
+class ProfileStartupTests(TestCase):
+
+    def _call_command(self, **options):
+        out = six.StringIO()
+        call_command('profile_startup', stdout=out, **options)
+        return out.getvalue().splitlines()
+
+    def _get_section(self, lines, title):
+        """Returns the first column of the rows of a table of the report."""
+        start = [line.split()[0] if line else ''
+                 for line in lines].index(title) + 1
+        end = (lines.index('', start) if '' in lines[start:]
+               else len(lines))
+        return [line.split()[0] for line in lines[start:end]]
+
+    @mock.patch.object(profile_startup.Command, '_run_profiler',
+                       return_value=RESULT)
+    def test_report(self, run_profiler):
+        lines = self._call_command(limit=1)
+        # Nested phases are indented.
+        self.assertTrue(lines[5].startswith('  settings_utils.'))
+        self.assertEqual(['settings_utils.get_xstatic_dirs', '0.100', '0.00',
+                          '0'], lines[5].split())
+        # The packages are sorted by the time of their own modules, the
+        # modules by their cumulative time, one of each is reported.
+        self.assertEqual(['slowclient'],
+                         self._get_section(lines, 'Package'))
+        self.assertEqual(['slowclient'],
+                         self._get_section(lines, 'Module'))
+
+    @mock.patch.object(profile_startup.Command, '_run_profiler',
+                       return_value=RESULT)
+    def test_report_sorted_and_filtered(self, run_profiler):
+        lines = self._call_command(sort='self', filter='slowclient')
+        self.assertEqual(['slowclient', 'slowclient.v2'],
+                         self._get_section(lines, 'Module'))
+        lines = self._call_command(sort='name')
+        self.assertEqual(['fastclient', 'slowclient', 'slowclient.v2'],
+                         self._get_section(lines, 'Module'))
+
+    @unittest.skipIf(six.PY2, 'Profiling the startup requires Python 3.')
+    def test_profile_startup(self):
+        fd, output = tempfile.mkstemp(suffix='.json')
+        os.close(fd)
+        self.addCleanup(os.remove, output)
+        self._call_command(json=output, no_memory=True,
+                           path=['/auth/login/'])
+        with open(output) as f:
+            result = json.load(f)
+
+        self.assertEqual('horizon.test.settings', result['settings'])
+        self.assertEqual(
+            ['import django', 'settings',
+             'openstack_dashboard.utils.settings.get_xstatic_dirs',
+             'django.setup', 'middleware', 'urlconf',
+             'resolve /auth/login/'],
+            [phase['name'] for phase in result['phases']])
+        modules = dict((module['name'], module)
+                       for module in result['modules'])
+        self.assertIn('horizon.test.settings', modules)
+        self.assertIn('horizon.base', modules)
+        self.assertGreaterEqual(modules['horizon.base']['cumulative'],
+                                modules['horizon.base']['self'])
@@ -15,6 +15,9 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import json
+import re
+import threading
 import unittest
 import uuid
 
@@ -30,6 +33,7 @@ import mock
 from mox3.mox import IsA
 import six
 
+from horizon import base
 from horizon import exceptions
 from horizon import tables
 from horizon.tables import actions
@@ -134,6 +138,17 @@ class MyRow(tables.Row):
         return TEST_DATA_2[0]
 
 
+class MyBatchUpdateRow(tables.Row):
+    ajax = True
+    ajax_batch = True
+
+    def get_data(self, request, obj_id):
+        for datum in TEST_DATA_2:
+            if datum.id == obj_id:
+                return datum
+        raise exceptions.NotFound()
+
+
 class MyBatchAction(tables.BatchAction):
     name = "batch"
 
@@ -159,6 +174,21 @@ class MyBatchAction(tables.BatchAction):
         )
 
 
+class MyConcurrentBatchAction(MyBatchAction):
+    action_max_workers = 3
+    # Set by the action on the last object, waited for by the first one.
+    released = None
+
+    def action(self, request, obj_id):
+        if obj_id == '1':
+            if not self.released.wait(5):
+                raise Exception('Ran serially')
+        elif obj_id == '2':
+            raise Exception('Expected failure')
+        else:
+            self.released.set()
+
+
 class MyBatchActionWithHelpText(MyBatchAction):
     name = "batch_help"
     help_text = "this is help."
@@ -332,6 +362,45 @@ class MyServerFilterTable(MyTable):
                        MyBatchActionWithHelpText)
 
 
+class MyLazyCellsTable(MyTable):
+    class Meta(object):
+        name = "my_table"
+        verbose_name = "My Table"
+        status_columns = ["status"]
+        columns = ('id', 'name', 'value', 'optional', 'status')
+        row_class = MyRow
+        column_class = MyColumn
+        table_actions = (MyFilterAction, MyAction, MyBatchAction,
+                         MyBatchActionWithHelpText)
+        row_actions = (MyAction, MyLinkAction, MyBatchAction, MyToggleAction,
+                       MyBatchActionWithHelpText)
+        lazy_cells = True
+
+
+class MyCachedRowActionsTable(MyTable):
+    class Meta(object):
+        name = "my_table"
+        columns = ('id', 'name', 'value', 'optional', 'status')
+        row_actions = (MyAction, MyLinkAction, MyBatchAction, MyToggleAction,
+                       MyBatchActionWithHelpText)
+        cache_row_actions = True
+
+
+class MyBatchUpdateTable(MyTable):
+    class Meta(object):
+        name = "my_table"
+        status_columns = ["status"]
+        columns = ('id', 'name', 'value', 'optional', 'status')
+        row_class = MyBatchUpdateRow
+
+
+class MyConcurrentBatchTable(MyTable):
+    class Meta(object):
+        name = "my_table"
+        columns = ('id', 'name', 'value', 'optional', 'status')
+        table_actions = (MyConcurrentBatchAction,)
+
+
 class MyTableSelectable(MyTable):
     class Meta(object):
         name = "my_table"
@@ -389,6 +458,24 @@ class DisabledActionsTable(tables.DataTable):
         multi_select = True
 
 
+class MyGroupedAction(MyAction):
+    name = "grouped_delete"
+    allowed_datum_attrs = ('status',)
+    policy_rules = (("compute", "compute:delete"),)
+
+    def get_policy_target(self, request, datum):
+        return {"project_id": getattr(datum, 'optional', None)}
+
+
+class GroupedActionsTable(tables.DataTable):
+    id = tables.Column('id')
+    status = tables.Column('status')
+
+    class Meta(object):
+        name = "grouped_actions_table"
+        row_actions = (MyGroupedAction, MyAction)
+
+
 class DataTableTests(test.TestCase):
 
     use_mox = True
@@ -929,6 +1016,81 @@ class DataTableTests(test.TestCase):
                             '</textarea>',
                             count=1, html=True)
 
+    @staticmethod
+    def _row_ids(content):
+        return re.findall(r'id="my_table__row__(\w+)"', content)
+
+    def test_table_render_stream(self):
+        self.table = MyTable(self.request, TEST_DATA)
+        expected = self.table.render()
+        chunks = list(self.table.render_stream(chunk_size=3))
+        # Header, rows in chunks of three, then the footer.
+        self.assertEqual(4, len(chunks))
+        self.assertIn('<tbody>', chunks[0])
+        self.assertEqual(3, chunks[1].count('<tr '))
+        self.assertEqual(1, chunks[2].count('<tr '))
+        self.assertIn('</tbody>', chunks[3])
+        self.assertIn('Displaying 4 items', chunks[0])
+        self.assertEqual(['1', '2', '3', '4'], self._row_ids(expected))
+        self.assertEqual(self._row_ids(expected),
+                         self._row_ids(''.join(chunks)))
+
+    def test_table_render_stream_empty(self):
+        self.table = MyTable(self.request, [])
+        expected = self.table.render()
+        chunks = list(self.table.render_stream())
+        # Without rows there is nothing to stream separately.
+        self.assertEqual(1, len(chunks))
+        self.assertIn('No items to display.', chunks[0])
+        self.assertEqual(self._row_ids(expected), self._row_ids(chunks[0]))
+
+    def test_table_lazy_cells(self):
+        self.table = MyLazyCellsTable(self.request, TEST_DATA)
+        rows = self.table.get_rows()
+        row = rows[0]
+        self.assertIsInstance(row.cells, tables.base.LazyCells)
+        self.assertEqual(list(self.table.columns), list(row.cells))
+        # Only the status column was needed to build the row.
+        self.assertEqual(['status'], list(row.cells._cells))
+        self.assertEqual('status_up', row.status_class)
+        self.assertIs(row.cells['status'], row.cells['status'])
+
+        cells = row.get_cells()
+        self.assertEqual(7, len(cells))
+        self.assertEqual('custom object_1', cells[2].data)
+        self.assertIs(row.cells['status'], cells[5])
+        # Iterating the cells doesn't keep them on the row.
+        self.assertEqual(['status'], list(row.cells._cells))
+        self.assertIsNot(cells[2], row.get_cells()[2])
+
+    def test_table_lazy_cells_render(self):
+        eager = MyTable(self.request, TEST_DATA).render()
+        self.table = MyLazyCellsTable(self.request, TEST_DATA)
+        lazy = self.table.render()
+        self.assertEqual(self._row_ids(eager), self._row_ids(lazy))
+        self.assertEqual(eager.count('<td'), lazy.count('<td'))
+        self.assertEqual(eager.count('my_table__row_1__action_'),
+                         lazy.count('my_table__row_1__action_'))
+        self.assertIn('custom object_1', lazy)
+
+    def test_table_cached_row_actions(self):
+        tables.base.row_actions_fragments.clear()
+        self.addCleanup(tables.base.row_actions_fragments.clear)
+        data = TEST_DATA + (FakeObject('a&"b', 'object_5', 'value_5', 'up'),)
+        self.table = MyCachedRowActionsTable(self.request, data)
+        for row in (False, True):
+            for datum in data:
+                with mock.patch.object(self.table._meta, 'cache_row_actions',
+                                       False):
+                    expected = self.table.render_row_actions(datum, row=row)
+                self.assertEqual(expected,
+                                 self.table.render_row_actions(datum,
+                                                               row=row))
+        # The rows with the "up" status share their fragments.
+        self.assertEqual(6, len(tables.base.row_actions_fragments._fragments))
+        self.assertIn('value="my_table__delete__a&amp;&quot;b"',
+                      self.table.render_row_actions(data[-1]))
+
     def test_table_actions(self):
         # Single object action
         action_string = "my_table__delete__1"
@@ -1112,6 +1274,54 @@ class DataTableTests(test.TestCase):
         self.assertEqual("Log In",
                          six.text_type(row_actions[1].verbose_name))
 
+    def test_table_batch_action_concurrent(self):
+        MyConcurrentBatchAction.released = threading.Event()
+        action_string = "my_table__batch"
+        req = self.factory.post('/my_url/', {'action': action_string,
+                                             'object_ids': ['1', '2', '3']})
+        self.table = MyConcurrentBatchTable(req, TEST_DATA)
+        handled = self.table.maybe_handle()
+        self.assertEqual(302, handled.status_code)
+        self.assertEqual(['1', '3'],
+                         self.table.base_actions['batch'].success_ids)
+        self.assertEqual([u"Unable to batch item: object_2",
+                          u"Batched Items: object_1, object_3"],
+                         [m.message for m in req._messages])
+
+    def test_table_batch_update_url(self):
+        req = self.factory.get('/my_url/', {'marker': '3'})
+        self.table = MyBatchUpdateTable(req, TEST_DATA)
+        self.assertEqual('/my_url/?action=rows_update&table=my_table&marker=3',
+                         self.table.get_ajax_batch_update_url())
+        self.assertContains(
+            http.HttpResponse(self.table.render()),
+            'data-batch-update-url="/my_url/?action=rows_update&amp;'
+            'table=my_table&amp;marker=3"', 1)
+
+        self.table = MyTable(req, TEST_DATA)
+        self.assertIsNone(self.table.get_ajax_batch_update_url())
+        self.assertNotContains(http.HttpResponse(self.table.render()),
+                               'data-batch-update-url')
+
+    def test_table_batch_update(self):
+        params = {"table": "my_table", "action": "rows_update",
+                  "obj_ids": ["1", "5"]}
+        req = self.factory.get('/my_url/', params,
+                               HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        self.table = MyBatchUpdateTable(req)
+        resp = self.table.maybe_preempt()
+        self.assertEqual(200, resp.status_code)
+        self.assertEqual('application/json', resp['Content-Type'])
+        content = json.loads(resp.content.decode('utf-8'))
+        self.assertEqual(['1'], list(content['rows']))
+        self.assertIn('id="my_table__row__1"', content['rows']['1'])
+        self.assertIn('status_down', content['rows']['1'])
+        self.assertEqual(['5'], content['missing'])
+
+        # Tables without batched updates don't handle the request.
+        self.table = MyTable(req)
+        self.assertIsNone(self.table.maybe_preempt())
+
     def test_server_filtering(self):
         filter_value_param = "my_table__filter__q"
         filter_field_param = '%s_field' % filter_value_param
@@ -1141,6 +1351,42 @@ class DataTableTests(test.TestCase):
                                   u'FakeObject: öbject_4'],
                                  transform=six.text_type)
 
+    @mock.patch.object(tables.base.LOG, 'debug')
+    def test_server_filtering_path_logged(self, mock_debug):
+        filter_value_param = "my_table__filter__q"
+        filter_field_param = '%s_field' % filter_value_param
+
+        req = self.factory.post('/my_url/')
+        req.session[filter_value_param] = 'up'
+        req.session[filter_field_param] = 'status'
+        self.table = MyServerFilterTable(req, TEST_DATA)
+        self.assertEqual(list(TEST_DATA), list(self.table.filtered_data))
+        mock_debug.assert_called_once_with(
+            'Table %(table)s: filter on %(field)s done by the API',
+            {'table': 'my_table', 'field': 'status'})
+
+        mock_debug.reset_mock()
+        req = self.factory.post('/my_url/')
+        req.session[filter_value_param] = '2'
+        req.session[filter_field_param] = 'name'
+        self.table = MyServerFilterTable(req, TEST_DATA)
+        self.assertEqual([TEST_DATA[1]], list(self.table.filtered_data))
+        mock_debug.assert_called_once_with(
+            'Table %(table)s: filter on %(field)s done in Python',
+            {'table': 'my_table', 'field': 'name'})
+
+    def test_name_filter_action(self):
+        self.table = MyTable(self.request, TEST_DATA)
+        action = tables.NameFilterAction()
+        self.assertEqual(list(TEST_DATA[:3]),
+                         action.filter(self.table, TEST_DATA, 'OBJECT'))
+        self.assertEqual([TEST_DATA[3]],
+                         action.filter(self.table, TEST_DATA, u'öbj'))
+        # Objects without a name do not match.
+        self.assertEqual([], action.filter(self.table,
+                                           [FakeObject('5', None, 'up', 'a')],
+                                           'object'))
+
     def test_inline_edit_update_action_get_non_ajax(self):
         # Non ajax inline edit request should return None.
         url = ('/my_url/?action=cell_update'
@@ -1329,6 +1575,39 @@ class DataTableTests(test.TestCase):
         res = http.HttpResponse(table.render())
         self.assertContains(res, "multi_select_column hidden")
 
+    def test_row_actions_allowed_once_per_group(self):
+        data = [FakeObject('1', 'object_1', 'value_1', 'up'),
+                FakeObject('2', 'object_2', 'value_2', 'down'),
+                FakeObject('3', 'object_3', 'value_3', 'up'),
+                FakeObject('4', 'object_4', 'value_4', 'up', 'other'),
+                FakeObject('5', 'object_5', 'value_5', 'down')]
+        table = GroupedActionsTable(self.request, data)
+        with mock.patch.object(MyGroupedAction, 'allowed',
+                               autospec=True,
+                               side_effect=MyAction.allowed) as grouped, \
+                mock.patch.object(MyAction, 'allowed', autospec=True,
+                                  side_effect=MyAction.allowed) as single:
+            row_actions = [[action.name for action in
+                            table.get_row_actions(datum)]
+                           for datum in data]
+        # Rows are grouped by status and policy target.
+        self.assertEqual(3, grouped.call_count)
+        # Actions without allowed_datum_attrs are checked for every row.
+        self.assertEqual(5, single.call_count)
+        self.assertEqual([['grouped_delete', 'delete'], [],
+                          ['grouped_delete', 'delete'],
+                          ['grouped_delete', 'delete'], []],
+                         row_actions)
+        # Each row still gets its own bound action.
+        actions = table.get_row_actions(data[2])
+        self.assertEqual(data[2], actions[0].datum)
+
+    def test_row_action_key_unhashable(self):
+        datum = FakeObject('1', 'object_1', 'value_1', ['up'])
+        table = GroupedActionsTable(self.request, [datum])
+        action = table.base_actions['grouped_delete']
+        self.assertIsNone(table._get_row_action_key(action, datum))
+
     def test_table_action_object_display_is_id(self):
         action_string = "my_table__toggle__1"
         req = self.factory.post('/my_url/', {'action': action_string})
@@ -1452,6 +1731,11 @@ class SingleTableView(table_views.DataTableView):
         return TEST_DATA
 
 
+class StreamingTableView(SingleTableView):
+    template_name = "horizon/common/_data_table_view.html"
+    stream_response = True
+
+
 class APIFilterTableView(SingleTableView):
     table_class = MyServerFilterTable
 
@@ -1478,6 +1762,10 @@ class MultiTableView(tables.MultiTableView):
         return TEST_DATA
 
 
+class ConcurrentMultiTableView(MultiTableView):
+    concurrent_data_loading = True
+
+
 class DataTableViewTests(test.TestCase):
     def _prepare_view(self, cls, *args, **kwargs):
         req = self.factory.get('/my_url/')
@@ -1521,6 +1809,58 @@ class DataTableViewTests(test.TestCase):
         self.assertEqual(TableWithPermissions,
                          context['table_with_permissions_table'].__class__)
 
+    def test_multi_table_view_concurrent_data_loading(self):
+        view = self._prepare_view(ConcurrentMultiTableView)
+        with mock.patch('horizon.utils.functions.call_concurrently',
+                        return_value=[TEST_DATA, TEST_DATA[:1]]) as call:
+            data = view._get_data_dict()
+        call.assert_called_once_with(mock.ANY, 4)
+        self.assertEqual(2, len(call.call_args[0][0]))
+        self.assertEqual(list(TEST_DATA), data['table_with_permissions'])
+        self.assertEqual(list(TEST_DATA[:1]), data['my_table'])
+
+    def test_multi_table_view_concurrent_data_loading_error(self):
+        view = self._prepare_view(ConcurrentMultiTableView)
+        view.get_my_table_data = mock.Mock(
+            side_effect=exceptions.NotAvailable('unavailable'))
+        view._data_methods['my_table'] = [view.get_my_table_data]
+        self.assertRaises(exceptions.NotAvailable, view._get_data_dict)
+        self.assertEqual({}, view._data)
+
+    def test_data_table_view_stream_response(self):
+        req = self.factory.get('/my_url/')
+        req.user = self.user
+        res = SingleTableView.as_view(
+            template_name="horizon/common/_data_table_view.html")(req)
+        expected = res.render().content.decode('utf-8')
+
+        res = StreamingTableView.as_view()(req)
+        self.assertIsInstance(res, http.StreamingHttpResponse)
+        self.assertEqual(200, res.status_code)
+        content = b''.join(res.streaming_content).decode('utf-8')
+        self.assertIn('Displaying 4 items', content)
+        self.assertEqual(DataTableTests._row_ids(expected),
+                         DataTableTests._row_ids(content))
+        self.assertTrue(content.rstrip().endswith('</html>'))
+
+    @mock.patch.object(base, 'save_access_decisions')
+    def test_data_table_view_stream_response_saves_access(self, mock_save):
+        req = self.factory.get('/my_url/')
+        req.user = self.user
+        res = StreamingTableView.as_view()(req)
+        content = iter(res.streaming_content)
+        next(content)
+        self.assertFalse(mock_save.called)
+        list(content)
+        mock_save.assert_called_once_with(req)
+
+    def test_data_table_view_stream_response_ajax(self):
+        req = self.factory.get('/my_url/',
+                               HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        req.user = self.user
+        res = StreamingTableView.as_view()(req)
+        self.assertNotIsInstance(res, http.StreamingHttpResponse)
+
     fil_value_param = "my_table__filter__q"
     fil_field_param = '%s_field' % fil_value_param
 
@@ -15,18 +15,22 @@
 #    under the License.
 
 import copy
+import threading
 
 from django.conf import settings
 from django import http
 
+import mock
 import six
 
 from horizon import exceptions
 from horizon import middleware
 from horizon import tabs as horizon_tabs
 from horizon.test import helpers as test
+from horizon.utils import functions
 
 from horizon.test.unit.tables.test_tables import MyTable
+from horizon.test.unit.tables.test_tables import TableWithPermissions
 from horizon.test.unit.tables.test_tables import TEST_DATA
 
 
@@ -91,6 +95,15 @@ class TabWithTable(horizon_tabs.TableTab):
         return TEST_DATA
 
 
+class TabWithTwoTables(TabWithTable):
+    table_classes = (MyTable, TableWithPermissions)
+    slug = "tab_with_two_tables"
+    concurrent_data_loading = True
+
+    def get_table_with_permissions_data(self):
+        return TEST_DATA[:1]
+
+
 class RecoverableErrorTab(horizon_tabs.Tab):
     name = "Recoverable Error Tab"
     slug = "recoverable_error_tab"
@@ -116,11 +129,35 @@ class RedirectExceptionTab(horizon_tabs.Tab):
         raise exc
 
 
+class SlowTab(BaseTestTab):
+    slug = "tab_slow"
+    name = "Slow Tab"
+    template_name = "_tab.html"
+    release = None
+
+    def get_context_data(self, request):
+        # Block until the test lets the tab finish loading.
+        self.release.wait(5)
+        return super(SlowTab, self).get_context_data(request)
+
+
+class ConcurrentGroup(horizon_tabs.TabGroup):
+    slug = "tab_group"
+    tabs = (TabOne, SlowTab)
+    concurrent_preload = True
+    preload_timeout = 0.2
+
+
 class TableTabGroup(horizon_tabs.TabGroup):
     slug = "tab_group"
     tabs = [TabWithTable]
 
 
+class ConcurrentTableTabGroup(horizon_tabs.TabGroup):
+    slug = "tab_group"
+    tabs = [TabWithTwoTables]
+
+
 class TabWithTableView(horizon_tabs.TabbedTableView):
     tab_group_class = TableTabGroup
     template_name = "tab_group.html"
@@ -305,6 +342,17 @@ class TabTests(test.TestCase):
         # Since we only had one table we should get the shortcut name too.
         self.assertEqual(table, context['table'])
 
+    def test_table_tabs_concurrent_data_loading(self):
+        tab = ConcurrentTableTabGroup(self.request).get_tabs()[0]
+        with mock.patch('horizon.utils.functions.call_concurrently',
+                        wraps=functions.call_concurrently) as call:
+            tab.load_table_data()
+        call.assert_called_once_with(mock.ANY, 4)
+        self.assertTrue(tab._table_data_loaded)
+        self.assertEqual(TEST_DATA, tab._tables['my_table'].data)
+        self.assertEqual(TEST_DATA[:1],
+                         tab._tables['table_with_permissions'].data)
+
     def test_tabbed_table_view(self):
         view = TabWithTableView.as_view()
 
@@ -366,3 +414,66 @@ class TabExceptionTests(test.TestCase):
             resp = mw.process_exception(req, e)
             resp.client = self.client
         self.assertRedirects(resp, RedirectExceptionTab.url)
+
+
+class ConcurrentPreloadTests(test.TestCase):
+    def setUp(self):
+        super(ConcurrentPreloadTests, self).setUp()
+        SlowTab.release = threading.Event()
+
+    def tearDown(self):
+        SlowTab.release.set()
+        super(ConcurrentPreloadTests, self).tearDown()
+
+    def test_slow_tab_deferred(self):
+        req = self.factory.get("/")
+        tg = ConcurrentGroup(req)
+        tg.load_tab_data()
+        tab_one, tab_slow = tg.get_tabs()
+        self.assertEqual({"tab": tab_one}, tab_one._data)
+        self.assertFalse(tab_one.deferred)
+        # The slow tab is rendered as a placeholder to be loaded over AJAX.
+        self.assertTrue(tab_slow.deferred)
+        self.assertFalse(tab_slow.load)
+        self.assertFalse(tab_slow.data_loaded)
+        self.assertEqual('', tab_slow.render())
+        output = tg.render()
+        self.assertIn('id="tab_group__tab_slow" class="tab-pane "'
+                      ' data-deferred="true"', output)
+        self.assertIn('data-target="#tab_group__tab_slow" '
+                      'data-loaded=\'false\'', output)
+
+    def test_tab_error_handled(self):
+        SlowTab.release.set()
+        req = self.factory.get("/")
+        tg = ConcurrentGroup(req)
+        tg._tabs["recoverable_error_tab"] = RecoverableErrorTab(tg, req)
+        tg.load_tab_data()
+        tab_error = tg.get_tab("recoverable_error_tab")
+        # Errors are handled as in a serial preload.
+        self.assertFalse(tab_error._data)
+        self.assertEqual(1, len(req._messages._queued_messages))
+        self.assertTrue(tg.get_tab("tab_slow").data_loaded)
+
+    def test_deferred_tab_loaded_over_ajax(self):
+        SlowTab.release.set()
+        req = self.factory.get("/", {"tab": "tab_group__tab_slow"},
+                               HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        tg = ConcurrentGroup(req)
+        with mock.patch.object(TabOne, 'get_context_data') as tab_one_data:
+            tg.load_tab_data()
+        # Only the requested tab is loaded, and without a timeout.
+        tab_one_data.assert_not_called()
+        tab_slow = tg.get_tab("tab_slow")
+        self.assertEqual(tab_slow, tg.selected)
+        self.assertFalse(tab_slow.deferred)
+        self.assertEqual({"tab": tab_slow}, tab_slow._data)
+
+    def test_no_timeout_waits_for_all_tabs(self):
+        SlowTab.release.set()
+        tg = ConcurrentGroup(self.factory.get("/"))
+        tg.preload_timeout = None
+        tg.load_tab_data()
+        tab_slow = tg.get_tab("tab_slow")
+        self.assertFalse(tab_slow.deferred)
+        self.assertEqual({"tab": tab_slow}, tab_slow._data)
@@ -16,13 +16,18 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import datetime
 import re
 
 from django.conf import settings
+from django.core.cache import caches
 from django.template import Context
 from django.template import Template
+from django.test.utils import override_settings
 from django.utils.text import normalize_newlines
+import mock
 
+from horizon import base
 from horizon.test import helpers as test
 # The following imports are required to register the dashboards.
 from horizon.test.test_dashboards.cats.dashboard import Cats  # noqa: F401
@@ -150,3 +155,42 @@ class TemplateTagTests(test.TestCase):
                                             template_text=text,
                                             context={'request': self.request})
         self.assertEqual(single_line(rendered_str), single_line(expected))
+
+    def _render_horizon_nav(self):
+        self.request.horizon = {
+            'dashboard': base.Horizon.get_dashboard('cats'),
+            'panel': None,
+        }
+        return self.render_template(tag_require='horizon',
+                                    template_text="{% horizon_nav %}",
+                                    context={'request': self.request,
+                                             'user': self.request.user})
+
+    @override_settings(NAVIGATION_CACHE={'backend': 'default'})
+    def test_horizon_nav_cached(self):
+        caches['default'].clear()
+        self.addCleanup(caches['default'].clear)
+        with override_settings(NAVIGATION_CACHE={'backend': None}):
+            expected = self._render_horizon_nav()
+        self.assertIn('Puppies', expected)
+
+        with mock.patch.object(base.Panel, 'can_access',
+                               autospec=True, return_value=True) as access:
+            self.assertEqual(expected, self._render_horizon_nav())
+            self.assertTrue(access.called)
+            access.reset_mock()
+            self.assertEqual(expected, self._render_horizon_nav())
+            self.assertFalse(access.called)
+
+    @override_settings(NAVIGATION_CACHE={'backend': 'default'})
+    def test_horizon_nav_cache_token_expired(self):
+        caches['default'].clear()
+        self.addCleanup(caches['default'].clear)
+        self.request.user.token = mock.Mock(
+            expires=datetime.datetime.utcnow() - datetime.timedelta(1))
+        with mock.patch.object(base.Panel, 'can_access',
+                               autospec=True, return_value=True) as access:
+            self._render_horizon_nav()
+            access.reset_mock()
+            self._render_horizon_nav()
+            self.assertTrue(access.called)
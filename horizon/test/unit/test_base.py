@@ -24,8 +24,13 @@ from six import moves
 
 from django.conf import settings
 from django.contrib.auth.models import User
+from django.contrib.auth.signals import user_logged_in
+from django.core.cache import caches
 from django.core.exceptions import ImproperlyConfigured
+from django import http
+from django.test.utils import override_settings
 from django import urls
+import mock
 
 import horizon
 from horizon import base
@@ -409,6 +414,73 @@ class CustomPanelTests(BaseHorizonTests):
             horizon.get_dashboard("dogs")
 
 
+class LazyPanelsTests(BaseHorizonTests):
+    """Test the on demand import of the URLconfs of the panels."""
+
+    def setUp(self):
+        super(LazyPanelsTests, self).setUp()
+        settings.HORIZON_CONFIG['lazy_panels'] = True
+        conf.HORIZON_CONFIG._setup()
+        self._recompile_urls()
+
+    def tearDown(self):
+        super(LazyPanelsTests, self).tearDown()
+        settings.HORIZON_CONFIG.pop('lazy_panels')
+        conf.HORIZON_CONFIG._setup()
+        self._recompile_urls()
+
+    def _recompile_urls(self):
+        # The URL patterns of the site are compiled once, into the list of
+        # horizon.site_urls; start again from new ones.
+        moves.reload_module(import_module("horizon.site_urls"))
+        moves.reload_module(import_module("horizon"))
+        self._reload_urls()
+
+    def _get_panel_resolver(self, dashboard, panel):
+        resolver = urls.get_resolver().namespace_dict['horizon'][1]
+        resolver = resolver.namespace_dict[dashboard][1]
+        return resolver.namespace_dict[panel][1]
+
+    def test_panel_urls_loaded_on_resolve(self):
+        puppies = self._get_panel_resolver('dogs', 'puppies')
+        tigers = self._get_panel_resolver('cats', 'tigers')
+        self.assertIsInstance(puppies, base.LazyURLResolver)
+        self.assertFalse(puppies.loaded)
+        self.assertFalse(tigers.loaded)
+
+        match = urls.resolve('/dogs/')
+        self.assertEqual(['horizon', 'dogs', 'puppies'], match.namespaces)
+        self.assertTrue(puppies.loaded)
+        self.assertFalse(tigers.loaded)
+
+    def test_panel_urls_loaded_on_reverse(self):
+        tigers = self._get_panel_resolver('cats', 'tigers')
+        self.assertEqual('/dogs/',
+                         horizon.get_dashboard("dogs")
+                         .get_panel("puppies").get_absolute_url())
+        self.assertFalse(tigers.loaded)
+        self.assertEqual('/cats/tigers/',
+                         horizon.get_dashboard("cats")
+                         .get_panel("tigers").get_absolute_url())
+        self.assertTrue(tigers.loaded)
+
+    def test_panel_urls_decorated_on_load(self):
+        tigers = horizon.get_dashboard("cats").get_panel("tigers")
+        # The permissions of the panel are required.
+        resp = self.client.get(tigers.get_absolute_url())
+        self.assertEqual(403, resp.status_code)
+        self.set_permissions(permissions=['test'])
+        resp = self.client.get(tigers.get_absolute_url())
+        self.assertEqual(200, resp.status_code)
+
+        # So is the login required by the dashboard.
+        self.client.logout()
+        url = tigers.get_absolute_url()
+        resp = self.client.get(url)
+        self.assertRedirects(resp, "?".join(
+            ['http://testserver' + settings.LOGIN_URL, "next=%s" % url]))
+
+
 class CustomPermissionsTests(BaseHorizonTests):
 
     """Test customization of permissions on panels.
@@ -533,3 +605,78 @@ class RbacHorizonTests(test.TestCase):
                                  ['<Panel: rbac_panel_yes>'])
 
         self.assertTrue(dogs.can_access(context))
+
+    def _new_request(self):
+        # A later request of the same user, with the same session.
+        request = http.HttpRequest()
+        request.session = self.request.session
+        request.user = self.request.user
+        return request
+
+    @override_settings(ACCESS_DECISION_CACHE={'backend': 'default'})
+    def test_access_decisions_cached(self):
+        caches['default'].clear()
+        self.addCleanup(caches['default'].clear)
+        self.request.session['token'] = 'token-id'
+        panel = horizon.get_dashboard("dogs").get_panel('rbac_panel_yes')
+        with mock.patch.object(RbacYesAccessPanel, 'allowed', autospec=True,
+                               return_value=True) as allowed:
+            self.assertTrue(panel.can_access({'request': self.request}))
+            self.assertTrue(panel.can_access({'request': self.request}))
+            base.save_access_decisions(self.request)
+            self.assertTrue(panel.can_access({'request': self._new_request()}))
+            self.assertEqual(1, allowed.call_count)
+
+            # A new token gets new decisions.
+            self.request.session['token'] = 'other-token-id'
+            self.assertTrue(panel.can_access({'request': self._new_request()}))
+            self.assertEqual(2, allowed.call_count)
+        # Nothing is stored in the session.
+        self.assertNotIn('allowed', self.request.session)
+
+    @override_settings(ACCESS_DECISION_CACHE={'backend': 'default'})
+    def test_access_decisions_saved_once_per_request(self):
+        caches['default'].clear()
+        self.addCleanup(caches['default'].clear)
+        self.request.session['token'] = 'token-id'
+        context = {'request': self.request}
+        dogs = horizon.get_dashboard("dogs")
+        with mock.patch.object(caches['default'], 'set',
+                               wraps=caches['default'].set) as cache_set:
+            self.assertTrue(dogs.can_access(context))
+            self.assertTrue(
+                dogs.get_panel('rbac_panel_yes').can_access(context))
+            self.assertFalse(cache_set.called)
+            # The token changes during the request, the decisions are saved
+            # for the token they were computed with.
+            self.request.session['token'] = 'other-token-id'
+            base.save_access_decisions(self.request)
+            base.save_access_decisions(self.request)
+            self.assertEqual(1, cache_set.call_count)
+
+        self.request.session['token'] = 'token-id'
+        with mock.patch.object(base.HorizonComponent, 'allowed') as allowed:
+            self.assertTrue(dogs.can_access({'request': self._new_request()}))
+        self.assertFalse(allowed.called)
+
+    @override_settings(ACCESS_DECISION_CACHE={'backend': 'default'})
+    def test_access_decisions_precomputed_on_login(self):
+        caches['default'].clear()
+        self.addCleanup(caches['default'].clear)
+        self.request.session['token'] = 'token-id'
+        user_logged_in.send(sender=User, request=self.request,
+                            user=self.request.user)
+
+        context = {'request': self._new_request()}
+        cats = horizon.get_dashboard("cats")
+        dogs = horizon.get_dashboard("dogs")
+        with mock.patch.object(base.HorizonComponent, 'allowed') as allowed, \
+                mock.patch.object(RbacNoAccessPanel, 'allowed') as no_allowed:
+            self.assertFalse(cats.can_access(context))
+            self.assertFalse(
+                cats.get_panel('rbac_panel_no').can_access(context))
+            self.assertTrue(dogs.can_access(context))
+            self.assertTrue(
+                dogs.get_panel('rbac_panel_yes').can_access(context))
+        self.assertFalse(allowed.called)
+        self.assertFalse(no_allowed.called)
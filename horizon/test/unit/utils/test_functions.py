@@ -10,6 +10,10 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import threading
+
+from django.utils import translation
+
 from horizon.test import helpers as test
 from horizon.utils import functions
 
@@ -95,3 +99,45 @@ class GetConfigValueTests(test.TestCase):
         res = functions.get_config_value(request, key, self.str_default,
                                          search_in_settings=False)
         self.assertEqual(res, self.str_default)
+
+
+class CallConcurrentlyTests(test.TestCase):
+
+    def test_results_keep_order(self):
+        started = threading.Event()
+
+        def slow():
+            # Only True if the second call ran while this one was waiting.
+            return started.wait(5)
+
+        def fast():
+            started.set()
+            return 'fast'
+
+        res = functions.call_concurrently([slow, fast], max_workers=2)
+        self.assertEqual([True, 'fast'], res)
+
+    def test_first_exception_reraised_after_all_calls(self):
+        called = []
+
+        def fail():
+            raise ValueError('first')
+
+        def succeed():
+            called.append(True)
+            return 'ok'
+
+        self.assertRaises(ValueError, functions.call_concurrently,
+                          [fail, succeed, succeed], max_workers=2)
+        self.assertEqual(2, len(called))
+
+    def test_language_carried_to_workers(self):
+        with translation.override('fr'):
+            res = functions.call_concurrently(
+                [translation.get_language] * 2, max_workers=2)
+        self.assertEqual(['fr', 'fr'], res)
+
+    def test_single_worker_calls_serially(self):
+        thread_ids = functions.call_concurrently(
+            [threading.current_thread] * 2, max_workers=1)
+        self.assertEqual([threading.current_thread()] * 2, thread_ids)
@@ -10,6 +10,13 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import threading
+import time
+
+import mock
+
+from django.test.utils import override_settings
+
 from horizon.test import helpers as test
 from horizon.utils import memoized
 
@@ -81,3 +88,252 @@ class MemoizedTests(test.TestCase):
             self.assertEqual(output2[position], leader)
             # check that some_other_func returned a memoized list.
             self.assertIs(output1, output2)
+
+
+def _fake_request(tenant_id='tenant', roles=('member',), region='RegionOne',
+                  domain_context=None):
+    request = mock.Mock()
+    request.session = {}
+    if domain_context:
+        request.session['domain_context'] = domain_context
+    request.user.tenant_id = tenant_id
+    request.user.user_domain_id = 'default'
+    request.user.services_region = region
+    request.user.roles = [{'name': role} for role in roles]
+    return request
+
+
+class MemoizedSharedTests(test.TestCase):
+    def setUp(self):
+        super(MemoizedSharedTests, self).setUp()
+        self.calls = []
+
+    def _shared_func(self, **kwargs):
+        @memoized.memoized_shared('compute', **kwargs)
+        def list_things(request, *args, **kwargs):
+            self.calls.append((args, kwargs))
+            return ['thing']
+        backend = memoized.get_shared_backend()
+        if backend is not None:
+            backend.clear()
+        return list_things
+
+    @override_settings(MEMOIZED_SHARED_CACHE={'backend': None})
+    def test_disabled_backend_always_calls(self):
+        list_things = self._shared_func()
+        list_things(_fake_request())
+        list_things(_fake_request())
+        self.assertEqual(2, len(self.calls))
+
+    @override_settings(MEMOIZED_SHARED_CACHE={'backend': 'local'})
+    def test_shared_between_requests(self):
+        list_things = self._shared_func()
+        self.assertEqual(['thing'], list_things(_fake_request(), 1, a='b'))
+        self.assertEqual(['thing'], list_things(_fake_request(), 1, a='b'))
+        self.assertEqual(1, len(self.calls))
+        list_things(_fake_request(), 2, a='b')
+        self.assertEqual(2, len(self.calls))
+
+    @override_settings(MEMOIZED_SHARED_CACHE={'backend': 'local'})
+    def test_project_scope(self):
+        list_things = self._shared_func(scope='project')
+        list_things(_fake_request(tenant_id='one'))
+        list_things(_fake_request(tenant_id='two'))
+        list_things(_fake_request(tenant_id='one', roles=('admin',)))
+        list_things(_fake_request(tenant_id='one'))
+        self.assertEqual(3, len(self.calls))
+
+    @override_settings(MEMOIZED_SHARED_CACHE={'backend': 'local'})
+    def test_domain_scope(self):
+        list_things = self._shared_func(scope='domain')
+        list_things(_fake_request(tenant_id='one'))
+        list_things(_fake_request(tenant_id='two'))
+        self.assertEqual(1, len(self.calls))
+        list_things(_fake_request(domain_context='other'))
+        self.assertEqual(2, len(self.calls))
+        list_things(_fake_request(domain_context='other'))
+        self.assertEqual(2, len(self.calls))
+
+    @override_settings(MEMOIZED_SHARED_CACHE={'backend': 'local'})
+    def test_global_scope(self):
+        list_things = self._shared_func(scope='global')
+        list_things(_fake_request(tenant_id='one'))
+        list_things(_fake_request(tenant_id='two', roles=('admin',)))
+        self.assertEqual(1, len(self.calls))
+        list_things(_fake_request(region='RegionTwo'))
+        self.assertEqual(2, len(self.calls))
+
+    @override_settings(MEMOIZED_SHARED_CACHE={'backend': 'local'})
+    def test_invalidate(self):
+        list_things = self._shared_func(scope='project')
+        list_things(_fake_request(tenant_id='one'))
+        list_things(_fake_request(tenant_id='two'))
+        list_things.invalidate()
+        # The results of every scope are dropped.
+        list_things(_fake_request(tenant_id='one'))
+        list_things(_fake_request(tenant_id='two'))
+        self.assertEqual(4, len(self.calls))
+        list_things(_fake_request(tenant_id='one'))
+        self.assertEqual(4, len(self.calls))
+
+    @override_settings(MEMOIZED_SHARED_CACHE={'backend': None})
+    def test_invalidate_disabled_backend(self):
+        list_things = self._shared_func()
+        list_things.invalidate()
+        list_things(_fake_request())
+        self.assertEqual(1, len(self.calls))
+
+    @override_settings(MEMOIZED_SHARED_CACHE={'backend': 'local'})
+    def test_unshareable_arguments_are_not_cached(self):
+        list_things = self._shared_func()
+        list_things(_fake_request(), object())
+        list_things(_fake_request(), object())
+        self.assertEqual(2, len(self.calls))
+
+    @override_settings(MEMOIZED_SHARED_CACHE={
+        'backend': 'local', 'timeouts': {'compute.list_things': 10}})
+    @mock.patch.object(memoized.time, 'time')
+    def test_timeout(self, mock_time):
+        mock_time.return_value = 100
+        list_things = self._shared_func(timeout=1000)
+        list_things(_fake_request())
+        mock_time.return_value = 105
+        list_things(_fake_request())
+        self.assertEqual(1, len(self.calls))
+        mock_time.return_value = 111
+        list_things(_fake_request())
+        self.assertEqual(2, len(self.calls))
+
+    @override_settings(MEMOIZED_SHARED_CACHE={'backend': 'local'})
+    @mock.patch.object(memoized.threading, 'Thread')
+    @mock.patch.object(memoized.time, 'time')
+    def test_stale_value_refreshed_in_background(self, mock_time,
+                                                 mock_thread):
+        # Run the refresh synchronously when the thread is started.
+        mock_thread.side_effect = lambda target: mock.Mock(start=target)
+        values = iter(['old', 'new'])
+
+        @memoized.memoized_shared('compute', timeout=10, stale_timeout=100)
+        def get_thing(request):
+            self.calls.append(request)
+            return next(values)
+        memoized.get_shared_backend().clear()
+
+        mock_time.return_value = 100
+        self.assertEqual('old', get_thing(_fake_request()))
+        mock_time.return_value = 105
+        self.assertEqual('old', get_thing(_fake_request()))
+        self.assertEqual(1, len(self.calls))
+        self.assertFalse(mock_thread.called)
+        # The stale value is returned while a refresh stores the new one.
+        mock_time.return_value = 120
+        self.assertEqual('old', get_thing(_fake_request()))
+        self.assertEqual(1, mock_thread.call_count)
+        self.assertEqual(2, len(self.calls))
+        self.assertEqual('new', get_thing(_fake_request()))
+        self.assertEqual(2, len(self.calls))
+
+    @override_settings(MEMOIZED_SHARED_CACHE={'backend': 'local'})
+    @mock.patch.object(memoized.time, 'time')
+    def test_stale_value_expires(self, mock_time):
+        mock_time.return_value = 100
+        list_things = self._shared_func(timeout=10, stale_timeout=20)
+        list_things(_fake_request())
+        mock_time.return_value = 131
+        list_things(_fake_request())
+        self.assertEqual(2, len(self.calls))
+
+    @override_settings(MEMOIZED_SHARED_CACHE={'backend': 'default',
+                                              'max_entries': 2})
+    def test_django_cache_lru_eviction(self):
+        list_things = self._shared_func()
+        list_things(_fake_request(), 1)
+        list_things(_fake_request(), 2)
+        list_things(_fake_request(), 1)
+        list_things(_fake_request(), 3)
+        self.assertEqual(3, len(self.calls))
+        # 2 was the least recently used entry, so it has been evicted.
+        list_things(_fake_request(), 1)
+        list_things(_fake_request(), 2)
+        self.assertEqual(4, len(self.calls))
+
+    @override_settings(MEMOIZED_SHARED_CACHE={'backend': 'default'})
+    def test_django_cache_unpicklable_value(self):
+        @memoized.memoized_shared('compute')
+        def get_lock(request):
+            self.calls.append(request)
+            return threading.Lock()
+        memoized.get_shared_backend().clear()
+
+        lock = get_lock(_fake_request())
+        self.assertIs(lock, get_lock(_fake_request()))
+        self.assertEqual(1, len(self.calls))
+
+
+class MemoizedPerRequestTests(test.TestCase):
+    def setUp(self):
+        super(MemoizedPerRequestTests, self).setUp()
+        self.calls = []
+
+        @memoized.memoized_per_request('compute')
+        def get_thing(request, *args, **kwargs):
+            self.calls.append((args, kwargs))
+            return ['thing']
+        self.get_thing = get_thing
+
+    def test_identical_calls_are_coalesced(self):
+        request = _fake_request()
+        self.assertEqual(['thing'], self.get_thing(request, [1], a={'b': 2}))
+        self.assertEqual(['thing'], self.get_thing(request, [1], a={'b': 2}))
+        self.assertEqual(1, len(self.calls))
+        self.get_thing(request, [2], a={'b': 2})
+        self.assertEqual(2, len(self.calls))
+        self.assertEqual(1, memoized.get_coalesced_call_count(request))
+
+    def test_not_shared_between_requests(self):
+        self.get_thing(_fake_request())
+        self.get_thing(_fake_request())
+        self.assertEqual(2, len(self.calls))
+
+    def test_failed_call_is_not_kept(self):
+        results = iter([ValueError(), 'thing'])
+
+        @memoized.memoized_per_request('compute')
+        def get_thing(request):
+            result = next(results)
+            if isinstance(result, Exception):
+                raise result
+            return result
+
+        request = _fake_request()
+        self.assertRaises(ValueError, get_thing, request)
+        self.assertEqual('thing', get_thing(request))
+        self.assertEqual(0, memoized.get_coalesced_call_count(request))
+
+    def test_concurrent_call_waits_for_result(self):
+        started = threading.Event()
+        release = threading.Event()
+
+        @memoized.memoized_per_request('compute')
+        def get_thing(request):
+            self.calls.append(request)
+            started.set()
+            release.wait()
+            return 'thing'
+
+        request = _fake_request()
+        results = []
+        threads = [threading.Thread(
+            target=lambda: results.append(get_thing(request)))
+            for i in range(2)]
+        threads[0].start()
+        started.wait()
+        threads[1].start()
+        # Let the second call find the first one in progress.
+        while memoized.get_coalesced_call_count(request) == 0:
+            time.sleep(0.001)
+        release.set()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(['thing', 'thing'], results)
+        self.assertEqual(1, len(self.calls))
@@ -15,6 +15,7 @@ import decimal
 import math
 import re
 
+import futurist
 from oslo_utils import units
 import six
 
@@ -23,6 +24,7 @@ from django.contrib.auth import logout
 from django import http
 from django.utils.encoding import force_text
 from django.utils.functional import lazy
+from django.utils import timezone
 from django.utils import translation
 
 
@@ -191,3 +193,53 @@ def format_value(value):
 def one_year_from_now():
     now = datetime.datetime.utcnow()
     return now + datetime.timedelta(days=365)
+
+
+def get_token_bound_timeout(request, timeout):
+    """Returns ``timeout`` shortened to the expiration of the user token.
+
+    The result is negative when the token has already expired. Users
+    without a token expiration get ``timeout`` back.
+    """
+    token = getattr(request.user, 'token', None)
+    expires = getattr(token, 'expires', None)
+    if isinstance(expires, datetime.datetime):
+        if timezone.is_aware(expires):
+            now = timezone.now()
+        else:
+            now = datetime.datetime.utcnow()
+        timeout = min(timeout, int((expires - now).total_seconds()))
+    return timeout
+
+
+def with_current_locale(func):
+    """Wraps ``func`` to run with the caller's language and timezone.
+
+    Django keeps the active language and timezone in thread locals, so they
+    have to be carried over explicitly when ``func`` runs in another thread.
+    """
+    language = translation.get_language()
+    tz = timezone.get_current_timezone()
+
+    def wrapper(*args, **kwargs):
+        with translation.override(language), timezone.override(tz):
+            return func(*args, **kwargs)
+    return wrapper
+
+
+def call_concurrently(funcs, max_workers):
+    """Calls each of ``funcs`` in a bounded thread pool.
+
+    Returns the results in the same order as ``funcs``. Each call is
+    wrapped with :func:`with_current_locale` so that messages and formatted
+    values match a serial call. Once every call has finished, the first
+    exception raised (in ``funcs`` order) is re-raised in the calling thread.
+    """
+    funcs = list(funcs)
+    if len(funcs) < 2 or max_workers < 2:
+        return [func() for func in funcs]
+
+    workers = min(max_workers, len(funcs))
+    with futurist.ThreadPoolExecutor(max_workers=workers) as e:
+        futures = [e.submit(with_current_locale(func)) for func in funcs]
+    return [future.result() for future in futures]
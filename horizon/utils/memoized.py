@@ -14,10 +14,25 @@
 
 import collections
 import functools
+import hashlib
+import logging
 import threading
+import time
+import uuid
 import warnings
 import weakref
 
+from django.conf import settings
+from django.core.cache import caches
+import six
+from six.moves import cPickle as pickle
+
+
+LOG = logging.getLogger(__name__)
+
+# Marker for values missing in the shared cache, None may be a valid value.
+_MISSING = object()
+
 
 class UnhashableKeyWarning(RuntimeWarning):
     """Raised when trying to memoize a function with an unhashable argument."""
@@ -178,3 +193,470 @@ def memoized_with_request(request_func, request_index=0):
 
         return wrapped
     return wrapper
+
+
+class LocalMemoryBackend(object):
+    """Process-local storage for :func:`memoized_shared` results.
+
+    Values are stored as they are, so they do not need to be picklable.
+    Entries expire after their timeout and the least recently used entries
+    are evicted once ``max_entries`` is reached.
+    """
+
+    def __init__(self, max_entries=1000):
+        self.max_entries = max_entries
+        self._data = collections.OrderedDict()
+        self._generations = {}
+        self._lock = threading.Lock()
+
+    def get_generation(self, name, renew=False):
+        """Returns the generation of the results of a function.
+
+        It is part of the keys of the results, so renewing it invalidates
+        all of them. Generations are not subject to the eviction.
+        """
+        with self._lock:
+            if renew or name not in self._generations:
+                self._generations[name] = uuid.uuid4().hex
+            return self._generations[name]
+
+    def get(self, key):
+        with self._lock:
+            try:
+                expires, value = self._data.pop(key)
+            except KeyError:
+                return _MISSING
+            if expires is not None and expires < time.time():
+                return _MISSING
+            # Re-insert the entry so that it becomes the most recently used.
+            self._data[key] = (expires, value)
+            return value
+
+    def set(self, key, value, timeout):
+        expires = time.time() + timeout if timeout else None
+        with self._lock:
+            self._data.pop(key, None)
+            self._data[key] = (expires, value)
+            while self.max_entries and len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._generations.clear()
+
+
+class DjangoCacheBackend(object):
+    """Storage for :func:`memoized_shared` results in a Django cache.
+
+    Any cache configured in the ``CACHES`` setting can be used, so the
+    results can be shared between the workers of a deployment when
+    memcached or a file based cache is used. Results which can not be
+    pickled, like resources bound to a client, are kept in a process-local
+    :class:`LocalMemoryBackend` instead.
+
+    Besides the eviction done by the cache itself, the keys written by this
+    process are tracked in LRU order and the oldest ones are deleted from
+    the cache once ``max_entries`` is reached.
+    """
+
+    def __init__(self, cache_alias='default', max_entries=1000):
+        self.cache_alias = cache_alias
+        self.max_entries = max_entries
+        self._keys = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self._local = LocalMemoryBackend(max_entries)
+
+    @property
+    def cache(self):
+        return caches[self.cache_alias]
+
+    def get_generation(self, name, renew=False):
+        """Returns the generation of the results of a function.
+
+        See :meth:`LocalMemoryBackend.get_generation`. It is shared by the
+        processes using the cache, and renewed if the cache evicted it.
+        """
+        key = 'memoized_generation:%s' % name
+        generation = None if renew else self.cache.get(key)
+        if generation is None:
+            generation = uuid.uuid4().hex
+            self.cache.set(key, generation, None)
+        return generation
+
+    def _touch(self, key):
+        evicted = []
+        with self._lock:
+            self._keys.pop(key, None)
+            self._keys[key] = None
+            while self.max_entries and len(self._keys) > self.max_entries:
+                evicted.append(self._keys.popitem(last=False)[0])
+        return evicted
+
+    def get(self, key):
+        value = self._local.get(key)
+        if value is not _MISSING:
+            return value
+        value = self.cache.get(key, _MISSING)
+        if value is not _MISSING:
+            self._touch(key)
+        return value
+
+    def set(self, key, value, timeout):
+        try:
+            self.cache.set(key, value, timeout or None)
+        except (TypeError, AttributeError, pickle.PicklingError) as e:
+            LOG.debug("Unable to store %s in the shared cache, keeping it "
+                      "in the process: %s", key, e)
+            self._local.set(key, value, timeout)
+            return
+        evicted = self._touch(key)
+        if evicted:
+            self.cache.delete_many(evicted)
+
+    def clear(self):
+        with self._lock:
+            keys = list(self._keys)
+            self._keys.clear()
+        self._local.clear()
+        self.cache.delete_many(keys)
+
+
+_shared_backend = None
+_shared_backend_config = None
+_shared_backend_lock = threading.Lock()
+
+
+def get_shared_cache_config():
+    """Return the ``MEMOIZED_SHARED_CACHE`` setting merged with defaults."""
+    config = {
+        'backend': None,
+        'default_timeout': 300,
+        'max_entries': 1000,
+        'timeouts': {},
+    }
+    config.update(getattr(settings, 'MEMOIZED_SHARED_CACHE', {}))
+    return config
+
+
+def get_shared_backend():
+    """Return the storage backend used by :func:`memoized_shared`.
+
+    ``None`` is returned when the shared cache is disabled.
+    """
+    global _shared_backend, _shared_backend_config
+
+    config = get_shared_cache_config()
+    backend_config = (config['backend'], config['max_entries'])
+    with _shared_backend_lock:
+        if backend_config != _shared_backend_config:
+            backend, max_entries = backend_config
+            if not backend:
+                _shared_backend = None
+            elif backend == 'local':
+                _shared_backend = LocalMemoryBackend(max_entries)
+            else:
+                _shared_backend = DjangoCacheBackend(backend, max_entries)
+            _shared_backend_config = backend_config
+        return _shared_backend
+
+
+def _get_scope_key(request, scope):
+    """Calculate the part of the cache key which depends on the user."""
+    user = request.user
+    region = getattr(user, 'services_region', None)
+    if callable(scope):
+        return (region,) + tuple(scope(request))
+    if scope == 'global':
+        return (region,)
+    roles = tuple(sorted(role['name'] for role in
+                         getattr(user, 'roles', None) or []))
+    if scope == 'domain':
+        # A cloud admin can select the domain context of the identity calls.
+        session = getattr(request, 'session', None) or {}
+        return (region, getattr(user, 'user_domain_id', None),
+                session.get('domain_context'), roles)
+    if scope == 'project':
+        return (region, getattr(user, 'tenant_id', None), roles)
+    raise ValueError("Unknown memoized_shared scope: %r" % scope)
+
+
+_SHAREABLE_TYPES = six.string_types + six.integer_types + (float, bool,
+                                                           type(None))
+
+
+def _normalize_arg(arg):
+    """Turn an argument into a stable value which can be part of a key.
+
+    Only simple values and containers of them can be shared between
+    requests, a :exc:`TypeError` is raised for anything else.
+    """
+    if isinstance(arg, _SHAREABLE_TYPES):
+        return arg
+    if isinstance(arg, (tuple, list)):
+        return tuple(_normalize_arg(item) for item in arg)
+    if isinstance(arg, (set, frozenset)):
+        return ('set', tuple(sorted(_normalize_arg(item) for item in arg)))
+    if isinstance(arg, dict):
+        return ('dict', tuple(sorted((key, _normalize_arg(value))
+                                     for key, value in arg.items())))
+    raise TypeError("%r can not be part of a shared cache key" % arg)
+
+
+# Keys of the shared cache entries being refreshed in the background.
+_refreshing = set()
+_refreshing_lock = threading.Lock()
+
+
+def _refresh_in_background(key, func, args, kwargs, store):
+    """Call func in a separate thread and store its result.
+
+    Only one refresh per key runs at a time. Failures are only logged, the
+    stale value keeps being served until it expires.
+    """
+    with _refreshing_lock:
+        if key in _refreshing:
+            return
+        _refreshing.add(key)
+
+    def refresh():
+        try:
+            store(func(*args, **kwargs))
+        except Exception:
+            LOG.warning("Unable to refresh the shared cache entry %s.", key,
+                        exc_info=True)
+        finally:
+            with _refreshing_lock:
+                _refreshing.discard(key)
+
+    thread = threading.Thread(target=refresh)
+    thread.daemon = True
+    thread.start()
+
+
+def memoized_shared(service, scope='project', timeout=None, request_index=0,
+                    stale_timeout=None, name=None):
+    """Decorator for caching results of API calls across requests.
+
+    Unlike :func:`memoized`, which caches only for the lifetime of the
+    objects passed as arguments, results are kept in a shared storage
+    configured by the ``MEMOIZED_SHARED_CACHE`` setting, so that catalog-like
+    data does not have to be fetched again on every request. When the
+    setting does not enable a backend, the decorated function is called
+    directly.
+
+    The cache key consists of ``service``, the name of the decorated
+    function, the scope of the request and the remaining arguments.
+    ``scope`` is one of:
+
+    * ``'global'``: the result depends only on the region,
+    * ``'domain'``: the result depends on the domain and roles of the user
+      and on the domain context selected by a cloud admin,
+    * ``'project'``: the result depends on the project and roles of the user,
+    * a callable receiving the request and returning a tuple of values
+      which are added to the key.
+
+    ``timeout`` is the number of seconds the result is kept. It can be
+    overridden for a given function in the ``timeouts`` key of the setting,
+    using ``'<service>.<function name>'`` as the key.
+
+    ``stale_timeout`` is the number of seconds an expired result is still
+    returned for. The first call after the expiration returns the stale
+    result immediately and refreshes it in a background thread.
+
+    ``request_index`` indicates which argument of the decorated function is
+    the request object. Calls with arguments other than simple values and
+    containers of them are never shared.
+
+    ``name`` replaces the name of the decorated function in the keys and in
+    the ``timeouts`` key of the setting.
+
+    The ``invalidate()`` method of the decorated function drops its results
+    for every scope, for example after a call changing them. With the
+    ``'local'`` backend, only the results of the current process are
+    dropped.
+
+    short example::
+
+        @memoized_shared('nova', scope='global', timeout=600)
+        def list_extensions(request):
+            return novaclient(request).list_extensions.show_all()
+    """
+    def wrapper(func):
+        full_name = '%s.%s' % (service, name or func.__name__)
+
+        @functools.wraps(func)
+        def wrapped(*args, **kwargs):
+            backend = get_shared_backend()
+            if backend is None:
+                return func(*args, **kwargs)
+            args_without_request = list(args)
+            request = args_without_request.pop(request_index)
+            try:
+                key_data = (full_name,
+                            backend.get_generation(full_name),
+                            _get_scope_key(request, scope),
+                            _normalize_arg(args_without_request),
+                            _normalize_arg(kwargs))
+            except TypeError as e:
+                LOG.debug("Not sharing the result of %s: %s", full_name, e)
+                return func(*args, **kwargs)
+            key = 'memoized:%s:%s' % (
+                full_name,
+                hashlib.sha1(repr(key_data).encode('utf-8')).hexdigest())
+            config = get_shared_cache_config()
+            fresh_timeout = config['timeouts'].get(
+                full_name, timeout or config['default_timeout'])
+
+            if not stale_timeout:
+                value = backend.get(key)
+                if value is _MISSING:
+                    value = func(*args, **kwargs)
+                    backend.set(key, value, fresh_timeout)
+                return value
+
+            # With a stale timeout, the entries are kept longer than their
+            # fresh timeout and store when they have to be refreshed.
+            def store(value):
+                backend.set(key, (time.time() + fresh_timeout, value),
+                            fresh_timeout + stale_timeout)
+
+            entry = backend.get(key)
+            if entry is _MISSING:
+                value = func(*args, **kwargs)
+                store(value)
+                return value
+            fresh_until, value = entry
+            if fresh_until < time.time():
+                _refresh_in_background(key, func, args, kwargs, store)
+            return value
+
+        def invalidate():
+            backend = get_shared_backend()
+            if backend is not None:
+                backend.get_generation(full_name, renew=True)
+
+        wrapped.invalidate = invalidate
+        return wrapped
+    return wrapper
+
+
+# Name of the request attribute holding the calls made during the request.
+_CALL_REGISTRY_ATTR = '_memoized_per_request_calls'
+_call_registry_lock = threading.Lock()
+
+
+class _CallRegistry(object):
+    """Calls made during a request, with the number of coalesced calls."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calls = {}
+        self.coalesced = 0
+
+
+class _Call(object):
+    """Result of a call, possibly still in progress in another thread."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+def _get_call_registry(request):
+    try:
+        attrs = vars(request)
+    except TypeError:
+        return None
+    registry = attrs.get(_CALL_REGISTRY_ATTR)
+    if registry is None:
+        with _call_registry_lock:
+            registry = attrs.setdefault(_CALL_REGISTRY_ATTR, _CallRegistry())
+    return registry
+
+
+def get_coalesced_call_count(request):
+    """Returns the number of calls coalesced during the request.
+
+    It counts the calls to functions decorated with
+    :func:`memoized_per_request` which returned the result of a previous or
+    concurrent identical call instead of calling the function.
+    """
+    try:
+        registry = vars(request).get(_CALL_REGISTRY_ATTR)
+    except TypeError:
+        return 0
+    return registry.coalesced if registry is not None else 0
+
+
+def memoized_per_request(service, request_index=0):
+    """Decorator coalescing identical calls made during a request.
+
+    The results are stored on the request object, keyed by ``service``, the
+    name of the decorated function and the remaining arguments, so that the
+    tabs, tables, quota checks and ``allowed()`` methods of actions rendering
+    a page share a single call. Unlike :func:`memoized`, the arguments only
+    have to be equal rather than identical, and a call made while an
+    identical one is in progress in another thread waits for its result.
+
+    Failed calls are not kept, the next identical call is made again. Calls
+    with arguments other than simple values and containers of them are not
+    coalesced. The result is shared by all the callers, so it should not be
+    modified by them.
+
+    ``request_index`` indicates which argument of the decorated function is
+    the request object.
+
+    short example::
+
+        @memoized_per_request('neutron')
+        def is_extension_supported(request, extension_alias):
+            ...
+    """
+    def wrapper(func):
+        name = '%s.%s' % (service, func.__name__)
+
+        @functools.wraps(func)
+        def wrapped(*args, **kwargs):
+            args_without_request = list(args)
+            request = args_without_request.pop(request_index)
+            registry = _get_call_registry(request)
+            if registry is None:
+                return func(*args, **kwargs)
+            try:
+                key = (name,
+                       _normalize_arg(args_without_request),
+                       _normalize_arg(kwargs))
+            except TypeError as e:
+                LOG.debug("Not coalescing the call to %s: %s", name, e)
+                return func(*args, **kwargs)
+
+            with registry.lock:
+                call = registry.calls.get(key)
+                if call is None:
+                    call = registry.calls[key] = _Call()
+                    owner = True
+                else:
+                    registry.coalesced += 1
+                    owner = False
+
+            if not owner:
+                call.done.wait()
+                if call.error is not None:
+                    raise call.error
+                return call.value
+
+            try:
+                call.value = func(*args, **kwargs)
+            except Exception as e:
+                call.error = e
+                with registry.lock:
+                    registry.calls.pop(key, None)
+                raise
+            finally:
+                call.done.set()
+            return call.value
+
+        return wrapped
+    return wrapper
@@ -15,6 +15,7 @@
 
 import logging
 import os.path
+import re
 
 from django.conf import settings
 from oslo_config import cfg
@@ -29,6 +30,16 @@ LOG = logging.getLogger(__name__)
 _ENFORCER = None
 _BASE_PATH = getattr(settings, 'POLICY_FILES_PATH', '')
 
+# Target fields referenced by the checks of a rule, e.g. %(project_id)s.
+_TARGET_FIELD_RE = re.compile(r'%\(([^)]+)\)s')
+# Target fields referenced by each rule, keyed by enforcer and action.
+_RULE_FIELDS = {}
+# oslo.policy only exposes the compound checks, the class of the generic
+# "kind:match" checks is taken from a parsed rule.
+_GENERIC_CHECK = type(policy.Rules.from_dict({'rule': 'kind:match'})['rule'])
+# Name of the request attribute holding the policy decisions.
+_DECISIONS_ATTR = '_policy_decisions'
+
 
 def _get_policy_conf(policy_file, policy_dirs=None):
     conf = cfg.ConfigOpts()
@@ -73,6 +84,7 @@ def _get_enforcer():
 def reset():
     global _ENFORCER
     _ENFORCER = None
+    _RULE_FIELDS.clear()
 
 
 def check(actions, request, target=None):
@@ -113,10 +125,43 @@ def check(actions, request, target=None):
                       {'project_id': object.project_id}
     :returns: boolean if the user has permission or not for the actions.
     """
-    if target is None:
-        target = {}
+    return check_many(((actions, target),), request)[0]
+
+
+def check_many(checks, request):
+    """Check user permission for several actions and targets at once.
+
+    :param checks: iterable of ``(actions, target)`` pairs, with the same
+        meaning as the arguments of :func:`check`.
+    :param request: django http request object.
+    :returns: list of booleans, one for each pair.
+
+    The credentials of the user are built once for all the checks. The
+    decisions are cached for the lifetime of the request, keyed by the rule,
+    the credentials and the target fields referenced by the rule, so that
+    checking the same actions for many rows of a table only evaluates the
+    rules once for each distinct value of the fields they reference.
+    """
     user = auth_utils.get_user(request)
+    credentials = _user_to_credentials(user)
+    domain_credentials = _domain_to_credentials(request, user)
+    # if there is a domain token use the domain_id instead of the user's domain
+    if domain_credentials:
+        credentials['domain_id'] = domain_credentials.get('domain_id')
+    enforcer = _get_enforcer()
+    decisions = _get_decisions(request)
+
+    results = []
+    for actions, target in checks:
+        if target is None:
+            target = {}
+        _set_target_defaults(target, user)
+        results.append(_check_actions(enforcer, decisions, actions, target,
+                                      credentials, domain_credentials))
+    return results
 
+
+def _set_target_defaults(target, user):
     # Several service policy engines default to a project id check for
     # ownership. Since the user is already scoped to a project, if a
     # different project id has not been specified use the currently scoped
@@ -146,14 +191,9 @@ def check(actions, request, target=None):
         if target.get(key) is None:
             target[key] = user.user_domain_id
 
-    credentials = _user_to_credentials(user)
-    domain_credentials = _domain_to_credentials(request, user)
-    # if there is a domain token use the domain_id instead of the user's domain
-    if domain_credentials:
-        credentials['domain_id'] = domain_credentials.get('domain_id')
-
-    enforcer = _get_enforcer()
 
+def _check_actions(enforcer, decisions, actions, target, credentials,
+                   domain_credentials):
     for action in actions:
         scope, action = action[0], action[1]
         if scope in enforcer:
@@ -161,15 +201,13 @@ def check(actions, request, target=None):
             # needed when a domain scoped token is present
             if scope == 'identity' and domain_credentials:
                 # use domain credentials
-                if not _check_credentials(enforcer[scope],
-                                          action,
-                                          target,
-                                          domain_credentials):
+                if not _cached_check(decisions, enforcer[scope], scope,
+                                     action, target, domain_credentials):
                     return False
 
             # use project credentials
-            if not _check_credentials(enforcer[scope],
-                                      action, target, credentials):
+            if not _cached_check(decisions, enforcer[scope], scope,
+                                 action, target, credentials):
                 return False
 
         # if no policy for scope, allow action, underlying API will
@@ -178,6 +216,88 @@ def check(actions, request, target=None):
     return True
 
 
+def _get_decisions(request):
+    try:
+        attrs = vars(request)
+    except TypeError:
+        return None
+    return attrs.setdefault(_DECISIONS_ATTR, {})
+
+
+def _credentials_fingerprint(credentials):
+    return tuple(sorted(
+        (key, tuple(value) if isinstance(value, list) else value)
+        for key, value in credentials.items() if key != 'token'))
+
+
+def _cached_check(decisions, enforcer_scope, scope, action, target,
+                  credentials):
+    if decisions is None:
+        return _check_credentials(enforcer_scope, action, target, credentials)
+    fields = _get_rule_fields(enforcer_scope, action)
+    if fields is None:
+        fields = target.keys()
+    key = (scope, action, _credentials_fingerprint(credentials),
+           tuple(sorted((field, target.get(field)) for field in fields)))
+    try:
+        return decisions[key]
+    except KeyError:
+        pass
+    except TypeError:
+        # Unhashable target values are not cached.
+        return _check_credentials(enforcer_scope, action, target, credentials)
+    decision = _check_credentials(enforcer_scope, action, target, credentials)
+    decisions[key] = decision
+    return decision
+
+
+def _get_rule_fields(enforcer_scope, action):
+    """Returns the target fields referenced by the rule of an action.
+
+    None is returned if the rule may reference any field, for example
+    when it uses a check sending the target to an external service.
+    """
+    rules = enforcer_scope.rules
+    rule = rules.get(action)
+    cache_key = (id(enforcer_scope), action)
+    cached = _RULE_FIELDS.get(cache_key)
+    # The rules are new objects when the policy file is reloaded.
+    if cached is not None and cached[0] is rule and cached[1] is rules:
+        return cached[2]
+    fields = _collect_fields(rules, rule, set())
+    if action not in rules and fields is not None:
+        # the default rule is used for unknown actions
+        default_fields = _collect_fields(rules, rules.get('default'), set())
+        fields = (None if default_fields is None
+                  else fields | default_fields)
+    _RULE_FIELDS[cache_key] = (rule, rules, fields)
+    return fields
+
+
+def _collect_fields(rules, rule, seen_rules):
+    # The true ("@") and false ("!") checks do not reference any field.
+    if rule is None or str(rule) in ('@', '!'):
+        return set()
+    if isinstance(rule, (policy.AndCheck, policy.OrCheck)):
+        fields = set()
+        for sub_rule in rule.rules:
+            sub_fields = _collect_fields(rules, sub_rule, seen_rules)
+            if sub_fields is None:
+                return None
+            fields |= sub_fields
+        return fields
+    if isinstance(rule, policy.NotCheck):
+        return _collect_fields(rules, rule.rule, seen_rules)
+    if isinstance(rule, policy.RuleCheck):
+        if rule.match in seen_rules:
+            return set()
+        seen_rules.add(rule.match)
+        return _collect_fields(rules, rules.get(rule.match), seen_rules)
+    if getattr(rule, 'kind', None) == 'role' or type(rule) is _GENERIC_CHECK:
+        return set(_TARGET_FIELD_RE.findall(rule.match))
+    return None
+
+
 def _check_credentials(enforcer_scope, action, target, credentials):
     is_valid = True
     if not enforcer_scope.enforce(action, target, credentials):
@@ -14,6 +14,7 @@
 from django import http
 from django import test
 import mock
+from oslo_policy import policy as oslo_policy
 
 from openstack_auth import policy
 from openstack_auth import user
@@ -84,6 +85,73 @@ class PolicyTestCaseNonAdmin(PolicyTestCase):
         self.assertTrue(value)
 
 
+class PolicyDecisionCacheTestCase(PolicyTestCase):
+    _roles = [{'id': '1', 'name': 'member'}]
+
+    def test_rule_fields(self):
+        policy.reset()
+        enforcer = policy._get_enforcer()
+        self.assertEqual({'project_id'},
+                         policy._get_rule_fields(enforcer['compute'],
+                                                 'compute:start'))
+        # unknown actions use the default rule
+        self.assertEqual({'project_id'},
+                         policy._get_rule_fields(enforcer['compute'],
+                                                 'compute:i_dont_exist'))
+        self.assertEqual(set(),
+                         policy._get_rule_fields(enforcer['identity'],
+                                                 'admin_required'))
+
+    def test_rule_fields_of_checks(self):
+        rules = oslo_policy.Rules.from_dict({
+            'true': '@',
+            'false': '!',
+            'role': 'role:%(role)s',
+            'generic': 'user_id:%(target.user_id)s or project_id:x',
+            'http': 'http://example.com/%(project_id)s',
+        })
+        for name, fields in (('true', set()),
+                             ('false', set()),
+                             ('role', {'role'}),
+                             ('generic', {'target.user_id'}),
+                             ('http', None)):
+            self.assertEqual(fields, policy._collect_fields(rules,
+                                                            rules[name],
+                                                            set()))
+
+    def test_decision_cached_by_referenced_fields(self):
+        policy.reset()
+        enforcer = policy._get_enforcer()
+        user = utils.get_user()
+        with mock.patch.object(policy, '_check_credentials',
+                               wraps=policy._check_credentials) as check:
+            results = policy.check_many(
+                [((("compute", "compute:start"),),
+                  {'project_id': user.project_id, 'name': 'server_1'}),
+                 ((("compute", "compute:start"),),
+                  {'project_id': user.project_id, 'name': 'server_2'}),
+                 ((("compute", "compute:start"),),
+                  {'project_id': 'other_project', 'name': 'server_3'})],
+                self.request)
+            self.assertTrue(policy.check((("compute", "compute:start"),),
+                                         self.request))
+        self.assertEqual([True, True, False], results)
+        # The name is not referenced by the rule, so the first two checks
+        # and the last one share the same decision.
+        self.assertEqual(2, check.call_count)
+        check.assert_called_with(enforcer['compute'], 'compute:start',
+                                 mock.ANY, mock.ANY)
+
+    def test_decision_not_shared_between_requests(self):
+        policy.reset()
+        with mock.patch.object(policy, '_check_credentials',
+                               return_value=True) as check:
+            policy.check((("compute", "compute:start"),), self.request)
+            policy.check((("compute", "compute:start"),),
+                         http.HttpRequest())
+        self.assertEqual(2, check.call_count)
+
+
 class PolicyTestCheckCredentials(PolicyTestCase):
     _roles = [{'id': '1', 'name': 'member'}]
 
@@ -113,3 +113,50 @@ class BehindProxyTestCase(test.TestCase):
         self.request.META['HTTP_X_REAL_IP'] = '192.168.15.33'
         self.request.META['HTTP_X_FORWARDED_FOR'] = '172.18.0.2'
         self.assertEqual('192.168.15.33', get_client_ip(self.request))
+
+
+class ConnectionPoolTestCase(test.TestCase):
+
+    def setUp(self):
+        super(ConnectionPoolTestCase, self).setUp()
+        utils._http_sessions.clear()
+        self.addCleanup(utils._http_sessions.clear)
+
+    def test_http_session_shared_by_tls_settings(self):
+        http_session = utils.get_http_session(True)
+        self.assertIs(http_session, utils.get_http_session(True))
+        self.assertIsNot(http_session, utils.get_http_session(False))
+        self.assertIsNot(http_session,
+                         utils.get_http_session(True, cert='client.pem'))
+
+    @override_settings(OPENSTACK_CONNECTION_POOL={'pool_maxsize': 3,
+                                                  'keep_alive': False})
+    def test_http_session_config(self):
+        http_session = utils.get_http_session(True)
+        adapter = http_session.get_adapter('https://example.com')
+        self.assertIsInstance(adapter, utils.PoolingHTTPAdapter)
+        self.assertEqual(3, adapter._pool_maxsize)
+        self.assertEqual('close', http_session.headers['Connection'])
+
+    @override_settings(OPENSTACK_CONNECTION_POOL={'enabled': False})
+    def test_http_session_disabled(self):
+        self.assertIsNone(utils.get_http_session(True))
+
+    @override_settings(OPENSTACK_SSL_NO_VERIFY=True)
+    def test_get_session_uses_shared_http_session(self):
+        session = utils.get_session()
+        self.assertIs(utils.get_http_session(False), session.session)
+        self.assertIs(session.session, utils.get_session().session)
+
+    def test_connection_pool_stats(self):
+        http_session = utils.get_http_session(True)
+        adapter = http_session.get_adapter('https://example.com')
+        adapter.get_connection('https://example.com/v2.1/servers')
+        adapter.get_connection('https://example.com/v2.1/flavors')
+        adapter.get_connection('https://example.org/v2.0/networks')
+
+        stats = utils.get_connection_pool_stats()
+        self.assertEqual(1, stats['sessions'])
+        self.assertEqual(1, stats['pool_hits'])
+        self.assertEqual(2, stats['pool_misses'])
+        self.assertEqual(0, stats['connections'])
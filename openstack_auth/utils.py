@@ -14,6 +14,7 @@
 import datetime
 import logging
 import re
+import threading
 
 from django.conf import settings
 from django.contrib import auth
@@ -25,6 +26,9 @@ from keystoneauth1 import session
 from keystoneauth1 import token_endpoint
 from keystoneclient.v2_0 import client as client_v2
 from keystoneclient.v3 import client as client_v3
+import requests
+from requests import adapters
+from six.moves import http_cookiejar
 from six.moves.urllib import parse as urlparse
 
 
@@ -129,14 +133,126 @@ def get_keystone_version():
     return getattr(settings, 'OPENSTACK_API_VERSIONS', {}).get('identity', 3)
 
 
-def get_session():
+class PoolingHTTPAdapter(adapters.HTTPAdapter):
+    """HTTP adapter counting how often its connection pools are reused.
+
+    A request to an endpoint (scheme, host and port) which has been
+    requested before is a pool hit, the first request is a pool miss.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self._stats_lock = threading.Lock()
+        self._endpoints = set()
+        self.hits = 0
+        self.misses = 0
+        super(PoolingHTTPAdapter, self).__init__(*args, **kwargs)
+
+    def get_connection(self, url, proxies=None):
+        parsed = urlparse.urlparse(url)
+        endpoint = (parsed.scheme, parsed.netloc)
+        with self._stats_lock:
+            if endpoint in self._endpoints:
+                self.hits += 1
+            else:
+                self._endpoints.add(endpoint)
+                self.misses += 1
+        return super(PoolingHTTPAdapter, self).get_connection(url, proxies)
+
+    def get_stats(self):
+        stats = {'pool_hits': self.hits, 'pool_misses': self.misses,
+                 'connections': 0, 'requests': 0}
+        pools = self.poolmanager.pools
+        for key in pools.keys():
+            try:
+                pool = pools[key]
+            except KeyError:
+                # The pool has been evicted in the meantime.
+                continue
+            stats['connections'] += pool.num_connections
+            stats['requests'] += pool.num_requests
+        return stats
+
+
+# HTTP sessions shared by all the API clients of the process, keyed by TLS
+# settings. Each of them keeps a connection pool per endpoint.
+_http_sessions = {}
+_http_sessions_lock = threading.Lock()
+
+
+def get_connection_pool_config():
+    config = {
+        'enabled': True,
+        'pool_connections': 10,
+        'pool_maxsize': 10,
+        'keep_alive': True,
+    }
+    config.update(getattr(settings, 'OPENSTACK_CONNECTION_POOL', {}))
+    return config
+
+
+def get_http_session(verify=True, cert=None):
+    """Returns the requests session shared by the API clients.
+
+    The session is shared by all the threads of the process using the same
+    TLS settings (``verify`` and ``cert``), so that the connections to the
+    endpoints are kept alive and reused instead of repeating the TCP and
+    TLS handshakes for each client. None is returned if connection pooling
+    is disabled by the ``OPENSTACK_CONNECTION_POOL`` setting.
+    """
+    config = get_connection_pool_config()
+    if not config['enabled']:
+        return None
+    key = (verify, cert)
+    with _http_sessions_lock:
+        http_session = _http_sessions.get(key)
+        if http_session is None:
+            http_session = requests.Session()
+            # The session is shared between users, it must not keep the
+            # cookies set by the services.
+            http_session.cookies.set_policy(
+                http_cookiejar.DefaultCookiePolicy(allowed_domains=[]))
+            if not config['keep_alive']:
+                http_session.headers['Connection'] = 'close'
+            for prefix in ('https://', 'http://'):
+                http_session.mount(prefix, PoolingHTTPAdapter(
+                    pool_connections=config['pool_connections'],
+                    pool_maxsize=config['pool_maxsize']))
+            _http_sessions[key] = http_session
+    return http_session
+
+
+def get_connection_pool_stats():
+    """Returns statistics of the shared connection pools of the process.
+
+    ``pool_hits`` and ``pool_misses`` count the requests to an endpoint
+    already or not yet connected to, ``connections`` and ``requests`` the
+    connections opened and the requests sent by the current pools.
+    """
+    stats = {'sessions': 0, 'pool_hits': 0, 'pool_misses': 0,
+             'connections': 0, 'requests': 0}
+    with _http_sessions_lock:
+        http_sessions = list(_http_sessions.values())
+    for http_session in http_sessions:
+        stats['sessions'] += 1
+        adapters_stats = [adapter.get_stats()
+                          for adapter in http_session.adapters.values()
+                          if isinstance(adapter, PoolingHTTPAdapter)]
+        for adapter_stats in adapters_stats:
+            for name, value in adapter_stats.items():
+                stats[name] += value
+    return stats
+
+
+def get_session(**kwargs):
     insecure = getattr(settings, 'OPENSTACK_SSL_NO_VERIFY', False)
     verify = getattr(settings, 'OPENSTACK_SSL_CACERT', True)
 
     if insecure:
         verify = False
 
-    return session.Session(verify=verify)
+    return session.Session(verify=verify,
+                           session=get_http_session(verify),
+                           **kwargs)
 
 
 def get_keystone_client():
@@ -16,20 +16,39 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import collections
 from collections import Sequence
 import functools
+import hashlib
+from importlib import import_module
+import json
+import logging
+import threading
+import time
 
 from django.conf import settings
+from django.utils.functional import SimpleLazyObject
 import semantic_version
 import six
 
 from horizon import exceptions
 
 
+LOG = logging.getLogger(__name__)
+
 __all__ = ('APIResourceWrapper', 'APIDictWrapper',
            'get_service_from_catalog', 'url_for',)
 
 
+def lazy_import(name):
+    """Returns a proxy of the module ``name`` which imports it on first use.
+
+    The client libraries of the services are imported this way, so that a
+    worker only loads the libraries of the services it calls.
+    """
+    return SimpleLazyObject(functools.partial(import_module, name))
+
+
 @functools.total_ordering
 class Version(object):
     def __init__(self, version):
@@ -366,3 +385,251 @@ def _get_endpoint_region(endpoint):
     both Keystone V2 and V3.
     """
     return endpoint.get('region_id') or endpoint.get('region')
+
+
+def get_paged_list_cache_config():
+    """Return the ``PAGED_LIST_CACHE`` setting merged with defaults."""
+    config = {
+        'enabled': False,
+        'timeout': 30,
+        'max_pages': 5,
+        'max_entries': 500,
+        'prefetch': True,
+    }
+    config.update(getattr(settings, 'PAGED_LIST_CACHE', {}))
+    return config
+
+
+class PageWindow(object):
+    """Ordered window of the items of a paginated list seen by a user.
+
+    The window holds consecutive items of the list in the order of the
+    list, along with the time they were fetched at. The marker of a page
+    fetched without the preceding items is kept as an item-less anchor, so
+    that the page can be found again from its marker.
+    """
+
+    def __init__(self):
+        self.ids = []
+        self.entries = []
+        # Whether the list has items before and after the window, None when
+        # it is not known.
+        self.more_before = None
+        self.more_after = None
+
+    def _index(self, marker):
+        try:
+            return self.ids.index(marker)
+        except ValueError:
+            return None
+
+    def get_page(self, marker, reversed_order, page_size, timeout):
+        """Return ``(items, has_more_data, has_prev_data)`` or ``None``.
+
+        ``None`` is returned when the window does not hold all the fresh
+        items needed to serve the page.
+        """
+        if marker is None:
+            if self.more_before is not False:
+                return None
+            start, has_prev_data = 0, False
+        else:
+            index = self._index(marker)
+            if index is None:
+                return None
+            if reversed_order:
+                start = index - page_size
+                if start > 0:
+                    has_prev_data = True
+                elif self.more_before is False:
+                    start, has_prev_data = 0, False
+                elif start == 0 and self.more_before:
+                    has_prev_data = True
+                else:
+                    return None
+                entries = self.entries[start:index]
+                if not self._fresh(entries, timeout):
+                    return None
+                return ([item for _id, item, _t in entries], True,
+                        has_prev_data)
+            start, has_prev_data = index + 1, True
+        end = start + page_size
+        if end < len(self.entries):
+            has_more_data = True
+        elif self.more_after is False or (end == len(self.entries) and
+                                          self.more_after):
+            has_more_data = self.more_after
+        else:
+            return None
+        entries = self.entries[start:end]
+        if not self._fresh(entries, timeout):
+            return None
+        return ([item for _id, item, _t in entries], has_more_data,
+                has_prev_data)
+
+    @staticmethod
+    def _fresh(entries, timeout):
+        fetched_after = time.time() - timeout
+        return all(item is not None and fetched_at >= fetched_after
+                   for _id, item, fetched_at in entries)
+
+    def add_page(self, marker, reversed_order, items, has_more_data,
+                 has_prev_data, max_items):
+        """Merge a page fetched from the API into the window."""
+        now = time.time()
+        new_entries = [(item.id, item, now) for item in items]
+        index = None if marker is None else self._index(marker)
+        if reversed_order:
+            if index is None:
+                self.entries = new_entries + [(marker, None, now)]
+                self.more_after = None
+            else:
+                self.entries = new_entries + self.entries[index:]
+            self.more_before = has_prev_data
+        else:
+            if marker is None:
+                self.entries = new_entries
+                self.more_before = False
+            elif index is None:
+                self.entries = [(marker, None, now)] + new_entries
+                self.more_before = None
+            else:
+                self.entries = self.entries[:index + 1] + new_entries
+            self.more_after = has_more_data
+        if len(self.entries) > max_items:
+            # Keep the items next to the page just fetched.
+            if reversed_order:
+                self.entries = self.entries[:max_items]
+                self.more_after = True
+            else:
+                self.entries = self.entries[-max_items:]
+                self.more_before = True
+        self.ids = [entry_id for entry_id, _item, _t in self.entries]
+
+
+class PagedListCache(object):
+    """Process-local store of the :class:`PageWindow` of each list.
+
+    The least recently used windows are evicted once ``max_entries`` is
+    reached.
+    """
+
+    def __init__(self):
+        self._windows = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self._prefetching = set()
+
+    def get_page(self, key, marker, reversed_order, page_size, timeout):
+        with self._lock:
+            window = self._windows.get(key)
+            if window is None:
+                return None
+            self._windows[key] = self._windows.pop(key)
+            return window.get_page(marker, reversed_order, page_size, timeout)
+
+    def add_page(self, key, marker, reversed_order, page, page_size,
+                 config):
+        items, has_more_data, has_prev_data = page
+        with self._lock:
+            window = self._windows.pop(key, None) or PageWindow()
+            window.add_page(marker, reversed_order, items, has_more_data,
+                            has_prev_data,
+                            page_size * config['max_pages'])
+            self._windows[key] = window
+            while len(self._windows) > config['max_entries']:
+                self._windows.popitem(last=False)
+
+    def prefetch(self, key, marker, reversed_order, fetch, page_size,
+                 config):
+        """Fetch a page in the background unless it is cached already.
+
+        Only one prefetch per list and marker runs at a time. Failures are
+        only logged, the page is then fetched when it is requested.
+        """
+        prefetch_key = (key, marker, reversed_order)
+        with self._lock:
+            window = self._windows.get(key)
+            if window is not None and window.get_page(
+                    marker, reversed_order, page_size, config['timeout']):
+                return
+            if prefetch_key in self._prefetching:
+                return
+            self._prefetching.add(prefetch_key)
+
+        def prefetch_page():
+            try:
+                page = fetch(marker, reversed_order)
+                self.add_page(key, marker, reversed_order, page, page_size,
+                              config)
+            except Exception:
+                LOG.warning("Unable to prefetch the page of %s after %s.",
+                            key, marker, exc_info=True)
+            finally:
+                with self._lock:
+                    self._prefetching.discard(prefetch_key)
+
+        _run_in_background(prefetch_page)
+
+    def clear(self):
+        with self._lock:
+            self._windows.clear()
+
+
+paged_list_cache = PagedListCache()
+
+
+def _run_in_background(func):
+    thread = threading.Thread(target=func)
+    thread.daemon = True
+    thread.start()
+
+
+def _get_paged_list_key(request, name, page_size, key_args):
+    user = request.user
+    key_data = json.dumps([name, getattr(user, 'id', None),
+                           getattr(user, 'tenant_id', None),
+                           getattr(user, 'services_region', None),
+                           page_size, key_args],
+                          sort_keys=True, default=repr)
+    return '%s:%s' % (name,
+                      hashlib.sha1(key_data.encode('utf-8')).hexdigest())
+
+
+def paged_list(request, name, fetch, page_size, marker=None,
+               reversed_order=False, key_args=None):
+    """Return a page of a marker-paginated list through the page cache.
+
+    ``fetch(marker, reversed_order)`` calls the API and returns
+    ``(items, has_more_data, has_prev_data)``, with the items in the order
+    of the list even when ``reversed_order`` is set. ``name`` and
+    ``key_args``, the filters and sort options of the list, identify the
+    list along with the user, project and region of the request.
+
+    When the ``PAGED_LIST_CACHE`` setting enables it, the pages seen by the
+    user are kept in an ordered window, so that going to the previous or
+    next page is served from memory while the items are fresh, and the
+    page following the one returned, in the direction of the navigation,
+    is fetched in the background.
+    """
+    config = get_paged_list_cache_config()
+    if not config['enabled'] or (reversed_order and marker is None):
+        return fetch(marker, reversed_order)
+    key = _get_paged_list_key(request, name, page_size, key_args)
+    page = paged_list_cache.get_page(key, marker, reversed_order, page_size,
+                                     config['timeout'])
+    if page is None:
+        page = fetch(marker, reversed_order)
+        paged_list_cache.add_page(key, marker, reversed_order, page,
+                                  page_size, config)
+    else:
+        LOG.debug("Page of %s after %s served from the page cache.",
+                  name, marker)
+    items, has_more_data, has_prev_data = page
+    if config['prefetch'] and items:
+        if reversed_order and has_prev_data:
+            paged_list_cache.prefetch(key, items[0].id, True, fetch,
+                                      page_size, config)
+        elif not reversed_order and has_more_data:
+            paged_list_cache.prefetch(key, items[-1].id, False, fetch,
+                                      page_size, config)
+    return list(items), has_more_data, has_prev_data
@@ -23,13 +23,12 @@ from __future__ import absolute_import
 import logging
 
 from django.conf import settings
+from django.utils.module_loading import module_has_submodule
 from django.utils.translation import pgettext_lazy
 from django.utils.translation import ugettext_lazy as _
 
-from cinderclient import api_versions
-from cinderclient import client as cinder_client
+import cinderclient
 from cinderclient import exceptions as cinder_exception
-from cinderclient.v2.contrib import list_extensions as cinder_list_extensions
 
 from horizon import exceptions
 from horizon.utils import functions as utils
@@ -43,6 +42,11 @@ from openstack_dashboard.contrib.developer.profiler import api as profiler
 
 LOG = logging.getLogger(__name__)
 
+api_versions = base.lazy_import('cinderclient.api_versions')
+cinder_client = base.lazy_import('cinderclient.client')
+cinder_list_extensions = base.lazy_import(
+    'cinderclient.v2.contrib.list_extensions')
+
 
 # API static values
 VOLUME_STATE_AVAILABLE = "available"
@@ -57,15 +61,14 @@ CONSUMER_CHOICES = (
 
 VERSIONS = base.APIVersionManager("volume", preferred_version='3')
 
-try:
-    from cinderclient.v2 import client as cinder_client_v2
+if module_has_submodule(cinderclient, 'v2'):
+    cinder_client_v2 = base.lazy_import('cinderclient.v2.client')
     VERSIONS.load_supported_version('2', {"client": cinder_client_v2,
                                           "version": '2'})
-    from cinderclient.v3 import client as cinder_client_v3
-    VERSIONS.load_supported_version('3', {"client": cinder_client_v3,
-                                          "version": '3'})
-except ImportError:
-    pass
+    if module_has_submodule(cinderclient, 'v3'):
+        cinder_client_v3 = base.lazy_import('cinderclient.v3.client')
+        VERSIONS.load_supported_version('3', {"client": cinder_client_v3,
+                                              "version": '3'})
 
 
 class BaseCinderAPIResourceWrapper(base.APIResourceWrapper):
@@ -302,28 +305,42 @@ def volume_list_paged(request, search_opts=None, marker=None, paginate=False,
     if c_client is None:
         return volumes, has_more_data, has_prev_data
 
-    # build a dictionary of volume_id -> transfer
-    transfers = {t.volume_id: t
-                 for t in transfer_list(request, search_opts=search_opts)}
+    def list_volumes(**kwargs):
+        # build a dictionary of volume_id -> transfer
+        transfers = {t.volume_id: t
+                     for t in transfer_list(request, search_opts=search_opts)}
+        volumes = []
+        for v in c_client.volumes.list(search_opts=search_opts, **kwargs):
+            v.transfer = transfers.get(v.id)
+            volumes.append(Volume(v))
+        return volumes
 
     if VERSIONS.active > 1 and paginate:
         page_size = utils.get_page_size(request)
-        # sort_key and sort_dir deprecated in kilo, use sort
-        # if pagination is true, we use a single sort parameter
-        # by default, it is "created_at"
-        sort = 'created_at:' + sort_dir
-        for v in c_client.volumes.list(search_opts=search_opts,
-                                       limit=page_size + 1,
-                                       marker=marker,
-                                       sort=sort):
-            v.transfer = transfers.get(v.id)
-            volumes.append(Volume(v))
-        volumes, has_more_data, has_prev_data = update_pagination(
-            volumes, page_size, marker, sort_dir)
+
+        def fetch_page(marker, reversed_order):
+            # sort_key and sort_dir deprecated in kilo, use sort
+            # if pagination is true, we use a single sort parameter
+            # by default, it is "created_at"
+            page_sort_dir = 'asc' if reversed_order else 'desc'
+            volumes = list_volumes(limit=page_size + 1, marker=marker,
+                                   sort='created_at:' + page_sort_dir)
+            volumes, has_more_data, has_prev_data = update_pagination(
+                volumes, page_size, marker, page_sort_dir)
+            if reversed_order:
+                volumes.reverse()
+            return volumes, has_more_data, has_prev_data
+
+        # An ascending sort is used to go back to the previous page, the
+        # page cache works on the list in its descending order.
+        volumes, has_more_data, has_prev_data = base.paged_list(
+            request, 'cinder.volume_list_paged', fetch_page, page_size,
+            marker=marker, reversed_order=(sort_dir == 'asc'),
+            key_args=search_opts)
+        if sort_dir == 'asc':
+            volumes.reverse()
     else:
-        for v in c_client.volumes.list(search_opts=search_opts):
-            v.transfer = transfers.get(v.id)
-            volumes.append(Volume(v))
+        volumes = list_volumes()
 
     return volumes, has_more_data, has_prev_data
 
@@ -28,11 +28,15 @@ from django.conf import settings
 from django.core.files.uploadedfile import InMemoryUploadedFile
 from django.core.files.uploadedfile import SimpleUploadedFile
 from django.core.files.uploadedfile import TemporaryUploadedFile
+from django.utils.module_loading import module_has_submodule
 
 import glanceclient as glance_client
+from keystoneauth1 import token_endpoint
 import six
 from six.moves import _thread as thread
 
+from openstack_auth import utils as auth_utils
+
 from horizon.utils import functions as utils
 from horizon.utils.memoized import memoized
 from openstack_dashboard.api import base
@@ -42,19 +46,15 @@ from openstack_dashboard.contrib.developer.profiler import api as profiler
 LOG = logging.getLogger(__name__)
 VERSIONS = base.APIVersionManager("image", preferred_version=2)
 
-try:
-    from glanceclient.v2 import client as glance_client_v2
+if module_has_submodule(glance_client, 'v2'):
+    glance_client_v2 = base.lazy_import('glanceclient.v2.client')
     VERSIONS.load_supported_version(2, {"client": glance_client_v2,
                                         "version": 2})
-except ImportError:
-    pass
 
-try:
-    from glanceclient.v1 import client as glance_client_v1
+if module_has_submodule(glance_client, 'v1'):
+    glance_client_v1 = base.lazy_import('glanceclient.v1.client')
     VERSIONS.load_supported_version(1, {"client": glance_client_v1,
                                         "version": 1})
-except ImportError:
-    pass
 
 
 class Image(base.APIResourceWrapper):
@@ -135,18 +135,20 @@ def glanceclient(request, version=None):
     api_version = VERSIONS.get_active_version()
 
     url = base.url_for(request, 'image')
-    insecure = getattr(settings, 'OPENSTACK_SSL_NO_VERIFY', False)
-    cacert = getattr(settings, 'OPENSTACK_SSL_CACERT', None)
+    # The shared HTTP session keeps the connections to glance alive between
+    # requests and worker threads.
+    session = auth_utils.get_session(
+        auth=token_endpoint.Token(url, request.user.token.id))
 
     # TODO(jpichon): Temporarily keep both till we update the API calls
     # to stop hardcoding a version in this file. Once that's done we
     # can get rid of the deprecated 'version' parameter.
     if version is None:
-        return api_version['client'].Client(url, token=request.user.token.id,
-                                            insecure=insecure, cacert=cacert)
+        return api_version['client'].Client(url, session=session,
+                                            endpoint_override=url)
     else:
-        return glance_client.Client(version, url, token=request.user.token.id,
-                                    insecure=insecure, cacert=cacert)
+        return glance_client.Client(version, url, session=session,
+                                    endpoint_override=url)
 
 
 # Note: Glance is adding more than just public and private in Newton or later
@@ -303,52 +305,61 @@ def image_list_detailed(request, marker=None, sort_dir='desc',
         request_size = limit
 
     _normalize_list_input(filters, **kwargs)
-    kwargs = {'filters': filters or {}}
+    filters = filters or {}
 
-    if marker:
-        kwargs['marker'] = marker
-    kwargs['sort_key'] = sort_key
+    def fetch_page(marker, reversed_order):
+        kwargs = {'filters': filters}
 
-    if not reversed_order:
-        kwargs['sort_dir'] = sort_dir
-    else:
-        kwargs['sort_dir'] = 'desc' if sort_dir == 'asc' else 'asc'
+        if marker:
+            kwargs['marker'] = marker
+        kwargs['sort_key'] = sort_key
 
-    images_iter = glanceclient(request).images.list(page_size=request_size,
-                                                    limit=limit,
-                                                    **kwargs)
-    has_prev_data = False
-    has_more_data = False
-    if paginate:
-        images = list(itertools.islice(images_iter, request_size))
-        # first and middle page condition
-        if len(images) > page_size:
-            images.pop(-1)
-            has_more_data = True
-            # middle page condition
-            if marker is not None:
+        if not reversed_order:
+            kwargs['sort_dir'] = sort_dir
+        else:
+            kwargs['sort_dir'] = 'desc' if sort_dir == 'asc' else 'asc'
+
+        images_iter = glanceclient(request).images.list(
+            page_size=request_size, limit=limit, **kwargs)
+        has_prev_data = False
+        has_more_data = False
+        if paginate:
+            images = list(itertools.islice(images_iter, request_size))
+            # first and middle page condition
+            if len(images) > page_size:
+                images.pop(-1)
+                has_more_data = True
+                # middle page condition
+                if marker is not None:
+                    has_prev_data = True
+            # first page condition when reached via prev back
+            elif reversed_order and marker is not None:
+                has_more_data = True
+            # last page condition
+            elif marker is not None:
                 has_prev_data = True
-        # first page condition when reached via prev back
-        elif reversed_order and marker is not None:
-            has_more_data = True
-        # last page condition
-        elif marker is not None:
-            has_prev_data = True
 
-        # restore the original ordering here
-        if reversed_order:
-            images = sorted(images, key=lambda image:
-                            (getattr(image, sort_key) or '').lower(),
-                            reverse=(sort_dir == 'desc'))
-    else:
-        images = list(images_iter)
+            # restore the original ordering here
+            if reversed_order:
+                images = sorted(images, key=lambda image:
+                                (getattr(image, sort_key) or '').lower(),
+                                reverse=(sort_dir == 'desc'))
+        else:
+            images = list(images_iter)
+
+        # TODO(jpichon): Do it better
+        wrapped_images = []
+        for image in images:
+            wrapped_images.append(Image(image))
 
-    # TODO(jpichon): Do it better
-    wrapped_images = []
-    for image in images:
-        wrapped_images.append(Image(image))
+        return wrapped_images, has_more_data, has_prev_data
 
-    return wrapped_images, has_more_data, has_prev_data
+    if not paginate:
+        return fetch_page(marker, reversed_order)
+    return base.paged_list(request, 'glance.image_list_detailed', fetch_page,
+                           page_size, marker=marker,
+                           reversed_order=reversed_order,
+                           key_args=[filters, sort_key, sort_dir])
 
 
 @profiler.trace
@@ -23,18 +23,23 @@ import collections
 import copy
 import logging
 
+import futurist
 import netaddr
 
 from django.conf import settings
 from django.utils.translation import ugettext_lazy as _
+from keystoneauth1 import token_endpoint
 from neutronclient.common import exceptions as neutron_exc
-from neutronclient.v2_0 import client as neutron_client
 from novaclient import exceptions as nova_exc
 import six
 
+from openstack_auth import utils as auth_utils
+
 from horizon import exceptions
 from horizon import messages
 from horizon.utils.memoized import memoized
+from horizon.utils.memoized import memoized_per_request
+from horizon.utils.memoized import memoized_shared
 from horizon.utils.memoized import memoized_with_request
 from openstack_dashboard.api import base
 from openstack_dashboard.api import nova
@@ -44,6 +49,8 @@ from openstack_dashboard import policy
 
 LOG = logging.getLogger(__name__)
 
+neutron_client = base.lazy_import('neutronclient.v2_0.client')
+
 IP_VERSION_DICT = {4: 'IPv4', 6: 'IPv6'}
 
 OFF_STATE = 'OFF'
@@ -55,6 +62,17 @@ ROUTER_INTERFACE_OWNERS = (
     'network:ha_router_replicated_interface'
 )
 
+# Number of ports above which servers_update_addresses lists all the
+# floating IPs of the project instead of filtering them by port IDs. About
+# 150 port IDs fit in the 8192 bytes accepted by default in a neutron URI.
+ADDRESS_LOOKUP_MAX_FILTERED_PORTS = 150
+# Values of the address_lookup_strategy setting.
+ADDRESS_LOOKUP_STRATEGIES = ('auto', 'serial', 'parallel', 'project_fips')
+
+# Length kept free for the endpoint URL, the resource path and the other
+# query parameters when splitting long filters before sending a request.
+URI_LENGTH_MARGIN = 512
+
 VNIC_TYPES = [
     ('normal', _('Normal')),
     ('direct', _('Direct')),
@@ -772,12 +790,12 @@ def get_auth_params_from_request(request):
 @memoized_with_request(get_auth_params_from_request)
 def neutronclient(request_auth_params):
     token_id, neutron_url, auth_url = request_auth_params
-    insecure = getattr(settings, 'OPENSTACK_SSL_NO_VERIFY', False)
-    cacert = getattr(settings, 'OPENSTACK_SSL_CACERT', None)
-    c = neutron_client.Client(token=token_id,
-                              auth_url=auth_url,
-                              endpoint_url=neutron_url,
-                              insecure=insecure, ca_cert=cacert)
+    # The shared HTTP session keeps the connections to neutron alive between
+    # requests and worker threads.
+    session = auth_utils.get_session(
+        auth=token_endpoint.Token(neutron_url, token_id))
+    c = neutron_client.Client(session=session,
+                              endpoint_override=neutron_url)
     return c
 
 
@@ -791,6 +809,11 @@ def list_resources_with_long_filters(list_method,
     list parameters specified by a list_field argument into chunks
     and call the specified list_method repeatedly.
 
+    When ``max_uri_length`` is set in the ``OPENSTACK_NEUTRON_NETWORK``
+    setting, the filter values are split before the first request instead
+    of waiting for the 414 error. Up to ``list_filter_concurrency`` chunks
+    are requested in parallel.
+
     :param list_method: Method used to retrieve resource list.
     :param filter_attr: attribute name to be filtered. The value corresponding
         to this attribute is specified by "filter_values".
@@ -804,6 +827,25 @@ def list_resources_with_long_filters(list_method,
         without any changes. You can specify more filter conditions
         in addition to a pair of filter_attr and filter_values.
     """
+    network_config = getattr(settings, 'OPENSTACK_NEUTRON_NETWORK', {})
+    max_uri_length = network_config.get('max_uri_length')
+    if (max_uri_length and
+            isinstance(filter_values, (list, tuple, set, frozenset))):
+        filter_values = tuple(filter_values)
+        # Other filter conditions specified in **params are part of the URI
+        # too. The request object does not end up in the URI.
+        other_filters_len = sum(len(key) + len(six.text_type(val)) + 2
+                                for key, val in params.items()
+                                if key != 'request')
+        allowed_filter_len = (max_uri_length - URI_LENGTH_MARGIN -
+                              other_filters_len)
+        filter_len = _get_filter_len(filter_attr, filter_values)
+        if filter_len > allowed_filter_len and len(filter_values) > 1:
+            chunk_size = _get_filter_chunk_size(filter_attr, filter_values,
+                                                allowed_filter_len)
+            return _list_resources_in_chunks(list_method, filter_attr,
+                                             filter_values, chunk_size,
+                                             params)
     try:
         params[filter_attr] = filter_values
         return list_method(**params)
@@ -817,23 +859,57 @@ def list_resources_with_long_filters(list_method,
         # which may be specified in **params.
         if not isinstance(filter_values, (list, tuple, set, frozenset)):
             filter_values = [filter_values]
+        filter_values = tuple(filter_values)
+
+        allowed_filter_len = (_get_filter_len(filter_attr, filter_values) -
+                              uri_len_exc.excess)
+        chunk_size = _get_filter_chunk_size(filter_attr, filter_values,
+                                            allowed_filter_len)
+        return _list_resources_in_chunks(list_method, filter_attr,
+                                         filter_values, chunk_size, params)
+
 
-        # Length of each query filter is:
-        # <key>=<value>& (e.g., id=<uuid>)
-        # The length will be key_len + value_maxlen + 2
-        all_filter_len = sum(len(filter_attr) + len(val) + 2
-                             for val in filter_values)
-        allowed_filter_len = all_filter_len - uri_len_exc.excess
+def _get_filter_len(filter_attr, filter_values):
+    # Length of each query filter is:
+    # <key>=<value>& (e.g., id=<uuid>)
+    # The length will be key_len + value_maxlen + 2
+    return sum(len(filter_attr) + len(val) + 2 for val in filter_values)
 
-        val_maxlen = max(len(val) for val in filter_values)
-        filter_maxlen = len(filter_attr) + val_maxlen + 2
-        chunk_size = allowed_filter_len // filter_maxlen
 
-        resources = []
-        for i in range(0, len(filter_values), chunk_size):
-            params[filter_attr] = filter_values[i:i + chunk_size]
-            resources.extend(list_method(**params))
-        return resources
+def _get_filter_chunk_size(filter_attr, filter_values, allowed_filter_len):
+    val_maxlen = max(len(val) for val in filter_values)
+    filter_maxlen = len(filter_attr) + val_maxlen + 2
+    return max(allowed_filter_len // filter_maxlen, 1)
+
+
+def _list_resources_in_chunks(list_method, filter_attr, filter_values,
+                              chunk_size, params):
+    """Call list_method once per chunk of filter values.
+
+    The chunks are requested in parallel by up to ``list_filter_concurrency``
+    threads. The resources are returned in the order of the chunks.
+    """
+    def _list_chunk(chunk):
+        chunk_params = dict(params)
+        chunk_params[filter_attr] = chunk
+        return list_method(**chunk_params)
+
+    chunks = [filter_values[i:i + chunk_size]
+              for i in range(0, len(filter_values), chunk_size)]
+    network_config = getattr(settings, 'OPENSTACK_NEUTRON_NETWORK', {})
+    concurrency = min(network_config.get('list_filter_concurrency', 1),
+                      len(chunks))
+
+    resources = []
+    if concurrency > 1:
+        with futurist.ThreadPoolExecutor(max_workers=concurrency) as e:
+            futures = [e.submit(_list_chunk, chunk) for chunk in chunks]
+        for future in futures:
+            resources.extend(future.result())
+    else:
+        for chunk in chunks:
+            resources.extend(_list_chunk(chunk))
+    return resources
 
 
 @profiler.trace
@@ -987,6 +1063,7 @@ def network_list(request, **params):
 
 
 @profiler.trace
+@memoized_per_request('neutron')
 def network_list_for_tenant(request, tenant_id, include_external=False,
                             **params):
     """Return a network list available for the tenant.
@@ -1090,6 +1167,7 @@ def network_delete(request, network_id):
 
 
 @profiler.trace
+@memoized_shared('neutron', scope='project', timeout=30)
 @memoized
 def subnet_list(request, **params):
     LOG.debug("subnet_list(): params=%s", params)
@@ -1619,6 +1697,11 @@ def servers_update_addresses(request, servers, all_tenants=False):
 
        Should be used when up to date networking information is required,
        and Nova's networking info caching mechanism is not fast enough.
+
+       The floating IPs and networks of the ports are looked up using the
+       strategy set by ``address_lookup_strategy`` in the
+       ``OPENSTACK_NEUTRON_NETWORK`` setting, see
+       :func:`_get_address_lookup_strategy`.
     """
 
     # NOTE(e0ne): we don't need to call neutron if we have no instances
@@ -1633,18 +1716,17 @@ def servers_update_addresses(request, servers, all_tenants=False):
             port_list, 'device_id',
             tuple([instance.id for instance in servers]),
             request=request)
-        fips = FloatingIpManager(request)
-        if fips.is_supported():
-            floating_ips = list_resources_with_long_filters(
-                fips.list, 'port_id', tuple([port.id for port in ports]),
-                all_tenants=all_tenants)
+        strategy = _get_address_lookup_strategy(ports, all_tenants)
+        LOG.debug("servers_update_addresses(): %(ports)s ports, "
+                  "strategy=%(strategy)s",
+                  {'ports': len(ports), 'strategy': strategy})
+        if strategy == 'serial':
+            floating_ips, networks = _get_ports_address_info_serial(
+                request, ports, all_tenants)
         else:
-            floating_ips = []
-        # NOTE(e0ne): we need frozenset here to work with @memoized decorator.
-        # @memoized works with hashable arguments only
-        networks = list_resources_with_long_filters(
-            network_list, 'id', frozenset([port.network_id for port in ports]),
-            request=request)
+            floating_ips, networks = _get_ports_address_info_parallel(
+                request, ports, all_tenants,
+                project_fips=(strategy == 'project_fips'))
     except Exception as e:
         LOG.error('Unable to connect to Neutron: %s', e)
         error_message = _('Unable to connect to Neutron.')
@@ -1678,6 +1760,102 @@ def servers_update_addresses(request, servers, all_tenants=False):
             server.addresses = addresses
 
 
+def _get_address_lookup_strategy(ports, all_tenants):
+    """Choose how floating IPs and networks of ports are looked up.
+
+    * ``serial``: floating IPs filtered by port IDs, then networks filtered
+      by ID, one after another.
+    * ``parallel``: the same queries, sent concurrently.
+    * ``project_fips``: all the floating IPs of the project are listed once
+      and matched to the ports locally, concurrently with the networks.
+    * ``auto`` (default): ``project_fips`` when the port IDs would not fit
+      in a single filtered request and the floating IPs of the project are
+      requested, ``parallel`` otherwise.
+
+    Floating IPs of all projects are always filtered, as their number is
+    not bounded by the project, so ``project_fips`` falls back to
+    ``parallel`` for them. Unknown values are replaced by ``auto``.
+    """
+    network_config = getattr(settings, 'OPENSTACK_NEUTRON_NETWORK', {})
+    strategy = network_config.get('address_lookup_strategy', 'auto')
+    if strategy not in ADDRESS_LOOKUP_STRATEGIES:
+        LOG.warning("Unknown address_lookup_strategy %(strategy)r, 'auto' "
+                    "is used instead. Valid values: %(valid)s.",
+                    {'strategy': strategy,
+                     'valid': ', '.join(ADDRESS_LOOKUP_STRATEGIES)})
+        strategy = 'auto'
+    if strategy == 'project_fips' and all_tenants:
+        return 'parallel'
+    if strategy != 'auto':
+        return strategy
+    if not all_tenants and len(ports) > ADDRESS_LOOKUP_MAX_FILTERED_PORTS:
+        return 'project_fips'
+    return 'parallel'
+
+
+def _get_ports_address_info_serial(request, ports, all_tenants):
+    fips = FloatingIpManager(request)
+    if fips.is_supported():
+        floating_ips = list_resources_with_long_filters(
+            fips.list, 'port_id', tuple([port.id for port in ports]),
+            all_tenants=all_tenants)
+    else:
+        floating_ips = []
+    # NOTE(e0ne): we need frozenset here to work with @memoized decorator.
+    # @memoized works with hashable arguments only
+    networks = list_resources_with_long_filters(
+        network_list, 'id', frozenset([port.network_id for port in ports]),
+        request=request)
+    return floating_ips, networks
+
+
+def _get_ports_address_info_parallel(request, ports, all_tenants,
+                                     project_fips=False):
+    # Both queries depend only on the ports, so they are sent concurrently.
+    if not ports:
+        return [], []
+    with futurist.ThreadPoolExecutor(max_workers=2) as e:
+        fips_future = e.submit(_list_ports_floating_ips, request, ports,
+                               all_tenants, project_fips)
+        networks_future = e.submit(_list_ports_networks, request, ports)
+    return fips_future.result(), networks_future.result()
+
+
+def _list_ports_floating_ips(request, ports, all_tenants, project_fips):
+    """List floating IPs associated with the given ports.
+
+    Unlike FloatingIpManager.list, the instances of the floating IPs are not
+    resolved, as the ports are already known by the caller.
+    """
+    if not FloatingIpManager(request).is_supported():
+        return []
+    client = neutronclient(request)
+    search_opts = {}
+    if not all_tenants:
+        search_opts['tenant_id'] = request.user.tenant_id
+    port_ids = tuple([port.id for port in ports])
+    if project_fips:
+        fips = client.list_floatingips(**search_opts).get('floatingips')
+        port_ids = set(port_ids)
+        fips = [fip for fip in fips if fip['port_id'] in port_ids]
+    else:
+        fips = list_resources_with_long_filters(
+            lambda **params: client.list_floatingips(
+                **params).get('floatingips'),
+            'port_id', port_ids, **search_opts)
+    return [FloatingIp(fip) for fip in fips]
+
+
+def _list_ports_networks(request, ports):
+    """List the ID and name of the networks of the given ports."""
+    client = neutronclient(request)
+    networks = list_resources_with_long_filters(
+        lambda **params: client.list_networks(**params).get('networks'),
+        'id', tuple(set(port.network_id for port in ports)),
+        fields=['id', 'name'])
+    return [Network(network) for network in networks]
+
+
 def _server_get_addresses(request, server, ports, floating_ips, network_names):
     def _format_address(mac, ip, type):
         try:
@@ -1714,6 +1892,7 @@ def _server_get_addresses(request, server, ports, floating_ips, network_names):
 
 
 @profiler.trace
+@memoized_shared('neutron', scope='global', timeout=3600)
 @memoized_with_request(neutronclient)
 def list_extensions(neutron_api):
     """List neutron extensions.
@@ -1731,6 +1910,7 @@ def list_extensions(neutron_api):
 
 
 @profiler.trace
+@memoized_per_request('neutron')
 def is_extension_supported(request, extension_alias):
     """Check if a specified extension is supported.
 
@@ -26,16 +26,16 @@ import logging
 from django.conf import settings
 from django.utils.translation import ugettext_lazy as _
 
-from novaclient import api_versions
-from novaclient import client as nova_client
+from keystoneauth1 import token_endpoint
 from novaclient import exceptions as nova_exceptions
-from novaclient.v2 import instance_action as nova_instance_action
-from novaclient.v2 import list_extensions as nova_list_extensions
-from novaclient.v2 import servers as nova_servers
+
+from openstack_auth import utils as auth_utils
 
 from horizon import exceptions as horizon_exceptions
 from horizon.utils import functions as utils
 from horizon.utils.memoized import memoized
+from horizon.utils.memoized import memoized_per_request
+from horizon.utils.memoized import memoized_shared
 from horizon.utils.memoized import memoized_with_request
 
 from openstack_dashboard.api import base
@@ -44,6 +44,13 @@ from openstack_dashboard.contrib.developer.profiler import api as profiler
 
 LOG = logging.getLogger(__name__)
 
+api_versions = base.lazy_import('novaclient.api_versions')
+nova_client = base.lazy_import('novaclient.client')
+nova_flavors = base.lazy_import('novaclient.v2.flavors')
+nova_instance_action = base.lazy_import('novaclient.v2.instance_action')
+nova_list_extensions = base.lazy_import('novaclient.v2.list_extensions')
+nova_servers = base.lazy_import('novaclient.v2.servers')
+
 # Supported compute versions
 VERSIONS = base.APIVersionManager("compute", preferred_version=2)
 VERSIONS.load_supported_version(1.1, {"client": nova_client, "version": 1.1})
@@ -53,8 +60,6 @@ VERSIONS.load_supported_version(2, {"client": nova_client, "version": 2})
 INSTANCE_ACTIVE_STATE = 'ACTIVE'
 VOLUME_STATE_AVAILABLE = "available"
 DEFAULT_QUOTA_NAME = 'default'
-INSECURE = getattr(settings, 'OPENSTACK_SSL_NO_VERIFY', False)
-CACERT = getattr(settings, 'OPENSTACK_SSL_CACERT', None)
 
 
 @memoized
@@ -280,16 +285,13 @@ def novaclient(request_auth_params, version=None):
     ) = request_auth_params
     if version is None:
         version = VERSIONS.get_active_version()['version']
+    # The shared HTTP session keeps the connections to nova alive between
+    # requests and worker threads.
+    session = auth_utils.get_session(
+        auth=token_endpoint.Token(nova_url, token_id))
     c = nova_client.Client(version,
-                           username,
-                           token_id,
-                           project_id=project_id,
-                           project_domain_id=project_domain_id,
-                           auth_url=auth_url,
-                           insecure=INSECURE,
-                           cacert=CACERT,
+                           session=session,
                            http_log_debug=settings.DEBUG,
-                           auth_token=token_id,
                            endpoint_override=nova_url)
     return c
 
@@ -343,6 +345,7 @@ def flavor_create(request, name, memory, vcpu, disk, flavorid='auto',
                                                 ephemeral=ephemeral,
                                                 swap=swap, is_public=is_public,
                                                 rxtx_factor=rxtx_factor)
+    _flavor_list_info.invalidate()
     if (metadata):
         flavor_extra_set(request, flavor.id, metadata)
     return flavor
@@ -351,6 +354,7 @@ def flavor_create(request, name, memory, vcpu, disk, flavorid='auto',
 @profiler.trace
 def flavor_delete(request, flavor_id):
     novaclient(request).flavors.delete(flavor_id)
+    _flavor_list_info.invalidate()
 
 
 @profiler.trace
@@ -361,14 +365,28 @@ def flavor_get(request, flavor_id, get_extras=False):
     return flavor
 
 
+# The flavors are bound to the client of the request which retrieved them,
+# so only their attributes and extra specs are shared between requests.
+@memoized_shared('nova', scope='project', timeout=300, name='flavor_list')
+def _flavor_list_info(request, is_public, get_extras):
+    flavors = novaclient(request).flavors.list(is_public=is_public)
+    return [(flavor.to_dict(),
+             flavor_get_extras(request, flavor.id, True, flavor)
+             if get_extras else None)
+            for flavor in flavors]
+
+
 @profiler.trace
 @memoized
 def flavor_list(request, is_public=True, get_extras=False):
     """Get the list of available instance sizes (flavors)."""
-    flavors = novaclient(request).flavors.list(is_public=is_public)
-    if get_extras:
-        for flavor in flavors:
-            flavor.extras = flavor_get_extras(request, flavor.id, True, flavor)
+    manager = novaclient(request).flavors
+    flavors = []
+    for info, extras in _flavor_list_info(request, is_public, get_extras):
+        flavor = nova_flavors.Flavor(manager, info, loaded=True)
+        if get_extras:
+            flavor.extras = extras
+        flavors.append(flavor)
     return flavors
 
 
@@ -406,23 +424,37 @@ def flavor_list_paged(request, is_public=True, get_extras=False, marker=None,
     has_more_data = False
     has_prev_data = False
 
+    def get_extras_for(flavors):
+        if get_extras:
+            for flavor in flavors:
+                flavor.extras = flavor_get_extras(request, flavor.id, True,
+                                                  flavor)
+        return flavors
+
     if paginate:
-        if reversed_order:
-            sort_dir = 'desc' if sort_dir == 'asc' else 'asc'
         page_size = utils.get_page_size(request)
-        flavors = novaclient(request).flavors.list(is_public=is_public,
-                                                   marker=marker,
-                                                   limit=page_size + 1,
-                                                   sort_key=sort_key,
-                                                   sort_dir=sort_dir)
-        flavors, has_more_data, has_prev_data = update_pagination(
-            flavors, page_size, marker, sort_dir, sort_key, reversed_order)
-    else:
-        flavors = novaclient(request).flavors.list(is_public=is_public)
 
-    if get_extras:
-        for flavor in flavors:
-            flavor.extras = flavor_get_extras(request, flavor.id, True, flavor)
+        def fetch_page(marker, reversed_order):
+            page_sort_dir = sort_dir
+            if reversed_order:
+                page_sort_dir = 'desc' if sort_dir == 'asc' else 'asc'
+            flavors = novaclient(request).flavors.list(is_public=is_public,
+                                                       marker=marker,
+                                                       limit=page_size + 1,
+                                                       sort_key=sort_key,
+                                                       sort_dir=page_sort_dir)
+            flavors, has_more_data, has_prev_data = update_pagination(
+                flavors, page_size, marker, page_sort_dir, sort_key,
+                reversed_order)
+            return get_extras_for(flavors), has_more_data, has_prev_data
+
+        flavors, has_more_data, has_prev_data = base.paged_list(
+            request, 'nova.flavor_list_paged', fetch_page, page_size,
+            marker=marker, reversed_order=reversed_order,
+            key_args=[is_public, get_extras, sort_key, sort_dir])
+    else:
+        flavors = get_extras_for(
+            novaclient(request).flavors.list(is_public=is_public))
 
     return (flavors, has_more_data, has_prev_data)
 
@@ -437,15 +469,19 @@ def flavor_access_list(request, flavor=None):
 @profiler.trace
 def add_tenant_to_flavor(request, flavor, tenant):
     """Add a tenant to the given flavor access list."""
-    return novaclient(request).flavor_access.add_tenant_access(
+    result = novaclient(request).flavor_access.add_tenant_access(
         flavor=flavor, tenant=tenant)
+    _flavor_list_info.invalidate()
+    return result
 
 
 @profiler.trace
 def remove_tenant_from_flavor(request, flavor, tenant):
     """Remove a tenant from the given flavor access list."""
-    return novaclient(request).flavor_access.remove_tenant_access(
+    result = novaclient(request).flavor_access.remove_tenant_access(
         flavor=flavor, tenant=tenant)
+    _flavor_list_info.invalidate()
+    return result
 
 
 @profiler.trace
@@ -464,7 +500,9 @@ def flavor_get_extras(request, flavor_id, raw=False, flavor=None):
 def flavor_extra_delete(request, flavor_id, keys):
     """Unset the flavor extra spec keys."""
     flavor = novaclient(request).flavors.get(flavor_id)
-    return flavor.unset_keys(keys)
+    result = flavor.unset_keys(keys)
+    _flavor_list_info.invalidate()
+    return result
 
 
 @profiler.trace
@@ -473,7 +511,9 @@ def flavor_extra_set(request, flavor_id, metadata):
     flavor = novaclient(request).flavors.get(flavor_id)
     if (not metadata):  # not a way to delete keys
         return None
-    return flavor.set_keys(metadata)
+    result = flavor.set_keys(metadata)
+    _flavor_list_info.invalidate()
+    return result
 
 
 @profiler.trace
@@ -898,6 +938,7 @@ def migrate_host(request, host, live_migrate=False, disk_over_commit=False,
 
 
 @profiler.trace
+@memoized_per_request('nova')
 def tenant_absolute_limits(request, reserved=False, tenant_id=None):
     # Nova does not allow to specify tenant_id for non-admin users
     # even if tenant_id matches a tenant_id of the user.
@@ -1009,6 +1050,7 @@ def interface_detach(request, server, port_id):
 
 
 @profiler.trace
+@memoized_shared('nova', scope='global', timeout=3600)
 @memoized_with_request(novaclient)
 def list_extensions(nova_api):
     """List all nova extensions, except the ones in the blacklist."""
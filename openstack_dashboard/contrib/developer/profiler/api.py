@@ -24,6 +24,8 @@ from osprofiler import profiler
 from osprofiler import web
 from six.moves.urllib.parse import urlparse
 
+from horizon.utils import memoized
+
 
 ROOT_HEADER = 'PARENT_VIEW_TRACE_ID'
 PROFILER_SETTINGS = getattr(settings, 'OPENSTACK_PROFILER', {})
@@ -49,6 +51,13 @@ def traced(request, name, info=None):
         yield
 
 
+def report_coalesced_calls(request):
+    """Add the number of API calls coalesced by the request to its trace."""
+    count = memoized.get_coalesced_call_count(request)
+    with traced(request, 'coalesced_api_calls', {'coalesced_calls': count}):
+        pass
+
+
 def _get_engine_kwargs(request, connection_str):
     from openstack_dashboard.api import base
     engines_kwargs = {
@@ -141,5 +141,9 @@ class ProfilerMiddleware(object):
             response.set_cookie('profile_page', max_age=0, path=path)
 
     def process_response(self, request, response):
+        # The response has been rendered at this point, so the calls made
+        # by the templates are counted as well.
+        if api.ROOT_HEADER in request.META:
+            api.report_coalesced_calls(request)
         self.clear_profiling_cookies(request, response)
         return response
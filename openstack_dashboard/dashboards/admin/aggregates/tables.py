@@ -83,14 +83,8 @@ class UpdateAggregateAction(tables.LinkAction):
     icon = "pencil"
 
 
-class AggregateFilterAction(tables.FilterAction):
-    def filter(self, table, aggregates, filter_string):
-        q = filter_string.lower()
-
-        def comp(aggregate):
-            return q in aggregate.name.lower()
-
-        return filter(comp, aggregates)
+class AggregateFilterAction(tables.NameFilterAction):
+    pass
 
 
 class AvailabilityZoneFilterAction(tables.FilterAction):
@@ -118,15 +118,8 @@ class ModifyAccess(tables.LinkAction):
         return not flavor.is_public
 
 
-class FlavorFilterAction(tables.FilterAction):
-    def filter(self, table, flavors, filter_string):
-        """Really naive case-insensitive search."""
-        q = filter_string.lower()
-
-        def comp(flavor):
-            return q in flavor.name.lower()
-
-        return filter(comp, flavors)
+class FlavorFilterAction(tables.NameFilterAction):
+    pass
 
 
 def get_size(flavor):
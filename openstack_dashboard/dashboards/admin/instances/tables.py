@@ -89,18 +89,35 @@ class LiveMigrateInstance(policy.PolicyTargetMixin,
 
 
 class AdminUpdateRow(project_tables.UpdateRow):
+    batch_search_opts = {'all_tenants': True}
+
     def get_data(self, request, instance_id):
         instance = super(AdminUpdateRow, self).get_data(request, instance_id)
-        try:
-            tenant = api.keystone.tenant_get(request,
-                                             instance.tenant_id,
-                                             admin=True)
-            instance.tenant_name = getattr(tenant, "name", instance.tenant_id)
-        except keystone_exceptions.NotFound:
-            instance.tenant_name = None
-
+        self._set_tenant_name(request, instance, {})
         return instance
 
+    def get_data_list(self, request, instance_ids):
+        instances = super(AdminUpdateRow, self).get_data_list(request,
+                                                              instance_ids)
+        tenant_names = {}
+        for instance in instances:
+            # Instances fetched with get_data already have their project.
+            if not hasattr(instance, 'tenant_name'):
+                self._set_tenant_name(request, instance, tenant_names)
+        return instances
+
+    def _set_tenant_name(self, request, instance, tenant_names):
+        if instance.tenant_id not in tenant_names:
+            try:
+                tenant = api.keystone.tenant_get(request,
+                                                 instance.tenant_id,
+                                                 admin=True)
+                tenant_names[instance.tenant_id] = getattr(
+                    tenant, "name", instance.tenant_id)
+            except keystone_exceptions.NotFound:
+                tenant_names[instance.tenant_id] = None
+        instance.tenant_name = tenant_names[instance.tenant_id]
+
 
 class AdminInstanceFilterAction(tables.FilterAction):
     # Change default name of 'filter' to distinguish this one from the
@@ -190,6 +207,7 @@ class AdminInstancesTable(tables.DataTable):
         table_actions = (project_tables.DeleteInstance,
                          AdminInstanceFilterAction)
         row_class = AdminUpdateRow
+        cache_row_actions = True
         row_actions = (project_tables.ConfirmResize,
                        project_tables.RevertResize,
                        AdminEditInstance,
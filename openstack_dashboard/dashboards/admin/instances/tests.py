@@ -16,10 +16,13 @@ from collections import OrderedDict
 import uuid
 
 from django import http
+from django.test.utils import override_settings
 from django.urls import reverse
 
+import mock
 from mox3.mox import IsA
 
+from horizon.utils import memoized
 from openstack_dashboard import api
 from openstack_dashboard.test import helpers as test
 
@@ -59,6 +62,84 @@ class InstanceViewTest(test.BaseAdminViewTests):
         instances = res.context['table'].data
         self.assertItemsEqual(instances, servers)
 
+    @test.create_stubs({
+        api.nova: ('flavor_list', 'server_list', 'extension_supported',),
+        api.keystone: ('tenant_list', 'tenant_get'),
+        api.glance: ('image_list_detailed',),
+    })
+    def test_index_missing_tenant(self):
+        servers = self.servers.list()
+        tenants = self.tenants.list()
+        api.nova.extension_supported('AdminActions', IsA(http.HttpRequest)) \
+            .MultipleTimes().AndReturn(True)
+        api.nova.extension_supported('Shelve', IsA(http.HttpRequest)) \
+            .MultipleTimes().AndReturn(True)
+        # The last project is missing from the project list, as happens
+        # when the cached list is older than the project.
+        api.keystone.tenant_list(IsA(http.HttpRequest)).\
+            AndReturn([tenants[:-1], False])
+        api.keystone.tenant_get(IsA(http.HttpRequest), tenants[-1].id) \
+            .AndReturn(tenants[-1])
+        search_opts = {'marker': None, 'paginate': True, 'all_tenants': True}
+        api.glance.image_list_detailed(IsA(http.HttpRequest))\
+            .AndReturn(self.images.list())
+        api.nova.flavor_list(IsA(http.HttpRequest)) \
+            .AndReturn(self.flavors.list())
+        api.nova.server_list(IsA(http.HttpRequest),
+                             search_opts=search_opts) \
+            .AndReturn([servers, False])
+        self.mox.ReplayAll()
+
+        res = self.client.get(INDEX_URL)
+        instances = res.context['table'].data
+        self.assertItemsEqual(instances, servers)
+        self.assertEqual(
+            [tenants[-1].name],
+            list(set(inst.tenant_name for inst in instances
+                     if inst.tenant_id == tenants[-1].id)))
+
+    @override_settings(MEMOIZED_SHARED_CACHE={'backend': 'local'})
+    @test.create_mocks({
+        api.nova: ('flavor_list', 'server_list', 'extension_supported',),
+        api.keystone: ('tenant_list', 'tenant_get'),
+        api.glance: ('image_list_detailed', 'image_get'),
+    })
+    def test_index_missing_names_cached(self):
+        memoized.get_shared_backend().clear()
+        self.addCleanup(memoized.get_shared_backend().clear)
+        servers = self.servers.list()
+        tenants = self.tenants.list()
+        image_ids = set(server.image['id'] for server in servers
+                        if isinstance(server.image, dict))
+        # The last project and the images of the servers were deleted.
+        self.mock_tenant_list.return_value = [tenants[:-1], False]
+        self.mock_image_list_detailed.return_value = (
+            [image for image in self.images.list()
+             if image.id not in image_ids], False, False)
+        self.mock_flavor_list.return_value = self.flavors.list()
+        self.mock_server_list.return_value = [servers, False]
+        self.mock_extension_supported.return_value = True
+        self.mock_tenant_get.side_effect = self.exceptions.keystone
+        self.mock_image_get.side_effect = self.exceptions.glance
+
+        for i in range(2):
+            res = self.client.get(INDEX_URL)
+            instances = res.context['table'].data
+            self.assertItemsEqual(instances, servers)
+            for inst in instances:
+                if inst.tenant_id == tenants[-1].id:
+                    self.assertIsNone(inst.tenant_name)
+                if isinstance(inst.image, dict):
+                    self.assertEqual('-', inst.image['name'])
+
+        # The failed lookups are cached too, they are made once per ID.
+        self.mock_tenant_get.assert_called_once_with(test.IsHttpRequest(),
+                                                     tenants[-1].id)
+        self.assertItemsEqual(
+            [mock.call(test.IsHttpRequest(), image_id)
+             for image_id in image_ids],
+            self.mock_image_get.call_args_list)
+
     @test.create_stubs({
         api.nova: ('flavor_list', 'flavor_get', 'server_list',
                    'extension_supported',),
@@ -82,9 +163,10 @@ class InstanceViewTest(test.BaseAdminViewTests):
             AndRaise(self.exceptions.nova)
         api.keystone.tenant_list(IsA(http.HttpRequest)).\
             AndReturn([tenants, False])
-        for server in servers:
-            api.nova.flavor_get(IsA(http.HttpRequest), server.flavor["id"]). \
-                AndReturn(full_flavors[server.flavor["id"]])
+        # Each missing flavor is retrieved only once.
+        for flavor_id in set(server.flavor["id"] for server in servers):
+            api.nova.flavor_get(IsA(http.HttpRequest), flavor_id). \
+                AndReturn(full_flavors[flavor_id])
 
         self.mox.ReplayAll()
 
@@ -93,7 +175,9 @@ class InstanceViewTest(test.BaseAdminViewTests):
         instances = res.context['table'].data
         self.assertItemsEqual(instances, servers)
 
-    @test.create_stubs({
+    # NOTE: The missing flavors are retrieved concurrently, so mock is used
+    # rather than mox which expects the calls in a given order.
+    @test.create_mocks({
         api.nova: ('flavor_list', 'flavor_get', 'server_list',
                    'extension_supported',),
         api.keystone: ('tenant_list',),
@@ -109,23 +193,12 @@ class InstanceViewTest(test.BaseAdminViewTests):
         for i, server in enumerate(servers):
             server.flavor['id'] = str(uuid.UUID(int=i))
 
-        api.glance.image_list_detailed(IsA(http.HttpRequest))\
-            .AndReturn((images, False, False))
-        api.nova.flavor_list(IsA(http.HttpRequest)).AndReturn(flavors)
-        search_opts = {'marker': None, 'paginate': True, 'all_tenants': True}
-        api.nova.server_list(IsA(http.HttpRequest),
-                             search_opts=search_opts) \
-            .AndReturn([servers, False])
-        api.nova.extension_supported('AdminActions', IsA(http.HttpRequest)) \
-            .MultipleTimes().AndReturn(True)
-        api.nova.extension_supported('Shelve', IsA(http.HttpRequest)) \
-            .MultipleTimes().AndReturn(True)
-        api.keystone.tenant_list(IsA(http.HttpRequest)).\
-            AndReturn([tenants, False])
-        for server in servers:
-            api.nova.flavor_get(IsA(http.HttpRequest), server.flavor["id"]). \
-                AndRaise(self.exceptions.nova)
-        self.mox.ReplayAll()
+        self.mock_image_list_detailed.return_value = (images, False, False)
+        self.mock_flavor_list.return_value = flavors
+        self.mock_server_list.return_value = [servers, False]
+        self.mock_extension_supported.return_value = True
+        self.mock_tenant_list.return_value = [tenants, False]
+        self.mock_flavor_get.side_effect = self.exceptions.nova
 
         res = self.client.get(INDEX_URL)
         instances = res.context['table'].data
@@ -136,6 +209,14 @@ class InstanceViewTest(test.BaseAdminViewTests):
         self.assertMessageCount(res, error=1)
         self.assertItemsEqual(instances, servers)
 
+        search_opts = {'marker': None, 'paginate': True, 'all_tenants': True}
+        self.mock_server_list.assert_called_once_with(
+            test.IsHttpRequest(), search_opts=search_opts)
+        self.assertItemsEqual(
+            [mock.call(test.IsHttpRequest(), server.flavor['id'])
+             for server in servers],
+            self.mock_flavor_get.call_args_list)
+
     @test.create_stubs({
         api.nova: ('server_list', 'flavor_list',),
         api.keystone: ('tenant_list',),
@@ -17,6 +17,10 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import collections
+import functools
+import logging
+
 import futurist
 
 from django.conf import settings
@@ -27,6 +31,7 @@ from django.utils.translation import ugettext_lazy as _
 from horizon import exceptions
 from horizon import forms
 from horizon import tables
+from horizon.utils import functions
 from horizon.utils import memoized
 
 from openstack_dashboard import api
@@ -36,11 +41,16 @@ from openstack_dashboard.dashboards.admin.instances \
 from openstack_dashboard.dashboards.admin.instances \
     import tables as project_tables
 from openstack_dashboard.dashboards.admin.instances import tabs
+from openstack_dashboard.dashboards.project.instances \
+    import utils as instance_utils
 from openstack_dashboard.dashboards.project.instances import views
 from openstack_dashboard.dashboards.project.instances.workflows \
     import update_instance
 
 
+LOG = logging.getLogger(__name__)
+
+
 # re-use console from project.instances.views to make reflection work
 def console(args, **kvargs):
     return views.console(args, **kvargs)
@@ -66,6 +76,54 @@ def mks(args, **kvargs):
     return views.mks(args, **kvargs)
 
 
+# Lightweight representation of the projects and images the instances are
+# correlated with. Only their names are needed on the instances page.
+NamedResource = collections.namedtuple('NamedResource', ['id', 'name'])
+
+
+# NOTE: Listing all the projects and images of a large cloud can cost more
+# than the instance list itself. The names rarely change, so they are shared
+# between requests (if MEMOIZED_SHARED_CACHE enables a backend) and served
+# stale while being refreshed in the background.
+@memoized.memoized_shared('keystone', scope='domain', timeout=300,
+                          stale_timeout=3600)
+def get_project_names(request):
+    projects, __ = api.keystone.tenant_list(request)
+    return dict((project.id, project.name) for project in projects)
+
+
+@memoized.memoized_shared('glance', scope='project', timeout=300,
+                          stale_timeout=3600)
+def get_image_names(request):
+    images = api.glance.image_list_detailed(request)[0]
+    return dict((image.id, image.name) for image in images)
+
+
+# Projects and images missing from the lists above, usually because they
+# were deleted, are looked up one by one. Failed lookups return None and are
+# cached as well, so that they are not retried on every page.
+@memoized.memoized_shared('keystone', scope='domain', timeout=300)
+def get_project_name(request, project_id):
+    try:
+        return api.keystone.tenant_get(request, project_id).name
+    except Exception:
+        LOG.info("Unable to retrieve project %s.", project_id)
+        return None
+
+
+@memoized.memoized_shared('glance', scope='project', timeout=300)
+def get_image_name(request, image_id):
+    try:
+        return api.glance.image_get(request, image_id).name
+    except Exception:
+        LOG.info("Unable to retrieve image %s.", image_id)
+        return None
+
+
+# Maximum number of projects and images looked up at once.
+NAME_GET_MAX_WORKERS = 10
+
+
 class AdminUpdateView(views.UpdateView):
     workflow_class = update_instance.AdminUpdateInstance
     success_url = reverse_lazy("horizon:admin:instances:index")
@@ -113,9 +171,9 @@ class AdminIndexView(tables.DataTableView):
         def _task_get_tenants():
             # Gather our tenants to correlate against IDs
             try:
-                tmp_tenants, __ = api.keystone.tenant_list(self.request)
-                tenants.extend(tmp_tenants)
-                tenant_dict.update([(t.id, t) for t in tenants])
+                tenant_dict.update(get_project_names(self.request))
+                tenants.extend(NamedResource(*item)
+                               for item in tenant_dict.items())
             except Exception:
                 msg = _('Unable to retrieve instance project information.')
                 exceptions.handle(self.request, msg)
@@ -123,9 +181,9 @@ class AdminIndexView(tables.DataTableView):
         def _task_get_images():
             # Gather our images to correlate againts IDs
             try:
-                tmp_images = api.glance.image_list_detailed(self.request)[0]
-                images.extend(tmp_images)
-                image_map.update([(image.id, image) for image in images])
+                image_map.update(get_image_names(self.request))
+                images.extend(NamedResource(*item)
+                              for item in image_map.items())
             except Exception:
                 msg = _("Unable to retrieve image list.")
                 exceptions.handle(self.request, msg)
@@ -171,33 +229,56 @@ class AdminIndexView(tables.DataTableView):
 
         _task_get_instances()
 
-        # Loop through instances to get image, flavor and tenant info.
+        self._fetch_missing_names(instances, tenant_dict, image_map)
+        instance_utils.resolve_flavors(
+            self.request, instances, full_flavors,
+            error_message=_('Unable to retrieve instance size information.'))
+
+        # Loop through instances to get image and tenant info.
         for inst in instances:
             if hasattr(inst, 'image') and isinstance(inst.image, dict):
-                if inst.image.get('id') in image_map:
-                    inst.image = image_map[inst.image.get('id')]
-                # In case image not found in image_map, set name to empty
+                # In case image not found in image_map, set name to "-"
                 # to avoid fallback API call to Glance in api/nova.py
                 # until the call is deprecated in api itself
-                else:
-                    inst.image['name'] = _("-")
+                inst.image['name'] = image_map.get(inst.image.get('id'),
+                                                   _("-"))
 
-            flavor_id = inst.flavor["id"]
-            try:
-                if flavor_id in full_flavors:
-                    inst.full_flavor = full_flavors[flavor_id]
-                else:
-                    # If the flavor_id is not in full_flavors list,
-                    # gets it via nova api.
-                    inst.full_flavor = api.nova.flavor_get(
-                        self.request, flavor_id)
-            except Exception:
-                msg = _('Unable to retrieve instance size information.')
-                exceptions.handle(self.request, msg)
-            tenant = tenant_dict.get(inst.tenant_id, None)
-            inst.tenant_name = getattr(tenant, "name", None)
+            tenant_name = tenant_dict.get(inst.tenant_id, None)
+            inst.tenant_name = tenant_name
         return instances
 
+    def _fetch_missing_names(self, instances, tenant_dict, image_map):
+        """Fetch projects and images missing from the correlation data.
+
+        The shared project and image names may be older than the instances,
+        so the IDs missing from them are looked up concurrently, once per ID,
+        through :func:`get_project_name` and :func:`get_image_name`. The IDs
+        which can not be found are left out and displayed as "-". Nothing is
+        fetched if the whole list could not be retrieved.
+        """
+        lookups = []
+        if tenant_dict:
+            missing = set(inst.tenant_id for inst in instances
+                          if inst.tenant_id not in tenant_dict)
+            lookups.extend((tenant_dict, get_project_name, tenant_id)
+                           for tenant_id in missing)
+        if image_map:
+            missing = set(inst.image.get('id') for inst in instances
+                          if isinstance(getattr(inst, 'image', None), dict) and
+                          inst.image.get('id') not in image_map)
+            missing.discard(None)
+            lookups.extend((image_map, get_image_name, image_id)
+                           for image_id in missing)
+        if not lookups:
+            return
+        names = functions.call_concurrently(
+            [functools.partial(get_name, self.request, resource_id)
+             for __, get_name, resource_id in lookups],
+            NAME_GET_MAX_WORKERS)
+        for (names_map, __, resource_id), name in zip(lookups, names):
+            if name is not None:
+                names_map[resource_id] = name
+
 
 class LiveMigrateView(forms.ModalFormView):
     form_class = project_forms.LiveMigrateForm
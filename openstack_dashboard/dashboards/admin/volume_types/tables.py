@@ -180,13 +180,8 @@ def get_volume_type_encryption_link(volume_type):
                        kwargs={'volume_type_id': volume_type.id})
 
 
-class VolumeTypesFilterAction(tables.FilterAction):
-
-    def filter(self, table, volume_types, filter_string):
-        """Naive case-insensitive search."""
-        query = filter_string.lower()
-        return [volume_type for volume_type in volume_types
-                if query in volume_type.name.lower()]
+class VolumeTypesFilterAction(tables.NameFilterAction):
+    pass
 
 
 class UpdateRow(tables.Row):
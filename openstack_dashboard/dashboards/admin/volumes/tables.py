@@ -92,6 +92,10 @@ class UpdateVolumeStatusAction(tables.LinkAction):
                      "volume_extension:volume_admin_actions:reset_status"),)
 
 
+class UpdateRow(volumes_tables.UpdateRow):
+    batch_search_opts = {'all_tenants': 1}
+
+
 class AttachmentColumn(volumes_tables.AttachmentColumn):
     instance_detail_url = "horizon:admin:instances:detail"
 
@@ -110,7 +114,7 @@ class VolumesTable(volumes_tables.VolumesTable):
         name = "volumes"
         verbose_name = _("Volumes")
         status_columns = ["status"]
-        row_class = volumes_tables.UpdateRow
+        row_class = UpdateRow
         table_actions = (ManageVolumeAction,
                          volumes_tables.DeleteVolume,
                          VolumesFilterAction)
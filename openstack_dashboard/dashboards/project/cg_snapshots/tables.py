@@ -60,13 +60,8 @@ class UpdateRow(tables.Row):
         return cg_snapshot
 
 
-class VolumeCGSnapshotsFilterAction(tables.FilterAction):
-
-    def filter(self, table, cg_snapshots, filter_string):
-        """Naive case-insensitive search."""
-        query = filter_string.lower()
-        return [cg_snapshot for cg_snapshot in cg_snapshots
-                if query in cg_snapshot.name.lower()]
+class VolumeCGSnapshotsFilterAction(tables.NameFilterAction):
+    pass
 
 
 class CGSnapshotsTable(tables.DataTable):
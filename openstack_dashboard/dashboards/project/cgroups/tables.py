@@ -108,13 +108,8 @@ class UpdateRow(tables.Row):
         return cgroup
 
 
-class VolumeCGroupsFilterAction(tables.FilterAction):
-
-    def filter(self, table, cgroups, filter_string):
-        """Naive case-insensitive search."""
-        query = filter_string.lower()
-        return [cgroup for cgroup in cgroups
-                if query in cgroup.name.lower()]
+class VolumeCGroupsFilterAction(tables.NameFilterAction):
+    pass
 
 
 def get_volume_types(cgroup):
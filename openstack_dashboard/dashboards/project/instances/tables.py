@@ -74,6 +74,11 @@ SHELVE = 0
 UNSHELVE = 1
 
 
+# Datum attributes read by the allowed() methods of the row actions.
+TASK_STATE_ATTRS = ("status", "OS-EXT-STS:task_state")
+POWER_STATE_ATTRS = ("OS-EXT-STS:power_state", "OS-EXT-STS:task_state")
+
+
 def is_deleting(instance):
     task_state = getattr(instance, "OS-EXT-STS:task_state", None)
     if not task_state:
@@ -83,7 +88,9 @@ def is_deleting(instance):
 
 class DeleteInstance(policy.PolicyTargetMixin, tables.DeleteAction):
     policy_rules = (("compute", "os_compute_api:servers:delete"),)
+    allowed_datum_attrs = TASK_STATE_ATTRS
     help_text = _("Deleted instances are not recoverable.")
+    action_max_workers = 4
 
     @staticmethod
     def action_present(count):
@@ -115,6 +122,7 @@ class RebootInstance(policy.PolicyTargetMixin, tables.BatchAction):
     name = "reboot"
     classes = ('btn-reboot',)
     policy_rules = (("compute", "os_compute_api:servers:reboot"),)
+    allowed_datum_attrs = TASK_STATE_ATTRS
     help_text = _("Restarted instances will lose any data"
                   " not saved in persistent storage.")
     action_type = "danger"
@@ -449,6 +457,7 @@ class EditInstance(policy.PolicyTargetMixin, tables.LinkAction):
     classes = ("ajax-modal",)
     icon = "pencil"
     policy_rules = (("compute", "os_compute_api:servers:update"),)
+    allowed_datum_attrs = ("OS-EXT-STS:task_state",)
 
     def get_link_url(self, project):
         return self._get_link_url(project, 'instance_info')
@@ -468,6 +477,7 @@ class EditInstance(policy.PolicyTargetMixin, tables.LinkAction):
 class EditInstanceSecurityGroups(EditInstance):
     name = "edit_secgroups"
     verbose_name = _("Edit Security Groups")
+    allowed_datum_attrs = TASK_STATE_ATTRS + ("tenant_id",)
 
     def get_link_url(self, project):
         return self._get_link_url(project, 'update_security_groups')
@@ -487,6 +497,7 @@ class CreateSnapshot(policy.PolicyTargetMixin, tables.LinkAction):
     classes = ("ajax-modal",)
     icon = "camera"
     policy_rules = (("compute", "os_compute_api:snapshot"),)
+    allowed_datum_attrs = TASK_STATE_ATTRS
 
     def allowed(self, request, instance=None):
         return instance.status in SNAPSHOT_READY_STATES \
@@ -499,6 +510,7 @@ class ConsoleLink(policy.PolicyTargetMixin, tables.LinkAction):
     url = "horizon:project:instances:detail"
     classes = ("btn-console",)
     policy_rules = (("compute", "os_compute_api:os-consoles:index"),)
+    allowed_datum_attrs = TASK_STATE_ATTRS
 
     def allowed(self, request, instance=None):
         # We check if ConsoleLink is allowed only if settings.CONSOLE_TYPE is
@@ -519,6 +531,7 @@ class LogLink(policy.PolicyTargetMixin, tables.LinkAction):
     url = "horizon:project:instances:detail"
     classes = ("btn-log",)
     policy_rules = (("compute", "os_compute_api:os-console-output"),)
+    allowed_datum_attrs = TASK_STATE_ATTRS
 
     def allowed(self, request, instance=None):
         return instance.status in ACTIVE_STATES and not is_deleting(instance)
@@ -536,6 +549,7 @@ class ResizeLink(policy.PolicyTargetMixin, tables.LinkAction):
     url = "horizon:project:instances:resize"
     classes = ("ajax-modal", "btn-resize")
     policy_rules = (("compute", "os_compute_api:servers:resize"),)
+    allowed_datum_attrs = TASK_STATE_ATTRS
     action_type = "danger"
 
     def get_link_url(self, project):
@@ -560,6 +574,7 @@ class ConfirmResize(policy.PolicyTargetMixin, tables.Action):
     verbose_name = _("Confirm Resize/Migrate")
     classes = ("btn-confirm", "btn-action-required")
     policy_rules = (("compute", "os_compute_api:servers:confirm_resize"),)
+    allowed_datum_attrs = ("status",)
 
     def allowed(self, request, instance):
         return instance.status == 'VERIFY_RESIZE'
@@ -573,6 +588,7 @@ class RevertResize(policy.PolicyTargetMixin, tables.Action):
     verbose_name = _("Revert Resize/Migrate")
     classes = ("btn-revert", "btn-action-required")
     policy_rules = (("compute", "os_compute_api:servers:revert_resize"),)
+    allowed_datum_attrs = ("status",)
 
     def allowed(self, request, instance):
         return instance.status == 'VERIFY_RESIZE'
@@ -587,6 +603,7 @@ class RebuildInstance(policy.PolicyTargetMixin, tables.LinkAction):
     classes = ("btn-rebuild", "ajax-modal")
     url = "horizon:project:instances:rebuild"
     policy_rules = (("compute", "os_compute_api:servers:rebuild"),)
+    allowed_datum_attrs = TASK_STATE_ATTRS
     action_type = "danger"
 
     def allowed(self, request, instance):
@@ -753,6 +770,9 @@ def get_instance_error(instance):
 
 class UpdateRow(tables.Row):
     ajax = True
+    ajax_batch = True
+    # Search options of the server list used to update several rows at once.
+    batch_search_opts = {}
 
     def get_data(self, request, instance_id):
         instance = api.nova.server_get(request, instance_id)
@@ -776,11 +796,71 @@ class UpdateRow(tables.Row):
             messages.error(request, error)
         return instance
 
+    def get_data_list(self, request, instance_ids):
+        if len(instance_ids) <= self.ajax_batch_list_threshold:
+            return super(UpdateRow, self).get_data_list(request, instance_ids)
+        # Instances in transition are usually the most recently created
+        # ones, so one call for the first page of the server list covers
+        # them. The others are fetched one by one.
+        search_opts = dict(self.batch_search_opts, paginate=True)
+        try:
+            servers = api.nova.server_list(request,
+                                           search_opts=search_opts)[0]
+        except Exception:
+            servers = []
+            exceptions.handle(request, ignore=True)
+        servers = dict((server.id, server) for server in servers)
+
+        instances = []
+        for instance_id in instance_ids:
+            instance = servers.get(instance_id)
+            if instance is None:
+                try:
+                    instance = api.nova.server_get(request, instance_id)
+                except Exception:
+                    error = exceptions.handle(request, ignore=True)
+                    if error is exceptions.NotFound:
+                        continue
+                    raise
+            instances.append(instance)
+
+        try:
+            flavors = dict((str(flavor.id), flavor)
+                           for flavor in api.nova.flavor_list(request))
+        except Exception:
+            flavors = {}
+            exceptions.handle(request, ignore=True)
+        for instance in instances:
+            flavor_id = str(instance.flavor["id"])
+            try:
+                instance.full_flavor = (flavors.get(flavor_id) or
+                                        api.nova.flavor_get(request,
+                                                            flavor_id))
+            except Exception:
+                exceptions.handle(request,
+                                  _('Unable to retrieve flavor information '
+                                    'for instance "%s".') % instance.id,
+                                  ignore=True)
+        try:
+            api.network.servers_update_addresses(request, instances)
+        except Exception:
+            exceptions.handle(request,
+                              _('Unable to retrieve Network information '
+                                'for instances.'),
+                              ignore=True)
+        for instance in instances:
+            error = get_instance_error(instance)
+            if error:
+                messages.error(request, error)
+        return instances
+
 
 class StartInstance(policy.PolicyTargetMixin, tables.BatchAction):
     name = "start"
     classes = ('btn-confirm',)
     policy_rules = (("compute", "os_compute_api:servers:start"),)
+    allowed_datum_attrs = ("status",)
+    action_max_workers = 4
 
     @staticmethod
     def action_present(count):
@@ -809,7 +889,9 @@ class StartInstance(policy.PolicyTargetMixin, tables.BatchAction):
 class StopInstance(policy.PolicyTargetMixin, tables.BatchAction):
     name = "stop"
     policy_rules = (("compute", "os_compute_api:servers:stop"),)
+    allowed_datum_attrs = POWER_STATE_ATTRS
     help_text = _("The instance(s) will be shut off.")
+    action_max_workers = 4
     action_type = "danger"
 
     @staticmethod
@@ -842,6 +924,7 @@ class StopInstance(policy.PolicyTargetMixin, tables.BatchAction):
 class LockInstance(policy.PolicyTargetMixin, tables.BatchAction):
     name = "lock"
     policy_rules = (("compute", "os_compute_api:os-lock-server:lock"),)
+    allowed_datum_attrs = ("locked",)
 
     @staticmethod
     def action_present(count):
@@ -876,6 +959,7 @@ class LockInstance(policy.PolicyTargetMixin, tables.BatchAction):
 class UnlockInstance(policy.PolicyTargetMixin, tables.BatchAction):
     name = "unlock"
     policy_rules = (("compute", "os_compute_api:os-lock-server:unlock"),)
+    allowed_datum_attrs = ("locked",)
 
     @staticmethod
     def action_present(count):
@@ -913,6 +997,7 @@ class AttachVolume(tables.LinkAction):
     url = "horizon:project:instances:attach_volume"
     classes = ("ajax-modal",)
     policy_rules = (("compute", "os_compute_api:servers:attach_volume"),)
+    allowed_datum_attrs = TASK_STATE_ATTRS
 
     # This action should be disabled if the instance
     # is not active, or the instance is being deleted
@@ -944,6 +1029,7 @@ class AttachInterface(policy.PolicyTargetMixin, tables.LinkAction):
     classes = ("btn-confirm", "ajax-modal")
     url = "horizon:project:instances:attach_interface"
     policy_rules = (("compute", "os_compute_api:os-attach-interfaces"),)
+    allowed_datum_attrs = TASK_STATE_ATTRS
 
     def allowed(self, request, instance):
         return ((instance.status in ACTIVE_STATES
@@ -1271,6 +1357,7 @@ class InstancesTable(tables.DataTable):
         verbose_name = _("Instances")
         status_columns = ["status", "task"]
         row_class = UpdateRow
+        cache_row_actions = True
         table_actions_menu = (StartInstance, StopInstance, SoftRebootInstance)
         launch_actions = ()
         if getattr(settings, 'LAUNCH_INSTANCE_LEGACY_ENABLED', False):
@@ -30,6 +30,7 @@ from django.test.utils import override_settings
 from django.urls import reverse
 from django.utils.http import urlencode
 import mock
+from novaclient import exceptions as nova_exceptions
 import six
 
 from horizon import exceptions
@@ -40,6 +41,8 @@ from openstack_dashboard.api import cinder
 from openstack_dashboard.dashboards.project.instances import console
 from openstack_dashboard.dashboards.project.instances import tables
 from openstack_dashboard.dashboards.project.instances import tabs
+from openstack_dashboard.dashboards.project.instances \
+    import utils as instance_utils
 from openstack_dashboard.dashboards.project.instances import workflows
 from openstack_dashboard.test import helpers
 from openstack_dashboard.usage import quotas
@@ -109,20 +112,17 @@ class InstanceTableTestMixin(object):
         self.mock_network_list.side_effect = [
             self.networks.list()[:1],
             self.networks.list()[1:],
-            self.networks.list()[:1],
-            self.networks.list()[1:],
         ]
         self.mock_port_list_with_trunk_types.return_value = self.ports.list()
 
     def _check_neutron_network_and_port_list(self):
-        self.assertEqual(4, self.mock_network_list.call_count)
+        # network_list_for_tenant() is called twice with the same arguments
+        # during the request, the second call is coalesced.
+        self.assertEqual(2, self.mock_network_list.call_count)
         self.mock_network_list.assert_has_calls([
             mock.call(helpers.IsHttpRequest(), tenant_id=self.tenant.id,
                       shared=False),
             mock.call(helpers.IsHttpRequest(), shared=True),
-            mock.call(helpers.IsHttpRequest(), tenant_id=self.tenant.id,
-                      shared=False),
-            mock.call(helpers.IsHttpRequest(), shared=True),
         ])
         self.assertEqual(len(self.networks.list()),
                          self.mock_port_list_with_trunk_types.call_count)
@@ -204,9 +204,11 @@ class InstanceTableTests(InstanceTestBase, InstanceTableTestMixin):
 
     def _check_get_index(self, use_servers_update_address=True,
                          multiplier=4):
-        expected_extension_count = {'AdminActions': 4 * multiplier,
+        # The lock and unlock actions are checked once per group of
+        # instances sharing a policy target; the test servers form two.
+        expected_extension_count = {'AdminActions': 2 * multiplier + 4,
                                     'Shelve': 1 * multiplier}
-        expected_feature_count = 2 * multiplier
+        expected_feature_count = 4
         expected_fip_supported_count = 2 * multiplier
         expected_simple_fip_supported = 1 * multiplier
 
@@ -309,6 +311,7 @@ class InstanceTableTests(InstanceTestBase, InstanceTableTestMixin):
         self.mock_server_list.return_value = [servers, False]
         self.mock_servers_update_addresses.return_value = None
         self.mock_flavor_list.side_effect = self.exceptions.nova
+        self.mock_flavor_get.return_value = self.flavors.first()
         self.mock_image_list_detailed.return_value = (self.images.list(),
                                                       False, False)
         self.mock_tenant_absolute_limits.return_value = self.limits['absolute']
@@ -321,11 +324,14 @@ class InstanceTableTests(InstanceTestBase, InstanceTableTestMixin):
         instances = res.context['instances_table'].data
 
         self.assertItemsEqual(instances, self.servers.list())
+        # All the servers use the same flavor, it is retrieved only once.
+        self.mock_flavor_get.assert_called_once_with(
+            helpers.IsHttpRequest(), self.flavors.first().id)
 
-        self._check_extension_supported({'AdminActions': 16,
+        self._check_extension_supported({'AdminActions': 12,
                                          'Shelve': 4})
         self.assert_mock_multiple_calls_with_same_arguments(
-            self.mock_is_feature_available, 8,
+            self.mock_is_feature_available, 4,
             mock.call(helpers.IsHttpRequest(), 'locked_attribute'))
         self.mock_server_list.assert_called_once_with(helpers.IsHttpRequest(),
                                                       search_opts=search_opts)
@@ -378,10 +384,10 @@ class InstanceTableTests(InstanceTestBase, InstanceTableTestMixin):
         self.assertEqual(len(instances), len(servers))
         self.assertContains(res, "(not found)")
 
-        self._check_extension_supported({'AdminActions': 16,
+        self._check_extension_supported({'AdminActions': 12,
                                          'Shelve': 4})
         self.assert_mock_multiple_calls_with_same_arguments(
-            self.mock_is_feature_available, 8,
+            self.mock_is_feature_available, 4,
             mock.call(helpers.IsHttpRequest(), 'locked_attribute'))
         self.mock_flavor_list.assert_called_once_with(helpers.IsHttpRequest())
         self.mock_image_list_detailed.assert_called_once_with(
@@ -1728,10 +1734,10 @@ class InstanceTests(InstanceTestBase):
             else:
                 self.assertNotContains(res, _action_id)
 
-        self._check_extension_supported({'AdminActions': 16,
+        self._check_extension_supported({'AdminActions': 12,
                                          'Shelve': 4})
         self.assert_mock_multiple_calls_with_same_arguments(
-            self.mock_is_feature_available, 8,
+            self.mock_is_feature_available, 4,
             mock.call(helpers.IsHttpRequest(), 'locked_attribute'))
         self.mock_flavor_list.assert_called_once_with(helpers.IsHttpRequest())
         self.mock_image_list_detailed.assert_called_once_with(
@@ -1947,8 +1953,6 @@ class InstanceLaunchInstanceTests(InstanceTestBase,
         self.mock_network_list.side_effect = [
             self.networks.list()[:1],
             [] if only_one_network else self.networks.list()[1:],
-            self.networks.list()[:1],
-            self.networks.list()[1:],
         ]
         self.mock_port_list_with_trunk_types.return_value = self.ports.list()
         self.mock_server_group_list.return_value = self.server_groups.list()
@@ -2071,16 +2075,15 @@ class InstanceLaunchInstanceTests(InstanceTestBase,
             mock.call(helpers.IsHttpRequest(),
                       tenant_id=self.tenant.id, shared=False),
             mock.call(helpers.IsHttpRequest(), shared=True),
-            mock.call(helpers.IsHttpRequest(),
-                      tenant_id=self.tenant.id, shared=False),
-            mock.call(helpers.IsHttpRequest(), shared=True),
         ])
-        self.assertEqual(4, self.mock_network_list.call_count)
+        self.assertEqual(2, self.mock_network_list.call_count)
+        networks = (self.networks.list()[:1] if only_one_network
+                    else self.networks.list())
         self.mock_port_list_with_trunk_types.assert_has_calls(
             [mock.call(helpers.IsHttpRequest(),
                        network_id=net.id, tenant_id=self.tenant.id)
-             for net in self.networks.list()])
-        self.assertEqual(len(self.networks.list()),
+             for net in networks])
+        self.assertEqual(len(networks),
                          self.mock_port_list_with_trunk_types.call_count)
         self.mock_server_group_list.assert_called_once_with(
             helpers.IsHttpRequest())
@@ -2190,8 +2193,6 @@ class InstanceLaunchInstanceTests(InstanceTestBase,
         self.mock_network_list.side_effect = [
             self.networks.list()[:1],
             [] if only_one_network else self.networks.list()[1:],
-            self.networks.list()[:1],
-            self.networks.list()[1:],
         ]
         self.mock_port_list_with_trunk_types.return_value = self.ports.list()
         self.mock_server_group_list.return_value = self.server_groups.list()
@@ -2235,11 +2236,8 @@ class InstanceLaunchInstanceTests(InstanceTestBase,
             mock.call(helpers.IsHttpRequest(),
                       tenant_id=self.tenant.id, shared=False),
             mock.call(helpers.IsHttpRequest(), shared=True),
-            mock.call(helpers.IsHttpRequest(),
-                      tenant_id=self.tenant.id, shared=False),
-            mock.call(helpers.IsHttpRequest(), shared=True),
         ])
-        self.assertEqual(4, self.mock_network_list.call_count)
+        self.assertEqual(2, self.mock_network_list.call_count)
         self.mock_port_list_with_trunk_types.assert_has_calls(
             [mock.call(helpers.IsHttpRequest(),
                        network_id=net.id, tenant_id=self.tenant.id)
@@ -3558,7 +3556,7 @@ class InstanceLaunchInstanceTests(InstanceTestBase,
                                    'visibility': 'shared'})
             ] * 3
         )
-        self.assertEqual(4, self.mock_network_list.call_count)
+        self.assertEqual(2, self.mock_network_list.call_count)
         self.mock_network_list.assert_has_calls([
             mock.call(
                 helpers.IsHttpRequest(),
@@ -3567,13 +3565,6 @@ class InstanceLaunchInstanceTests(InstanceTestBase,
             mock.call(
                 helpers.IsHttpRequest(),
                 shared=True),
-            mock.call(
-                helpers.IsHttpRequest(),
-                tenant_id=self.tenant.id,
-                shared=False),
-            mock.call(
-                helpers.IsHttpRequest(),
-                shared=True),
         ])
         self.assertEqual(len(self.networks.list()),
                          self.mock_port_list_with_trunk_types.call_count)
@@ -3794,10 +3785,10 @@ class InstanceLaunchInstanceTests(InstanceTestBase,
         self.assertEqual((('compute', 'os_compute_api:servers:create'),),
                          launch_action.policy_rules)
 
-        self._check_extension_supported({'AdminActions': 16,
+        self._check_extension_supported({'AdminActions': 12,
                                          'Shelve': 4})
         self.assert_mock_multiple_calls_with_same_arguments(
-            self.mock_is_feature_available, 8,
+            self.mock_is_feature_available, 4,
             mock.call(helpers.IsHttpRequest(), 'locked_attribute'))
         self.mock_flavor_list.assert_called_once_with(helpers.IsHttpRequest())
         self.mock_image_list_detailed.assert_called_once_with(
@@ -3853,10 +3844,10 @@ class InstanceLaunchInstanceTests(InstanceTestBase,
         self.assertEqual('Launch Instance (Quota exceeded)',
                          six.text_type(launch_action.verbose_name))
 
-        self._check_extension_supported({'AdminActions': 16,
+        self._check_extension_supported({'AdminActions': 12,
                                          'Shelve': 4})
         self.assert_mock_multiple_calls_with_same_arguments(
-            self.mock_is_feature_available, 8,
+            self.mock_is_feature_available, 4,
             mock.call(helpers.IsHttpRequest(), 'locked_attribute'))
         self.mock_flavor_list.assert_called_once_with(helpers.IsHttpRequest())
         self.mock_image_list_detailed.assert_called_once_with(
@@ -4027,10 +4018,10 @@ class InstanceTests2(InstanceTestBase, InstanceTableTestMixin):
         self.assertContains(res, "instances__confirm")
         self.assertContains(res, "instances__revert")
 
-        self._check_extension_supported({'AdminActions': 16,
+        self._check_extension_supported({'AdminActions': 12,
                                          'Shelve': 4})
         self.assert_mock_multiple_calls_with_same_arguments(
-            self.mock_is_feature_available, 8,
+            self.mock_is_feature_available, 4,
             mock.call(helpers.IsHttpRequest(), 'locked_attribute'))
         self.mock_flavor_list.assert_called_once_with(helpers.IsHttpRequest())
         self.mock_image_list_detailed.assert_called_once_with(
@@ -4531,10 +4522,10 @@ class InstanceTests2(InstanceTestBase, InstanceTableTestMixin):
         # ensure that marker object exists in form action
         self.assertContains(res, form_action, count=1)
 
-        self._check_extension_supported({'AdminActions': 12,
+        self._check_extension_supported({'AdminActions': 10,
                                          'Shelve': 3})
         self.assert_mock_multiple_calls_with_same_arguments(
-            self.mock_is_feature_available, 6,
+            self.mock_is_feature_available, 4,
             mock.call(helpers.IsHttpRequest(), 'locked_attribute'))
         self.assert_mock_multiple_calls_with_same_arguments(
             self.mock_flavor_list, 2,
@@ -4799,6 +4790,82 @@ class InstanceAjaxTests(helpers.TestCase, InstanceTestHelperMixin):
         self.mock_servers_update_addresses.assert_called_once_with(
             helpers.IsHttpRequest(), [server])
 
+    def _get_rows_update(self, obj_ids):
+        params = [('action', 'rows_update'), ('table', 'instances')]
+        params += [('obj_ids', obj_id) for obj_id in obj_ids]
+        res = self.client.get('?'.join((INDEX_URL, urlencode(params))),
+                              HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        return json.loads(res.content.decode('utf-8'))
+
+    @helpers.create_mocks({api.nova: ("server_list",
+                                      "server_get",
+                                      "flavor_list",
+                                      "extension_supported",
+                                      "is_feature_available"),
+                           api.network: ('servers_update_addresses',)})
+    def test_rows_update(self):
+        servers = self.servers.list()[:3]
+        missing_id = 'fd1b8a8e-1a1b-4a4e-9c3b-b16e4a2b3c4d'
+
+        self._mock_extension_supported({'AdminActions': True,
+                                        'Shelve': True})
+        self.mock_is_feature_available.return_value = True
+        self.mock_server_list.return_value = [servers[:2], True]
+        not_found = nova_exceptions.NotFound(404)
+        not_found.silence_logging = True
+        self.mock_server_get.side_effect = [servers[2], not_found]
+        self.mock_flavor_list.return_value = self.flavors.list()
+        self.mock_servers_update_addresses.return_value = None
+
+        # More rows than ajax_batch_list_threshold are listed at once.
+        content = self._get_rows_update(
+            [server.id for server in servers] + [missing_id])
+        self.assertEqual(sorted(server.id for server in servers),
+                         sorted(content['rows']))
+        self.assertIn(servers[2].name, content['rows'][servers[2].id])
+        self.assertEqual([missing_id], content['missing'])
+
+        self.mock_server_list.assert_called_once_with(
+            helpers.IsHttpRequest(), search_opts={'paginate': True})
+        self.assertEqual(
+            [mock.call(helpers.IsHttpRequest(), servers[2].id),
+             mock.call(helpers.IsHttpRequest(), missing_id)],
+            self.mock_server_get.call_args_list)
+        self.mock_flavor_list.assert_called_once_with(helpers.IsHttpRequest())
+        self.mock_servers_update_addresses.assert_called_once_with(
+            helpers.IsHttpRequest(), servers)
+
+    @helpers.create_mocks({api.nova: ("server_list",
+                                      "server_get",
+                                      "flavor_get",
+                                      "flavor_list",
+                                      "extension_supported",
+                                      "is_feature_available"),
+                           api.network: ('servers_update_addresses',)})
+    def test_rows_update_few_rows(self):
+        servers = self.servers.list()[:2]
+
+        self._mock_extension_supported({'AdminActions': True,
+                                        'Shelve': True})
+        self.mock_is_feature_available.return_value = True
+        self.mock_server_get.side_effect = servers
+        self.mock_flavor_get.return_value = self.flavors.first()
+        self.mock_servers_update_addresses.return_value = None
+
+        # A few rows are fetched one by one, without listing the servers.
+        content = self._get_rows_update([server.id for server in servers])
+        self.assertEqual(sorted(server.id for server in servers),
+                         sorted(content['rows']))
+
+        self.assertFalse(self.mock_server_list.called)
+        self.assertFalse(self.mock_flavor_list.called)
+        self.assertEqual(
+            [mock.call(helpers.IsHttpRequest(), server.id)
+             for server in servers],
+            self.mock_server_get.call_args_list)
+        self.assertEqual(2, self.mock_flavor_get.call_count)
+        self.assertEqual(2, self.mock_servers_update_addresses.call_count)
+
 
 class ConsoleManagerTests(helpers.ResetImageAPIVersionMixin, helpers.TestCase):
 
@@ -5113,3 +5180,48 @@ class ConsoleManagerTests(helpers.ResetImageAPIVersionMixin, helpers.TestCase):
                                                     device_id=server.id)
         self.mock_interface_detach.assert_called_once_with(
             helpers.IsHttpRequest(), server.id, port.id)
+
+
+class ResolveFlavorsTests(helpers.TestCase):
+
+    use_mox = False
+
+    @helpers.create_mocks({api.nova: ('flavor_get',)})
+    def test_resolve_flavors(self):
+        servers = self.servers.list()
+        flavor = self.flavors.list()[1]
+        servers[0].flavor['id'] = 'private'
+        self.mock_flavor_get.return_value = flavor
+        full_flavors = {self.flavors.first().id: self.flavors.first()}
+
+        instance_utils.resolve_flavors(self.request, servers, full_flavors)
+
+        self.mock_flavor_get.assert_called_once_with(self.request, 'private')
+        self.assertEqual(flavor, full_flavors['private'])
+        self.assertEqual(flavor, servers[0].full_flavor)
+        for server in servers[1:]:
+            self.assertEqual(self.flavors.first(), server.full_flavor)
+
+    @helpers.create_mocks({api.nova: ('flavor_get',)})
+    def test_resolve_flavors_embedded(self):
+        server = self.servers.first()
+        server.flavor = {'original_name': 'm1.embedded', 'vcpus': 2,
+                         'ram': 2048, 'disk': 20, 'ephemeral': 0,
+                         'swap': 0, 'extra_specs': {}}
+
+        instance_utils.resolve_flavors(self.request, [server], {})
+
+        self.mock_flavor_get.assert_not_called()
+        self.assertEqual('m1.embedded', server.full_flavor.name)
+        self.assertEqual(2048, server.full_flavor.ram)
+
+    @helpers.create_mocks({api.nova: ('flavor_get',)})
+    def test_resolve_flavors_exception(self):
+        server = self.servers.first()
+        self.mock_flavor_get.side_effect = self.exceptions.nova
+
+        instance_utils.resolve_flavors(self.request, [server], {})
+
+        self.mock_flavor_get.assert_called_once_with(self.request,
+                                                     server.flavor['id'])
+        self.assertFalse(hasattr(server, 'full_flavor'))
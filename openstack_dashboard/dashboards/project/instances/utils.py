@@ -15,14 +15,20 @@ from operator import itemgetter
 
 from django.conf import settings
 from django.utils.translation import ugettext_lazy as _
+import futurist
+from novaclient.v2 import flavors as nova_flavors
 import six
 
 from horizon import exceptions
+from horizon.utils import memoized
 
 from openstack_dashboard import api
 
 LOG = logging.getLogger(__name__)
 
+# Maximum number of flavors retrieved concurrently by resolve_flavors().
+FLAVOR_GET_MAX_WORKERS = 10
+
 
 def flavor_list(request):
     """Utility method to retrieve a list of flavors."""
@@ -65,6 +71,71 @@ def sort_flavor_list(request, flavors):
         return []
 
 
+@memoized.memoized
+def _flavor_get(request, flavor_id):
+    # Cached for the lifetime of the request, so that a flavor is retrieved
+    # only once however many instances use it.
+    return api.nova.flavor_get(request, flavor_id)
+
+
+def _get_embedded_flavor(instance):
+    """Returns the flavor embedded in the server, if any.
+
+    Starting with the nova API microversion 2.47, servers contain the details
+    of their flavor instead of its ID only.
+    """
+    info = getattr(instance, 'flavor', None)
+    if not isinstance(info, dict) or 'original_name' not in info:
+        return None
+    info = dict(info)
+    info['name'] = info.pop('original_name')
+    info.setdefault('id', info['name'])
+    return nova_flavors.Flavor(nova_flavors.FlavorManager(None), info,
+                               loaded=True)
+
+
+def resolve_flavors(request, instances, full_flavors, error_message=None):
+    """Sets the full_flavor attribute of the instances.
+
+    ``full_flavors`` maps the IDs of the flavors already known, usually from
+    the flavor list, to the flavors. Flavors embedded in the servers are used
+    as they are. The other missing flavors, such as private or deleted ones,
+    are retrieved concurrently, once per flavor ID, and added to
+    ``full_flavors``.
+
+    If ``error_message`` is given, it is reported to the user when a flavor
+    can not be retrieved, otherwise the failure is only logged.
+    """
+    missing = set()
+    for instance in instances:
+        embedded = _get_embedded_flavor(instance)
+        if embedded is not None:
+            instance.full_flavor = embedded
+        elif instance.flavor['id'] not in full_flavors:
+            missing.add(instance.flavor['id'])
+
+    if missing:
+        max_workers = min(len(missing), FLAVOR_GET_MAX_WORKERS)
+        with futurist.ThreadPoolExecutor(max_workers=max_workers) as e:
+            futures = [(flavor_id, e.submit(_flavor_get, request, flavor_id))
+                       for flavor_id in missing]
+        for flavor_id, future in futures:
+            try:
+                full_flavors[flavor_id] = future.result()
+            except Exception:
+                if error_message:
+                    exceptions.handle(request, error_message)
+                else:
+                    LOG.info('Unable to retrieve flavor "%s".', flavor_id)
+
+    for instance in instances:
+        if hasattr(instance, 'full_flavor'):
+            continue
+        flavor_id = instance.flavor['id']
+        if flavor_id in full_flavors:
+            instance.full_flavor = full_flavors[flavor_id]
+
+
 def availability_zone_list(request):
     """Utility method to retrieve a list of availability zones."""
     try:
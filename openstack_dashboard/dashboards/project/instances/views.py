@@ -51,6 +51,8 @@ from openstack_dashboard.dashboards.project.instances \
     import tables as project_tables
 from openstack_dashboard.dashboards.project.instances \
     import tabs as project_tabs
+from openstack_dashboard.dashboards.project.instances \
+    import utils as instance_utils
 from openstack_dashboard.dashboards.project.instances \
     import workflows as project_workflows
 from openstack_dashboard.views import get_url_with_pagination
@@ -143,7 +145,9 @@ class IndexView(tables.DataTableView):
 
         _task_get_instances()
 
-        # Loop through instances to get flavor info.
+        instance_utils.resolve_flavors(self.request, instances, full_flavors)
+
+        # Loop through instances to get image and flavor info.
         for instance in instances:
             if hasattr(instance, 'image'):
                 # Instance from image returns dict
@@ -156,14 +160,11 @@ class IndexView(tables.DataTableView):
                     else:
                         instance.image['name'] = _("-")
 
-            flavor_id = instance.flavor["id"]
-            if flavor_id in full_flavors:
-                instance.full_flavor = full_flavors[flavor_id]
-            else:
-                # If the flavor_id is not in full_flavors list,
+            if not hasattr(instance, 'full_flavor'):
+                # If the flavor could not be retrieved,
                 # put info in the log file.
                 msg = ('Unable to retrieve flavor "%s" for instance "%s".'
-                       % (flavor_id, instance.id))
+                       % (instance.flavor.get('id'), instance.id))
                 LOG.info(msg)
 
         return instances
@@ -105,13 +105,8 @@ class CreateLinkNG(QuotaKeypairMixin, tables.LinkAction):
         return True
 
 
-class KeypairsFilterAction(tables.FilterAction):
-
-    def filter(self, table, keypairs, filter_string):
-        """Naive case-insensitive search."""
-        query = filter_string.lower()
-        return [keypair for keypair in keypairs
-                if query in keypair.name.lower()]
+class KeypairsFilterAction(tables.NameFilterAction):
+    pass
 
 
 class KeyPairsTable(tables.DataTable):
@@ -96,13 +96,8 @@ class ManageRules(policy.PolicyTargetMixin, tables.LinkAction):
     icon = "pencil"
 
 
-class SecurityGroupsFilterAction(tables.FilterAction):
-
-    def filter(self, table, security_groups, filter_string):
-        """Naive case-insensitive search."""
-        query = filter_string.lower()
-        return [security_group for security_group in security_groups
-                if query in security_group.name.lower()]
+class SecurityGroupsFilterAction(tables.NameFilterAction):
+    pass
 
 
 class SecurityGroupsTable(tables.DataTable):
@@ -174,13 +174,8 @@ class SnapshotVolumeNameColumn(tables.WrappingColumn):
             return reverse(self.link, args=(volume_id,))
 
 
-class VolumeSnapshotsFilterAction(tables.FilterAction):
-
-    def filter(self, table, snapshots, filter_string):
-        """Naive case-insensitive search."""
-        query = filter_string.lower()
-        return [snapshot for snapshot in snapshots
-                if query in snapshot.name.lower()]
+class VolumeSnapshotsFilterAction(tables.NameFilterAction):
+    pass
 
 
 class VolumeDetailsSnapshotsTable(volume_tables.VolumesTableBase):
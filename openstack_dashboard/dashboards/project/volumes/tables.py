@@ -110,6 +110,8 @@ class DeleteVolume(VolumePolicyTargetMixin, tables.DeleteAction):
         )
 
     policy_rules = (("volume", "volume:delete"),)
+    allowed_datum_attrs = ("status", "consistencygroup_id", "has_snapshot")
+    action_max_workers = 4
 
     def delete(self, request, obj_id):
         cinder.volume_delete(request, obj_id)
@@ -168,6 +170,7 @@ class ExtendVolume(VolumePolicyTargetMixin, tables.LinkAction):
     url = "horizon:project:volumes:extend"
     classes = ("ajax-modal", "btn-extend")
     policy_rules = (("volume", "volume:extend"),)
+    allowed_datum_attrs = ("status",)
 
     def allowed(self, request, volume=None):
         return volume.status == "available"
@@ -233,6 +236,7 @@ class CreateTransfer(VolumePolicyTargetMixin, tables.LinkAction):
     url = "horizon:project:volumes:create_transfer"
     classes = ("ajax-modal",)
     policy_rules = (("volume", "volume:create_transfer"),)
+    allowed_datum_attrs = ("status",)
 
     def allowed(self, request, volume=None):
         return volume.status == "available"
@@ -244,6 +248,7 @@ class CreateBackup(VolumePolicyTargetMixin, tables.LinkAction):
     url = "horizon:project:volumes:create_backup"
     classes = ("ajax-modal",)
     policy_rules = (("volume", "backup:create"),)
+    allowed_datum_attrs = ("status",)
 
     def allowed(self, request, volume=None):
         return (cinder.volume_backup_supported(request) and
@@ -258,6 +263,7 @@ class UploadToImage(VolumePolicyTargetMixin, tables.LinkAction):
     icon = "cloud-upload"
     policy_rules = (("volume",
                      "volume_extension:volume_actions:upload_image"),)
+    allowed_datum_attrs = ("status",)
 
     def allowed(self, request, volume=None):
         has_image_service_perm = \
@@ -274,6 +280,7 @@ class EditVolume(VolumePolicyTargetMixin, tables.LinkAction):
     classes = ("ajax-modal",)
     icon = "pencil"
     policy_rules = (("volume", "volume:update"),)
+    allowed_datum_attrs = ("status",)
 
     def allowed(self, request, volume=None):
         return volume.status in ("available", "in-use")
@@ -286,6 +293,7 @@ class RetypeVolume(VolumePolicyTargetMixin, tables.LinkAction):
     classes = ("ajax-modal",)
     icon = "pencil"
     policy_rules = (("volume", "volume:retype"),)
+    allowed_datum_attrs = ("status",)
 
     def allowed(self, request, volume=None):
         return volume.status in ("available", "in-use")
@@ -336,11 +344,42 @@ class DeleteTransfer(VolumePolicyTargetMixin, tables.Action):
 
 class UpdateRow(tables.Row):
     ajax = True
+    ajax_batch = True
+    # Search options of the volume list used to update several rows at once.
+    batch_search_opts = None
 
     def get_data(self, request, volume_id):
         volume = cinder.volume_get(request, volume_id)
         return volume
 
+    def get_data_list(self, request, volume_ids):
+        if len(volume_ids) <= self.ajax_batch_list_threshold:
+            return super(UpdateRow, self).get_data_list(request, volume_ids)
+        # Volumes in transition are usually the most recently created ones,
+        # so one call for the first page of the volume list covers them.
+        # The others are fetched one by one.
+        try:
+            volumes = cinder.volume_list_paged(
+                request, search_opts=self.batch_search_opts, paginate=True)[0]
+        except Exception:
+            volumes = []
+            exceptions.handle(request, ignore=True)
+        volumes = dict((volume.id, volume) for volume in volumes)
+
+        data = []
+        for volume_id in volume_ids:
+            volume = volumes.get(volume_id)
+            if volume is None:
+                try:
+                    volume = self.get_data(request, volume_id)
+                except Exception:
+                    error = exceptions.handle(request, ignore=True)
+                    if error is exceptions.NotFound:
+                        continue
+                    raise
+            data.append(volume)
+        return data
+
 
 def get_size(volume):
     return _("%sGiB") % volume.size
@@ -468,13 +507,8 @@ class VolumesTableBase(tables.DataTable):
         return obj.name
 
 
-class VolumesFilterAction(tables.FilterAction):
-
-    def filter(self, table, volumes, filter_string):
-        """Naive case-insensitive search."""
-        q = filter_string.lower()
-        return [volume for volume in volumes
-                if q in volume.name.lower()]
+class VolumesFilterAction(tables.NameFilterAction):
+    pass
 
 
 class UpdateMetadata(tables.LinkAction):
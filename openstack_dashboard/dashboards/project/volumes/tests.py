@@ -13,7 +13,9 @@
 #    under the License.
 
 import copy
+import json
 
+from cinderclient import exceptions as cinder_exceptions
 import mock
 import six
 
@@ -22,6 +24,7 @@ from django.forms import widgets
 from django.template.defaultfilters import slugify
 from django.test.utils import override_settings
 from django.urls import reverse
+from django.utils.http import urlencode
 from django.utils.http import urlunquote
 
 from openstack_dashboard import api
@@ -113,7 +116,12 @@ class VolumeIndexViewTests(test.ResetImageAPIVersionMixin, test.TestCase):
 
         res = self.client.get(urlunquote(url))
 
-        self.assertEqual(2, self.mock_volume_backup_supported.call_count)
+        # Row actions are checked once per volume status and project.
+        groups = set((volume.status,
+                      getattr(volume, 'os-vol-tenant-attr:tenant_id', None))
+                     for volume in volumes)
+        self.assertEqual(len(groups),
+                         self.mock_volume_backup_supported.call_count)
         self.mock_volume_list_paged.assert_called_once_with(
             test.IsHttpRequest(), marker=marker, sort_dir=sort_dir,
             search_opts=None, paginate=True)
@@ -1248,7 +1256,7 @@ class VolumeViewTests(test.ResetImageAPIVersionMixin, test.TestCase):
                          create_action.url)
         self.assertEqual((('volume', 'volume:create'),),
                          create_action.policy_rules)
-        self.assertEqual(5, self.mock_volume_backup_supported.call_count)
+        self.assertEqual(2, self.mock_volume_backup_supported.call_count)
         self.mock_volume_list_paged.assert_called_once_with(
             test.IsHttpRequest(), sort_dir='desc', marker=None,
             paginate=True, search_opts=None)
@@ -1285,7 +1293,7 @@ class VolumeViewTests(test.ResetImageAPIVersionMixin, test.TestCase):
         create_action = self.getAndAssertTableAction(res, 'volumes', 'create')
         self.assertIn('disabled', create_action.classes,
                       'The create button should be disabled')
-        self.assertEqual(5, self.mock_volume_backup_supported.call_count)
+        self.assertEqual(2, self.mock_volume_backup_supported.call_count)
         self.mock_volume_list_paged.assert_called_once_with(
             test.IsHttpRequest(), marker=None,
             paginate=True, sort_dir='desc',
@@ -1411,6 +1419,59 @@ class VolumeViewTests(test.ResetImageAPIVersionMixin, test.TestCase):
         mock_get.assert_called_once_with(test.IsHttpRequest(), volume.id)
         mock_limits.assert_called_once()
 
+    @mock.patch.object(cinder, 'tenant_absolute_limits')
+    @mock.patch.object(cinder, 'volume_get')
+    @mock.patch.object(cinder, 'volume_list_paged')
+    def test_get_data_list(self, mock_list, mock_get, mock_limits):
+        volumes = [volume for volume in self.cinder_volumes.list()
+                   if not volume.attachments]
+        missing_id = 'a9a9a9a9-0000-4000-8000-000000000000'
+
+        mock_list.return_value = [volumes[:2], True, False]
+        not_found = cinder_exceptions.NotFound(404)
+        not_found.silence_logging = True
+        mock_get.side_effect = [volumes[2], not_found]
+        mock_limits.return_value = self.cinder_limits['absolute']
+
+        # More rows than ajax_batch_list_threshold are listed at once.
+        content = self._get_rows_update(
+            [volume.id for volume in volumes] + [missing_id])
+        self.assertEqual(sorted(volume.id for volume in volumes),
+                         sorted(content['rows']))
+        self.assertEqual([missing_id], content['missing'])
+
+        mock_list.assert_called_once_with(test.IsHttpRequest(),
+                                          search_opts=None, paginate=True)
+        self.assertEqual([mock.call(test.IsHttpRequest(), volumes[2].id),
+                          mock.call(test.IsHttpRequest(), missing_id)],
+                         mock_get.call_args_list)
+
+    @mock.patch.object(cinder, 'tenant_absolute_limits')
+    @mock.patch.object(cinder, 'volume_get')
+    @mock.patch.object(cinder, 'volume_list_paged')
+    def test_get_data_list_few_rows(self, mock_list, mock_get, mock_limits):
+        volumes = self.cinder_volumes.list()[:2]
+        mock_get.side_effect = volumes
+        mock_limits.return_value = self.cinder_limits['absolute']
+
+        # A few rows are fetched one by one, without listing the volumes.
+        content = self._get_rows_update([volume.id for volume in volumes])
+        self.assertEqual(sorted(volume.id for volume in volumes),
+                         sorted(content['rows']))
+
+        self.assertFalse(mock_list.called)
+        self.assertEqual([mock.call(test.IsHttpRequest(), volume.id)
+                          for volume in volumes],
+                         mock_get.call_args_list)
+
+    def _get_rows_update(self, obj_ids):
+        params = [('action', 'rows_update'), ('table', 'volumes')]
+        params += [('obj_ids', obj_id) for obj_id in obj_ids]
+        res = self.client.get(INDEX_URL + "?" + urlencode(params), {},
+                              HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        self.assertEqual(res.status_code, 200)
+        return json.loads(res.content.decode('utf-8'))
+
     @test.create_mocks({
         api.nova: ['server_get'],
         cinder: ['tenant_absolute_limits',
@@ -1734,7 +1795,7 @@ class VolumeViewTests(test.ResetImageAPIVersionMixin, test.TestCase):
         for row in rows:
             self.assertEqual(row.cells['encryption'].data, column_value)
 
-        self.assertEqual(8, self.mock_volume_backup_supported.call_count)
+        self.assertEqual(2, self.mock_volume_backup_supported.call_count)
         self.mock_volume_list_paged.assert_called_once_with(
             test.IsHttpRequest(), marker=None,
             sort_dir='desc', search_opts=None,
@@ -1796,7 +1857,7 @@ class VolumeViewTests(test.ResetImageAPIVersionMixin, test.TestCase):
             self.assertEqual('create_transfer' in actions,
                              vol.status == 'available')
 
-        self.assertEqual(8, self.mock_volume_backup_supported.call_count)
+        self.assertEqual(2, self.mock_volume_backup_supported.call_count)
         self.mock_volume_list_paged.assert_called_once_with(
             test.IsHttpRequest(), marker=None,
             sort_dir='desc', search_opts=None,
@@ -1866,7 +1927,7 @@ class VolumeViewTests(test.ResetImageAPIVersionMixin, test.TestCase):
         self.assertIn('Successfully deleted volume transfer "test transfer"',
                       [m.message for m in res.context['messages']])
 
-        self.assertEqual(5, self.mock_volume_backup_supported.call_count)
+        self.assertEqual(3, self.mock_volume_backup_supported.call_count)
         self.mock_volume_list_paged.assert_called_once_with(
             test.IsHttpRequest(), marker=None,
             search_opts=None, sort_dir='desc',
@@ -1951,7 +2012,7 @@ class VolumeViewTests(test.ResetImageAPIVersionMixin, test.TestCase):
             self.assertEqual('backups' in actions,
                              vol.status in ('available', 'in-use'))
 
-        self.assertEqual(8, self.mock_volume_backup_supported.call_count)
+        self.assertEqual(2, self.mock_volume_backup_supported.call_count)
         self.mock_volume_list_paged.assert_called_once_with(
             test.IsHttpRequest(), marker=None,
             sort_dir='desc', search_opts=None,
@@ -1960,4 +2021,4 @@ class VolumeViewTests(test.ResetImageAPIVersionMixin, test.TestCase):
             test.IsHttpRequest(), search_opts=None)
         self.mock_server_list.assert_called_once_with(test.IsHttpRequest(),
                                                       search_opts=None)
-        self.assertEqual(8, self.mock_volume_backup_supported.call_count)
+        self.assertEqual(2, self.mock_volume_backup_supported.call_count)
@@ -19,6 +19,8 @@
 from __future__ import absolute_import
 
 from django.conf import settings
+from django.test.utils import override_settings
+import mock
 
 from horizon import exceptions
 
@@ -346,3 +348,114 @@ class QuotaSetTests(test.TestCase):
     def test_quotaset_add_with_wrong_type(self):
         quota_set = api_base.QuotaSet({'foo': 1, 'bar': 10})
         self.assertRaises(ValueError, quota_set.add, {'test': 7})
+
+
+class PagedItem(object):
+    def __init__(self, item_id):
+        self.id = item_id
+
+
+@override_settings(PAGED_LIST_CACHE={'enabled': True, 'max_pages': 3})
+class PagedListTests(test.TestCase):
+
+    use_mox = False
+
+    def setUp(self):
+        super(PagedListTests, self).setUp()
+        api_base.paged_list_cache.clear()
+        self.addCleanup(api_base.paged_list_cache.clear)
+        self.items = [PagedItem('item-%d' % i) for i in range(10)]
+        self.fetch = mock.Mock(side_effect=self._fetch)
+
+    def _fetch(self, marker, reversed_order, page_size=3):
+        """Mimic the API, returning pages in the order of the list."""
+        ids = [item.id for item in self.items]
+        index = 0 if marker is None else ids.index(marker)
+        if reversed_order:
+            start = max(index - page_size, 0)
+            return (self.items[start:index], True, start > 0)
+        if marker is not None:
+            index += 1
+        page = self.items[index:index + page_size]
+        return (page, index + page_size < len(self.items),
+                marker is not None)
+
+    def _paged_list(self, marker=None, reversed_order=False):
+        items, has_more, has_prev = api_base.paged_list(
+            self.request, 'test.list', self.fetch, 3, marker=marker,
+            reversed_order=reversed_order, key_args={'status': 'active'})
+        return [item.id for item in items], has_more, has_prev
+
+    @override_settings(PAGED_LIST_CACHE={'enabled': False})
+    def test_paged_list_disabled(self):
+        self._paged_list()
+        self._paged_list()
+        self.assertEqual(2, self.fetch.call_count)
+
+    @override_settings(PAGED_LIST_CACHE={'enabled': True, 'prefetch': False})
+    def test_paged_list_previous_page_from_cache(self):
+        self.assertEqual((['item-0', 'item-1', 'item-2'], True, False),
+                         self._paged_list())
+        self.assertEqual((['item-3', 'item-4', 'item-5'], True, True),
+                         self._paged_list('item-2'))
+        self.assertEqual(2, self.fetch.call_count)
+
+        self.assertEqual((['item-0', 'item-1', 'item-2'], True, False),
+                         self._paged_list('item-3', reversed_order=True))
+        self.assertEqual((['item-3', 'item-4', 'item-5'], True, True),
+                         self._paged_list('item-2'))
+        self.assertEqual(2, self.fetch.call_count)
+
+        # The next page has not been seen yet.
+        self.assertEqual((['item-6', 'item-7', 'item-8'], True, True),
+                         self._paged_list('item-5'))
+        self.assertEqual(3, self.fetch.call_count)
+
+    @mock.patch.object(api_base, '_run_in_background', lambda func: func())
+    def test_paged_list_prefetches_next_page(self):
+        self._paged_list()
+        self.fetch.assert_has_calls([mock.call(None, False),
+                                     mock.call('item-2', False)])
+
+        self.assertEqual((['item-3', 'item-4', 'item-5'], True, True),
+                         self._paged_list('item-2'))
+        self.assertEqual((['item-6', 'item-7', 'item-8'], True, True),
+                         self._paged_list('item-5'))
+        self.assertEqual((['item-9'], False, True),
+                         self._paged_list('item-8'))
+        self.assertEqual([mock.call(None, False),
+                          mock.call('item-2', False),
+                          mock.call('item-5', False),
+                          mock.call('item-8', False)],
+                         self.fetch.call_args_list)
+
+    @mock.patch.object(api_base, '_run_in_background', lambda func: func())
+    def test_paged_list_window_is_trimmed(self):
+        for marker in (None, 'item-2', 'item-5', 'item-8'):
+            self._paged_list(marker)
+        self.fetch.reset_mock()
+
+        # Only the last 3 pages are kept, the first one is fetched again
+        # and the previous page is prefetched when going back.
+        self.assertEqual((['item-3', 'item-4', 'item-5'], True, True),
+                         self._paged_list('item-6', reversed_order=True))
+        self.assertEqual([mock.call('item-3', True)],
+                         self.fetch.call_args_list)
+
+    @override_settings(PAGED_LIST_CACHE={'enabled': True, 'prefetch': False,
+                                         'timeout': 30})
+    def test_paged_list_expired_pages_are_fetched(self):
+        with mock.patch('time.time', return_value=1000):
+            self._paged_list()
+            self._paged_list('item-2')
+        with mock.patch('time.time', return_value=1031):
+            self.assertEqual((['item-0', 'item-1', 'item-2'], True, False),
+                             self._paged_list('item-3', reversed_order=True))
+        self.assertEqual(3, self.fetch.call_count)
+
+    @override_settings(PAGED_LIST_CACHE={'enabled': True, 'prefetch': False})
+    def test_paged_list_is_per_user(self):
+        self._paged_list()
+        self.request.user.id = 'other-user'
+        self._paged_list()
+        self.assertEqual(2, self.fetch.call_count)
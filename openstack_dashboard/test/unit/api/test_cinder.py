@@ -241,6 +241,39 @@ class CinderApiTests(test.APIMockTestCase):
         self.assertTrue(more_data)
         self.assertFalse(prev_data)
 
+    @override_settings(API_RESULT_PAGE_SIZE=2)
+    @override_settings(OPENSTACK_API_VERSIONS={'volume': 2})
+    @override_settings(PAGED_LIST_CACHE={'enabled': True, 'prefetch': False})
+    def test_volume_list_paginate_back_from_page_cache(self):
+        api.cinder.VERSIONS._active = None
+        api.base.paged_list_cache.clear()
+        self.addCleanup(api.base.paged_list_cache.clear)
+        page_size = settings.API_RESULT_PAGE_SIZE
+        volumes = self.cinder_volumes.list()
+        search_opts = {'all_tenants': 1}
+
+        cinderclient = self.stub_cinderclient()
+        volumes_mock = cinderclient.volumes.list
+        volumes_mock.side_effect = [volumes[:page_size + 1],
+                                    volumes[page_size:page_size * 2 + 1]]
+        cinderclient.transfers.list.return_value = []
+
+        api.cinder.volume_list_paged(self.request, search_opts=search_opts,
+                                     paginate=True)
+        api.cinder.volume_list_paged(self.request, search_opts=search_opts,
+                                     marker=volumes[page_size - 1].id,
+                                     paginate=True)
+        api_volumes, more_data, prev_data = api.cinder.volume_list_paged(
+            self.request, search_opts=search_opts, sort_dir="asc",
+            marker=volumes[page_size].id, paginate=True)
+
+        self.assertEqual(2, volumes_mock.call_count)
+        # Like the API, the previous page is returned in ascending order.
+        self.assertEqual([v.id for v in reversed(volumes[:page_size])],
+                         [v.id for v in api_volumes])
+        self.assertTrue(more_data)
+        self.assertFalse(prev_data)
+
     def test_volume_snapshot_list(self):
         search_opts = {'all_tenants': 1}
         volume_snapshots = self.cinder_volume_snapshots.list()
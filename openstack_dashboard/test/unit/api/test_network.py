@@ -14,6 +14,7 @@
 
 import collections
 
+import mock
 import netaddr
 
 from django.test.utils import override_settings
@@ -128,10 +129,98 @@ class NetworkApiNeutronTests(NetworkApiNeutronTestBase):
         # so it should be an empty dict.
         self.assertFalse(servers[2].addresses)
 
-    @override_settings(OPENSTACK_NEUTRON_NETWORK={'enable_router': True})
+    @override_settings(OPENSTACK_NEUTRON_NETWORK={
+        'enable_router': True, 'address_lookup_strategy': 'serial'})
     def test_servers_update_addresses(self):
         self._test_servers_update_addresses()
 
-    @override_settings(OPENSTACK_NEUTRON_NETWORK={'enable_router': False})
+    @override_settings(OPENSTACK_NEUTRON_NETWORK={
+        'enable_router': False, 'address_lookup_strategy': 'serial'})
     def test_servers_update_addresses_router_disabled(self):
         self._test_servers_update_addresses(router_enabled=False)
+
+    @mock.patch.object(api.neutron, 'neutronclient')
+    def _test_servers_update_addresses_parallel(self, mock_neutronclient,
+                                                project_fips=False):
+        tenant_id = self.request.user.tenant_id
+        qclient = mock_neutronclient.return_value
+
+        servers = self.servers.list()
+        server_ids = tuple([server.id for server in servers])
+        server_ports = [p for p in self.api_ports.list()
+                        if p['device_id'] in server_ids]
+        server_port_ids = tuple([p['id'] for p in server_ports])
+        if project_fips:
+            fips = self.api_floating_ips.list()
+        else:
+            fips = [fip for fip in self.api_floating_ips.list()
+                    if fip['port_id'] in server_port_ids]
+        server_network_ids = tuple(set(p['network_id'] for p in server_ports))
+        server_networks = [{'id': net['id'], 'name': net['name']}
+                           for net in self.api_networks.list()
+                           if net['id'] in server_network_ids]
+        qclient.list_ports.return_value = {'ports': server_ports}
+        qclient.list_floatingips.return_value = {'floatingips': fips}
+        qclient.list_networks.return_value = {'networks': server_networks}
+
+        api.network.servers_update_addresses(self.request, servers)
+
+        qclient.list_ports.assert_called_once_with(device_id=server_ids)
+        if project_fips:
+            qclient.list_floatingips.assert_called_once_with(
+                tenant_id=tenant_id)
+        else:
+            qclient.list_floatingips.assert_called_once_with(
+                tenant_id=tenant_id, port_id=server_port_ids)
+        qclient.list_networks.assert_called_once_with(
+            id=server_network_ids, fields=['id', 'name'])
+        # Neither the ports of the floating IPs nor the subnets of the
+        # networks are needed to build the addresses.
+        self.assertFalse(qclient.list_subnets.called)
+
+        self._check_server_address(servers[0])
+        self.assertEqual(3, len(servers[0].addresses['net1']))
+        self._check_server_address(servers[1])
+        self.assertFalse(servers[2].addresses)
+
+    @override_settings(OPENSTACK_NEUTRON_NETWORK={
+        'address_lookup_strategy': 'parallel'})
+    def test_servers_update_addresses_parallel(self):
+        self._test_servers_update_addresses_parallel()
+
+    @override_settings(OPENSTACK_NEUTRON_NETWORK={
+        'address_lookup_strategy': 'project_fips'})
+    def test_servers_update_addresses_project_fips(self):
+        self._test_servers_update_addresses_parallel(project_fips=True)
+
+    @override_settings(OPENSTACK_NEUTRON_NETWORK={})
+    def test_servers_update_addresses_auto_strategy(self):
+        self._test_servers_update_addresses_parallel()
+
+    @override_settings(OPENSTACK_NEUTRON_NETWORK={})
+    def test_address_lookup_strategy_auto(self):
+        max_ports = api.neutron.ADDRESS_LOOKUP_MAX_FILTERED_PORTS
+        few_ports = [None] * max_ports
+        many_ports = [None] * (max_ports + 1)
+        get_strategy = api.neutron._get_address_lookup_strategy
+        self.assertEqual('parallel', get_strategy(few_ports, False))
+        self.assertEqual('project_fips', get_strategy(many_ports, False))
+        self.assertEqual('parallel', get_strategy(many_ports, True))
+
+    @override_settings(OPENSTACK_NEUTRON_NETWORK={
+        'address_lookup_strategy': 'project_fips'})
+    def test_address_lookup_strategy_project_fips_all_tenants(self):
+        # The floating IPs of all projects are never listed unfiltered.
+        get_strategy = api.neutron._get_address_lookup_strategy
+        self.assertEqual('project_fips', get_strategy([None], False))
+        self.assertEqual('parallel', get_strategy([None], True))
+
+    @override_settings(OPENSTACK_NEUTRON_NETWORK={
+        'address_lookup_strategy': 'Parallel'})
+    @mock.patch.object(api.neutron.LOG, 'warning')
+    def test_address_lookup_strategy_unknown(self, mock_warning):
+        max_ports = api.neutron.ADDRESS_LOOKUP_MAX_FILTERED_PORTS
+        get_strategy = api.neutron._get_address_lookup_strategy
+        self.assertEqual('project_fips',
+                         get_strategy([None] * (max_ports + 1), False))
+        self.assertTrue(mock_warning.called)
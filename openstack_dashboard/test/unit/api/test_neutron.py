@@ -916,6 +916,46 @@ class NeutronApiTests(test.APITestCase):
         self.assertEqual(10, len(ret_val))
         self.assertEqual(port_ids, tuple([p.id for p in ret_val]))
 
+    def _test_list_resources_with_long_filters_no_uri_error(self):
+        # With max_uri_length set, 180 chars are allowed for the filter, so
+        # the 10 port IDs are split into three requests with 4, 4 and 2 port
+        # IDs before anything is sent to neutron.
+        ports = [{'id': uuidutils.generate_uuid(), 'name': 'port%s' % i}
+                 for i in range(10)]
+        port_ids = tuple([port['id'] for port in ports])
+        ports_by_id = dict((port['id'], port) for port in ports)
+        list_method = mock.Mock(
+            side_effect=lambda id: [ports_by_id[i] for i in id])
+
+        ret_val = api.neutron.list_resources_with_long_filters(
+            list_method, 'id', port_ids)
+
+        self.assertEqual(port_ids, tuple([p['id'] for p in ret_val]))
+        self.assertEqual(3, list_method.call_count)
+        list_method.assert_has_calls([mock.call(id=port_ids[0:4]),
+                                      mock.call(id=port_ids[4:8]),
+                                      mock.call(id=port_ids[8:10])],
+                                     any_order=True)
+
+    @override_settings(OPENSTACK_NEUTRON_NETWORK={
+        'max_uri_length': api.neutron.URI_LENGTH_MARGIN + 180})
+    def test_list_resources_with_long_filters_max_uri_length(self):
+        self._test_list_resources_with_long_filters_no_uri_error()
+
+    @override_settings(OPENSTACK_NEUTRON_NETWORK={
+        'max_uri_length': api.neutron.URI_LENGTH_MARGIN + 180,
+        'list_filter_concurrency': 3})
+    def test_list_resources_with_long_filters_concurrent(self):
+        self._test_list_resources_with_long_filters_no_uri_error()
+
+    @override_settings(OPENSTACK_NEUTRON_NETWORK={'max_uri_length': 8192})
+    def test_list_resources_with_long_filters_short_enough(self):
+        list_method = mock.Mock(return_value=[])
+        api.neutron.list_resources_with_long_filters(
+            list_method, 'id', ('id1', 'id2'), status='ACTIVE')
+        list_method.assert_called_once_with(id=('id1', 'id2'),
+                                            status='ACTIVE')
+
     def test_qos_policies_list(self):
         exp_policies = self.qos_policies.list()
         api_qos_policies = {'policies': self.api_qos_policies.list()}
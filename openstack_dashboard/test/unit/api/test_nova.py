@@ -20,6 +20,7 @@
 from __future__ import absolute_import
 
 from django.conf import settings
+from django import http
 from django.test.utils import override_settings
 
 import mock
@@ -29,6 +30,7 @@ from novaclient.v2 import flavor_access as nova_flavor_access
 from novaclient.v2 import servers
 
 from horizon import exceptions as horizon_exceptions
+from horizon.utils import memoized
 from openstack_dashboard import api
 from openstack_dashboard.test import helpers as test
 
@@ -471,6 +473,36 @@ class ComputeApiTests(test.APIMockTestCase):
         self.assertEqual(len(flavors), len(api_flavors))
         novaclient.flavors.list.assert_called_once_with(is_public=True)
 
+    @override_settings(MEMOIZED_SHARED_CACHE={'backend': 'local'})
+    def test_flavor_list_shared(self):
+        memoized.get_shared_backend().clear()
+        self.addCleanup(memoized.get_shared_backend().clear)
+        flavors = self.flavors.list()
+        novaclient = self.stub_novaclient()
+        novaclient.flavors.list.return_value = flavors
+
+        def new_request():
+            request = http.HttpRequest()
+            request.user = self.request.user
+            request.session = self.request.session
+            return request
+
+        api.nova.flavor_list(new_request())
+        with mock.patch.object(api.nova, 'novaclient') as other_novaclient:
+            api_flavors = api.nova.flavor_list(new_request())
+        novaclient.flavors.list.assert_called_once_with(is_public=True)
+        # The shared flavors are bound to the client of the request.
+        self.assertEqual([flavor.id for flavor in flavors],
+                         [flavor.id for flavor in api_flavors])
+        for flavor in api_flavors:
+            self.assertIs(other_novaclient.return_value.flavors,
+                          flavor.manager)
+
+        # Changing a flavor invalidates the shared list.
+        api.nova.flavor_delete(self.request, flavors[0].id)
+        api.nova.flavor_list(new_request())
+        self.assertEqual(2, novaclient.flavors.list.call_count)
+
     def test_flavor_get_no_extras(self):
         flavor = self.flavors.list()[1]
         novaclient = self.stub_novaclient()
@@ -0,0 +1,69 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import mock
+
+from openstack_dashboard import api
+from openstack_dashboard.test import helpers as test
+from openstack_dashboard import usage
+
+
+class ProjectUsageTests(test.APIMockTestCase):
+
+    def _stub_nova_limits(self, values):
+        limits = mock.Mock()
+        limits.absolute = []
+        for key, val in values.items():
+            limit = mock.Mock()
+            limit.name = key
+            limit.value = val
+            limits.absolute.append(limit)
+        novaclient = self.stub_novaclient()
+        novaclient.limits.get.return_value = limits
+        return novaclient
+
+    @mock.patch.object(api.cinder, 'tenant_absolute_limits',
+                       return_value={'maxTotalVolumes': 10})
+    @mock.patch.object(api.cinder, 'is_volume_service_enabled',
+                       return_value=True)
+    @mock.patch.object(api.neutron, 'security_group_list',
+                       return_value=[1, 2, 3])
+    @mock.patch.object(api.neutron, 'tenant_floating_ip_list',
+                       return_value=[1, 2])
+    @mock.patch.object(api.neutron, 'floating_ip_supported',
+                       return_value=True)
+    @mock.patch.object(api.neutron, 'is_extension_supported',
+                       return_value=True)
+    @mock.patch.object(api.neutron, 'is_quotas_extension_supported',
+                       return_value=False)
+    @mock.patch.object(api.base, 'is_service_enabled', return_value=True)
+    def test_get_limits_keeps_nova_limits(self, *mocks):
+        nova_limits = {'maxTotalInstances': 10,
+                       'totalInstancesUsed': 1,
+                       'totalFloatingIpsUsed': 0}
+        novaclient = self._stub_nova_limits(nova_limits)
+
+        for i in range(2):
+            project_usage = usage.ProjectUsage(self.request)
+            project_usage.get_limits()
+            self.assertEqual(2, project_usage.limits['totalFloatingIpsUsed'])
+            self.assertEqual(3,
+                             project_usage.limits['totalSecurityGroupsUsed'])
+            self.assertEqual(10, project_usage.limits['maxTotalVolumes'])
+
+        # The limits of nova are shared by the calls of the request and are
+        # not changed by the neutron and cinder limits.
+        self.assertEqual(
+            nova_limits,
+            api.nova.tenant_absolute_limits(self.request, reserved=True))
+        novaclient.limits.get.assert_called_once_with(reserved=True,
+                                                      tenant_id=None)
@@ -174,6 +174,49 @@ class QuotaTests(test.APITestCase):
     def test_tenant_quota_usages(self):
         self._test_tenant_quota_usages()
 
+    @override_settings(QUOTA_USAGES_CONCURRENT=False)
+    def test_tenant_quota_usages_serial(self):
+        self._test_tenant_quota_usages()
+
+    @test.create_stubs({api.nova: ('tenant_absolute_limits',),
+                        api.base: ('is_service_enabled',),
+                        cinder: ('tenant_absolute_limits',
+                                 'is_volume_service_enabled')})
+    def test_tenant_quota_usages_concurrent_exception(self):
+        cinder.is_volume_service_enabled(IsA(http.HttpRequest)).AndReturn(True)
+        api.base.is_service_enabled(IsA(http.HttpRequest),
+                                    'network').AndReturn(False)
+        api.base.is_service_enabled(IsA(http.HttpRequest), 'compute') \
+            .MultipleTimes().AndReturn(True)
+        api.nova.tenant_absolute_limits(
+            IsA(http.HttpRequest),
+            reserved=True,
+            tenant_id='1').AndRaise(ValueError('unexpected'))
+        api.cinder.tenant_absolute_limits(
+            IsA(http.HttpRequest),
+            '1').AndReturn(self.cinder_limits['absolute'])
+        self.mox.ReplayAll()
+
+        # The exception raised in the worker thread is re-raised in the
+        # calling thread, so that it is handled as in the serial mode.
+        self.assertRaises(ValueError,
+                          quotas.tenant_quota_usages, self.request)
+
+    def test_quota_usage_merge(self):
+        usages = quotas.QuotaUsage()
+        usages.add_quota(api.base.Quota('instances', 10))
+        usages.tally('instances', 2)
+        other = quotas.QuotaUsage()
+        other.add_quota(api.base.Quota('volumes', 5))
+        other.tally('volumes', 1)
+
+        usages.merge(other)
+
+        self.assertEqual({'quota': 10, 'used': 2, 'available': 8},
+                         usages['instances'])
+        self.assertEqual({'quota': 5, 'used': 1, 'available': 4},
+                         usages['volumes'])
+
     @override_settings(OPENSTACK_HYPERVISOR_FEATURES={'enable_quotas': False})
     def test_tenant_quota_usages_wo_nova_quotas(self):
         self._test_tenant_quota_usages(nova_quotas_enabled=False,
@@ -534,3 +577,86 @@ class QuotaTests(test.APITestCase):
         self.assertEqual(expected, quota_usages.usages)
         # Compare available resources
         self.assertAvailableQuotasEqual(expected, quota_usages.usages)
+
+    def test_tenant_quota_usages_neutron_quota_details(self):
+        self._test_tenant_quota_usages_neutron_quota_details()
+
+    def test_tenant_quota_usages_neutron_quota_details_failure(self):
+        self._test_tenant_quota_usages_neutron_quota_details(
+            details_available=False)
+
+    @test.create_stubs({api.base: ('is_service_enabled',),
+                        api.neutron: ('is_extension_supported',
+                                      'is_router_enabled',
+                                      'is_quotas_extension_supported',
+                                      'tenant_quota_detail_get',
+                                      'tenant_quota_get',
+                                      'network_list',
+                                      'subnet_list',
+                                      'router_list'),
+                        cinder: ('is_volume_service_enabled',)})
+    def _test_tenant_quota_usages_neutron_quota_details(
+            self, details_available=True):
+        targets = ('network', 'subnet', 'router')
+        tenant_id = self.request.user.tenant_id
+        cinder.is_volume_service_enabled(IsA(http.HttpRequest)).AndReturn(True)
+        api.base.is_service_enabled(IsA(http.HttpRequest), 'network') \
+            .AndReturn(True)
+        api.neutron.is_extension_supported(IsA(http.HttpRequest),
+                                           'security-group').AndReturn(True)
+        api.neutron.is_router_enabled(IsA(http.HttpRequest)).AndReturn(True)
+        api.neutron.is_quotas_extension_supported(IsA(http.HttpRequest)) \
+            .AndReturn(True)
+        api.base.is_service_enabled(IsA(http.HttpRequest), 'compute') \
+            .MultipleTimes().AndReturn(True)
+
+        api.neutron.is_extension_supported(IsA(http.HttpRequest),
+                                           'quota_details').AndReturn(True)
+        if details_available:
+            details = {
+                'network': {'limit': 10, 'used': 3, 'reserved': 1},
+                'subnet': {'limit': 10, 'used': 2, 'reserved': 0},
+                'router': {'limit': -1, 'used': 4, 'reserved': 0},
+                'port': {'limit': 50, 'used': 20, 'reserved': 0},
+            }
+            api.neutron.tenant_quota_detail_get(IsA(http.HttpRequest),
+                                                tenant_id).AndReturn(details)
+            expected = {
+                'network': {'used': 4, 'quota': 10, 'available': 6},
+                'subnet': {'used': 2, 'quota': 10, 'available': 8},
+                'router': {'used': 4, 'quota': float('inf'),
+                           'available': float('inf')},
+            }
+        else:
+            api.neutron.tenant_quota_detail_get(
+                IsA(http.HttpRequest),
+                tenant_id).AndRaise(self.exceptions.neutron)
+            api.neutron.tenant_quota_get(IsA(http.HttpRequest), tenant_id) \
+                .AndReturn(self.neutron_quotas.first())
+            api.neutron.network_list(IsA(http.HttpRequest),
+                                     tenant_id=tenant_id) \
+                .AndReturn(self.networks.list())
+            api.neutron.subnet_list(IsA(http.HttpRequest),
+                                    tenant_id=tenant_id) \
+                .AndReturn(self.subnets.list())
+            api.neutron.router_list(IsA(http.HttpRequest),
+                                    tenant_id=tenant_id) \
+                .AndReturn(self.routers.list())
+            network_used = len(self.networks.list())
+            subnet_used = len(self.subnets.list())
+            router_used = len(self.routers.list())
+            expected = {
+                'network': {'used': network_used, 'quota': 10,
+                            'available': 10 - network_used},
+                'subnet': {'used': subnet_used, 'quota': 10,
+                           'available': 10 - subnet_used},
+                'router': {'used': router_used, 'quota': 10,
+                           'available': 10 - router_used},
+            }
+
+        self.mox.ReplayAll()
+
+        quota_usages = quotas.tenant_quota_usages(self.request,
+                                                  targets=targets)
+
+        self.assertEqual(expected, quota_usages.usages)
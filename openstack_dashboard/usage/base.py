@@ -192,8 +192,10 @@ class ProjectUsage(BaseUsage):
 
     def get_limits(self):
         try:
-            self.limits = api.nova.tenant_absolute_limits(self.request,
-                                                          reserved=True)
+            # The limits are shared by the callers of the request, the
+            # neutron and cinder ones are added to a copy.
+            self.limits = dict(api.nova.tenant_absolute_limits(self.request,
+                                                               reserved=True))
         except Exception:
             exceptions.handle(self.request,
                               _("Unable to retrieve limit information."))
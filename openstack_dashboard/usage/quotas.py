@@ -13,7 +13,11 @@
 from collections import defaultdict
 import itertools
 import logging
+import time
 
+import futurist
+
+from django.conf import settings
 from django.utils.translation import ugettext_lazy as _
 
 from horizon import exceptions
@@ -135,6 +139,11 @@ class QuotaUsage(dict):
     def get(self, key, default=None):
         return self.usages.get(key, default)
 
+    def merge(self, other):
+        """Adds the quotas and usages tracked by another QuotaUsage."""
+        for name, usage in other.usages.items():
+            self.usages[name].update(usage)
+
     def add_quota(self, quota):
         """Adds an internal tracking reference for the given quota."""
         if quota.limit in (None, -1, float('inf')):
@@ -316,17 +325,43 @@ def _get_tenant_network_usages(request, usages, disabled_quotas, tenant_id):
     if not enabled_quotas:
         return
 
-    if neutron.is_extension_supported(request, 'quota_details'):
-        details = neutron.tenant_quota_detail_get(request, tenant_id)
-        for quota_name in NEUTRON_QUOTA_FIELDS:
-            if quota_name in disabled_quotas:
-                continue
-            detail = details[quota_name]
-            usages.add_quota(base.Quota(quota_name, detail['limit']))
-            usages.tally(quota_name, detail['used'] + detail['reserved'])
+    start = time.time()
+    if (neutron.is_extension_supported(request, 'quota_details') and
+            _get_tenant_network_usages_from_details(
+                request, usages, disabled_quotas, tenant_id)):
+        path = 'quota_details'
     else:
         _get_tenant_network_usages_legacy(
             request, usages, disabled_quotas, tenant_id)
+        path = 'legacy'
+    LOG.debug("Network quota usages of project %(tenant_id)s retrieved "
+              "using the %(path)s path in %(elapsed).3f seconds.",
+              {'tenant_id': tenant_id, 'path': path,
+               'elapsed': time.time() - start})
+
+
+@profiler.trace
+def _get_tenant_network_usages_from_details(request, usages, disabled_quotas,
+                                            tenant_id):
+    """Fill network usages from the neutron quota details extension.
+
+    A single call returns the limit, used and reserved counts of every
+    resource, so nothing needs to be listed. Returns False when the details
+    cannot be retrieved, so that the caller can fall back to counting
+    resources.
+    """
+    try:
+        details = neutron.tenant_quota_detail_get(request, tenant_id)
+    except neutron.neutron_exc.NeutronClientException:
+        LOG.warning("Unable to retrieve neutron quota details of project "
+                    "%s, counting resources instead.", tenant_id)
+        return False
+
+    for quota_name in NEUTRON_QUOTA_FIELDS:
+        if quota_name in details:
+            _add_limit_and_usage_neutron(usages, quota_name, quota_name,
+                                         details[quota_name], disabled_quotas)
+    return True
 
 
 def _get_neutron_quota_data(request, qs, disabled_quotas, tenant_id):
@@ -341,6 +376,7 @@ def _get_neutron_quota_data(request, qs, disabled_quotas, tenant_id):
     return qs
 
 
+@profiler.trace
 def _get_tenant_network_usages_legacy(request, usages, disabled_quotas,
                                       tenant_id):
     qs = base.QuotaSet()
@@ -415,13 +451,40 @@ def tenant_quota_usages(request, tenant_id=None, targets=None):
         enabled_quotas &= set(targets)
         disabled_quotas = set(QUOTA_FIELDS) - enabled_quotas
 
-    _get_tenant_compute_usages(request, usages, disabled_quotas, tenant_id)
-    _get_tenant_network_usages(request, usages, disabled_quotas, tenant_id)
-    _get_tenant_volume_usages(request, usages, disabled_quotas, tenant_id)
+    collectors = [
+        collector for fields, collector in (
+            (NOVA_COMPUTE_QUOTA_FIELDS, _get_tenant_compute_usages),
+            (NEUTRON_QUOTA_FIELDS, _get_tenant_network_usages),
+            (CINDER_QUOTA_FIELDS, _get_tenant_volume_usages),
+        ) if fields - disabled_quotas
+    ]
+    if (len(collectors) > 1 and
+            getattr(settings, 'QUOTA_USAGES_CONCURRENT', True)):
+        _collect_usages_concurrently(request, usages, collectors,
+                                     disabled_quotas, tenant_id)
+    else:
+        for collector in collectors:
+            collector(request, usages, disabled_quotas, tenant_id)
 
     return usages
 
 
+def _collect_usages_concurrently(request, usages, collectors,
+                                 disabled_quotas, tenant_id):
+    # Each collector fills its own QuotaUsage, so the threads never touch
+    # shared state. They are merged once all the services have answered.
+    partial_usages = [QuotaUsage() for collector in collectors]
+    with futurist.ThreadPoolExecutor(max_workers=len(collectors)) as e:
+        futures = [e.submit(collector, request, partial_usage,
+                            disabled_quotas, tenant_id)
+                   for collector, partial_usage
+                   in zip(collectors, partial_usages)]
+    for future, partial_usage in zip(futures, partial_usages):
+        # Re-raise exceptions from the collectors in the calling thread.
+        future.result()
+        usages.merge(partial_usage)
+
+
 @profiler.trace
 def tenant_limit_usages(request):
     # TODO(licostan): This method shall be removed from Quota module.
@@ -0,0 +1,136 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Tool to measure the rendering of the row actions of the instances table.
+
+The row actions of the project instances table are rendered for the servers
+of the unit test data, repeated up to the given number of rows, first with
+the template rendered for every row and then with ``cache_row_actions``.
+The API calls made by the actions are replaced by mocks. Run it from the top
+of the source tree::
+
+    python tools/row_actions_benchmark.py --rows 1000
+"""
+
+from __future__ import print_function
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__),
+                                                os.pardir)))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE',
+                      'openstack_dashboard.test.settings')
+
+import django  # noqa: E402
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from django.test import RequestFactory  # noqa: E402
+import mock  # noqa: E402
+from novaclient.v2 import servers as nova_servers  # noqa: E402
+from openstack_auth import user  # noqa: E402
+
+from horizon import tables  # noqa: E402
+from openstack_dashboard.dashboards.project.instances \
+    import tables as instance_tables  # noqa: E402
+from openstack_dashboard.test.test_data import utils as test_utils  # noqa
+
+
+API_MOCKS = {
+    'openstack_dashboard.api.nova.extension_supported': True,
+    'openstack_dashboard.api.nova.is_feature_available': True,
+    'openstack_dashboard.api.base.is_service_enabled': True,
+    'openstack_dashboard.api.cinder.is_volume_service_enabled': True,
+    'openstack_dashboard.api.neutron.floating_ip_supported': True,
+    'openstack_dashboard.api.neutron.'
+    'floating_ip_simple_associate_supported': False,
+}
+
+
+def make_request(data):
+    request = RequestFactory().get('/project/instances/')
+    request.session = {}
+    request.user = user.User(id=data.user.id,
+                             token=data.token,
+                             user=data.user.name,
+                             domain_id=data.domain.id,
+                             tenant_id=data.tenant.id,
+                             service_catalog=data.service_catalog,
+                             roles=[data.roles.member._info],
+                             authorized_tenants=data.tenants.list(),
+                             endpoint=settings.OPENSTACK_KEYSTONE_URL)
+    return request
+
+
+def make_servers(data, rows):
+    servers = []
+    templates = data.servers.list()
+    for index in range(rows):
+        info = dict(templates[index % len(templates)]._info,
+                    id='server-%d' % index)
+        servers.append(nova_servers.Server(nova_servers.ServerManager(None),
+                                           info))
+    return servers
+
+
+def render_row_actions(table_class, request, servers):
+    table = table_class(request, servers)
+    for server in servers:
+        table.render_row_actions(server)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=1000,
+                        help='Number of rows of the table')
+    parsed_args = parser.parse_args()
+
+    data = test_utils.load_test_data()
+    request = make_request(data)
+    servers = make_servers(data, parsed_args.rows)
+
+    class CachedInstancesTable(instance_tables.InstancesTable):
+        class Meta(instance_tables.InstancesTable.Meta):
+            cache_row_actions = True
+
+    class UncachedInstancesTable(instance_tables.InstancesTable):
+        class Meta(instance_tables.InstancesTable.Meta):
+            cache_row_actions = False
+
+    patchers = [mock.patch(target, return_value=value)
+                for target, value in API_MOCKS.items()]
+    for patcher in patchers:
+        patcher.start()
+    try:
+        print('%d rows, %d row actions' % (
+            parsed_args.rows, len(instance_tables.InstancesTable._meta
+                                  .row_actions)))
+        for name, table_class in (('template per row', UncachedInstancesTable),
+                                  ('cache_row_actions', CachedInstancesTable)):
+            tables.base.row_actions_fragments.clear()
+            start = time.time()
+            render_row_actions(table_class, request, servers)
+            elapsed = time.time() - start
+            print('%-20s %8.3f s %8.2f ms/row' % (
+                name, elapsed, elapsed * 1000 / parsed_args.rows))
+        print('%d cached fragments'
+              % len(tables.base.row_actions_fragments._fragments))
+    finally:
+        for patcher in patchers:
+            patcher.stop()
+
+
+if __name__ == '__main__':
+    main()
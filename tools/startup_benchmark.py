@@ -0,0 +1,132 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Tool to measure the startup of a dashboard worker.
+
+Each run starts a new Python process which sets up the WSGI application,
+compiles the URLconf and resolves a path, like a worker serving its first
+request. The client libraries of the services which are imported on first
+use by ``openstack_dashboard.api`` are then imported service by service,
+which is what a worker saves for each service it never calls. The medians
+of the runs are reported. Run it from the top of the source tree::
+
+    python tools/startup_benchmark.py --runs 5 --lazy-panels
+"""
+
+from __future__ import print_function
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+SERVICES = ['cinder', 'glance', 'neutron', 'nova']
+
+
+def maxrss():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def worker(settings_module, path, lazy_panels):
+    """Sets up a worker and returns what its startup and clients cost."""
+    os.environ['DJANGO_SETTINGS_MODULE'] = settings_module
+    start = time.time()
+    from django.core.wsgi import get_wsgi_application
+    get_wsgi_application()
+    from horizon import conf
+    conf.HORIZON_CONFIG['lazy_panels'] = lazy_panels
+    from django import urls
+    urls.resolve(path)
+    result = {'startup': time.time() - start, 'modules': len(sys.modules),
+              'maxrss': maxrss(), 'services': {}}
+
+    from django.utils.functional import SimpleLazyObject
+    from importlib import import_module
+    for service in SERVICES:
+        module = import_module('openstack_dashboard.api.%s' % service)
+        modules = len(sys.modules)
+        rss = maxrss()
+        start = time.time()
+        for value in list(vars(module).values()):
+            # The type is checked first, without importing the module.
+            if isinstance(value, SimpleLazyObject):
+                getattr(value, '__name__')
+        result['services'][service] = {'time': time.time() - start,
+                                       'modules': len(sys.modules) - modules,
+                                       'maxrss': maxrss() - rss}
+    return result
+
+
+def median(values):
+    values = sorted(values)
+    return values[len(values) // 2]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--runs', type=int, default=5,
+                        help='Number of workers started')
+    parser.add_argument('--settings', default='openstack_dashboard.settings',
+                        help='Settings module of the workers')
+    parser.add_argument('--path', default='/auth/login/',
+                        help='Path resolved by the workers')
+    parser.add_argument('--lazy-panels', action='store_true',
+                        help='Import the URLconfs of the panels on demand')
+    parser.add_argument('--worker', action='store_true',
+                        help=argparse.SUPPRESS)
+    parsed_args = parser.parse_args()
+
+    if parsed_args.worker:
+        print(json.dumps(worker(parsed_args.settings, parsed_args.path,
+                                parsed_args.lazy_panels)))
+        return
+
+    root = os.path.abspath(os.path.join(os.path.dirname(__file__),
+                                        os.pardir))
+    cmd = [sys.executable, os.path.abspath(__file__), '--worker',
+           '--settings', parsed_args.settings, '--path', parsed_args.path]
+    if parsed_args.lazy_panels:
+        cmd.append('--lazy-panels')
+    env = dict(os.environ, PYTHONPATH=root)
+    results = []
+    for run in range(parsed_args.runs):
+        output = subprocess.check_output(cmd, cwd=root, env=env,
+                                         stderr=open(os.devnull, 'w'))
+        results.append(json.loads(output.decode('utf-8').splitlines()[-1]))
+
+    print('%d workers, %s, first request %s%s' % (
+        parsed_args.runs, parsed_args.settings, parsed_args.path,
+        ', lazy panels' if parsed_args.lazy_panels else ''))
+    print('%-24s %8.3f s %8d modules %10d KiB max RSS' % (
+        'startup', median([r['startup'] for r in results]),
+        median([r['modules'] for r in results]),
+        median([r['maxrss'] for r in results])))
+    total = {'time': 0, 'modules': 0, 'maxrss': 0}
+    for service in SERVICES:
+        cost = dict((key, median([r['services'][service][key]
+                                  for r in results]))
+                    for key in total)
+        for key in total:
+            total[key] += cost[key]
+        print('%-24s %8.3f s %8d modules %10d KiB' % (
+            '%s clients' % service, cost['time'], cost['modules'],
+            cost['maxrss']))
+    print('%-24s %8.3f s %8d modules %10d KiB' % (
+        'deferred clients', total['time'], total['modules'],
+        total['maxrss']))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,116 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Tool to measure the time and memory used to render a large DataTable.
+
+A synthetic table (5000 rows of 15 columns by default) is rendered with the
+cells of each row built along with the row, then with ``lazy_cells``, and
+then streamed with ``lazy_cells``. Run it from the top of the source tree::
+
+    python tools/table_benchmark.py --rows 5000 --columns 15
+"""
+
+from __future__ import print_function
+
+import argparse
+import gc
+import os
+import sys
+import time
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__),
+                                                os.pardir)))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'horizon.test.settings')
+
+import django  # noqa: E402
+django.setup()
+
+from django.test import RequestFactory  # noqa: E402
+
+from horizon import tables  # noqa: E402
+
+
+class Datum(object):
+    def __init__(self, datum_id, columns):
+        self.id = datum_id
+        for column in range(columns):
+            setattr(self, 'column_%d' % column, 'value %d-%d' % (datum_id,
+                                                                 column))
+
+
+def make_table_class(columns, lazy_cells):
+    attrs = dict(('column_%d' % column,
+                  tables.Column('column_%d' % column))
+                 for column in range(columns - 1))
+    attrs['id'] = tables.Column('id')
+    attrs['Meta'] = type('Meta', (object,), {'name': 'benchmark',
+                                             'lazy_cells': lazy_cells})
+    return type('BenchmarkTable', (tables.DataTable,), attrs)
+
+
+def measure(func):
+    gc.collect()
+    if tracemalloc:
+        tracemalloc.start()
+    start = time.time()
+    func()
+    elapsed = time.time() - start
+    peak = None
+    if tracemalloc:
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=5000,
+                        help='Number of rows of the table')
+    parser.add_argument('--columns', type=int, default=15,
+                        help='Number of columns of the table, including '
+                             'the id column')
+    parsed_args = parser.parse_args()
+
+    request = RequestFactory().get('/benchmark/')
+    data = [Datum(datum_id, parsed_args.columns - 1)
+            for datum_id in range(parsed_args.rows)]
+    eager_table = make_table_class(parsed_args.columns, False)
+    lazy_table = make_table_class(parsed_args.columns, True)
+
+    def stream():
+        for chunk in lazy_table(request, data).render_stream():
+            pass
+
+    cases = [
+        ('rows (eager cells)', lambda: eager_table(request, data).get_rows()),
+        ('rows (lazy cells)', lambda: lazy_table(request, data).get_rows()),
+        ('render (eager cells)', lambda: eager_table(request, data).render()),
+        ('render (lazy cells)', lambda: lazy_table(request, data).render()),
+        ('render_stream (lazy cells)', stream),
+    ]
+    print('%d rows x %d columns' % (parsed_args.rows, parsed_args.columns))
+    for name, func in cases:
+        elapsed, peak = measure(func)
+        if peak is None:
+            print('%-28s %8.3f s' % (name, elapsed))
+        else:
+            print('%-28s %8.3f s %10.1f MiB peak' % (name, elapsed,
+                                                     peak / 1024.0 / 1024))
+
+
+if __name__ == '__main__':
+    main()